@@ -0,0 +1,3 @@
+"""
+Бенчмарки; запускаются из корня репозитория как модули: `python -m benchmarks.<имя> [аргументы]`
+"""
@@ -0,0 +1,95 @@
+"""
+Бенчмарк оберток эндпоинтов на локальном `FakeDigisellerServer` (без сети):
+запросов в секунду, задержка p50/p99 и память на 10 тыс. записей
+
+    python -m benchmarks.bench_endpoints [--requests 200] [--latency 0.002]
+"""
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, List
+
+from digiseller import Digiseller
+from digiseller.testing import FakeDigisellerServer
+
+
+def percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+def bench_calls(call: Callable[[], object], count: int) -> dict:
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(count):
+        call_started = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'rps': count / elapsed,
+        'p50': percentile(latencies, 0.5) * 1000,
+        'p99': percentile(latencies, 0.99) * 1000,
+        'mean': statistics.mean(latencies) * 1000,
+    }
+
+
+def bench_memory(load: Callable[[], list]) -> float:
+    """
+    :return: Память в КБ на 10 тыс. записей, удерживаемых после загрузки
+    """
+    gc.collect()
+    tracemalloc.start()
+    records = load()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return memory / len(records) * 10_000 / 1024 if records else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=200, help='Количество запросов на каждую обертку')
+    parser.add_argument('--latency', type=float, default=0.0, help='Имитируемая задержка сервера в секундах')
+    parser.add_argument('--records', type=int, default=10_000, help='Количество записей на сервере')
+    args = parser.parse_args()
+
+    with FakeDigisellerServer(latency=args.latency,
+                              sales_count=args.records,
+                              operations_count=args.records,
+                              products_count=args.records,
+                              chats_count=args.records) as server:
+        digi = Digiseller(123456, 'benchmark', base_url=server.url, background_token_refresh=False)
+        start = datetime(2000, 1, 1)
+
+        calls = {
+            'apilogin': lambda: digi.token_manager.invalidate() or digi.token_manager.get_token(),
+            'seller-sells/v2': lambda: digi.statistics.get_sales(rows=100),
+            'agent-sales/v2': lambda: digi.statistics.get_sales_as_agent(rows=100),
+            'sellers/account/receipts': lambda: digi.operations.get_all(count=100, date_start=start),
+            'shop/products': lambda: digi.products.get_all_by_category(rows=100),
+            'categories': lambda: digi.products.get_categories(),
+            'debates/v2/chats': lambda: digi.dialogs.get_all(limit=100),
+        }
+        loads = {
+            'seller-sells/v2': lambda: list(digi.statistics.iter_sales(rows=100)),
+            'agent-sales/v2': lambda: list(digi.statistics.iter_sales_as_agent(rows=1000)),
+            'sellers/account/receipts': lambda: list(digi.operations.iter_all(count=200, date_start=start)),
+            'shop/products': lambda: list(digi.products.iter_all_by_category(rows=100)),
+            'debates/v2/chats': lambda: list(digi.dialogs.iter_all(page_size=200)),
+        }
+
+        print(f'{"эндпоинт":<26} {"запр/с":>8} {"p50, мс":>8} {"p99, мс":>8} {"КБ/10k":>8}')
+        for endpoint, call in calls.items():
+            result = bench_calls(call, args.requests)
+            memory = bench_memory(loads[endpoint]) if endpoint in loads else float('nan')
+            print(f'{endpoint:<26} {result["rps"]:>8.0f} {result["p50"]:>8.2f} {result["p99"]:>8.2f} {memory:>8.0f}')
+
+        digi.close()
+
+
+if __name__ == '__main__':
+    main()
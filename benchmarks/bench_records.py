@@ -0,0 +1,98 @@
+"""
+Сравнение памяти и скорости создания записей: `Sale`/`Operation`/`Product` и компактные `*Record`
+
+    python -m benchmarks.bench_records [количество записей]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+
+from digiseller.api.statistics import Sale
+from digiseller.api.operations import Operation
+from digiseller.api.products import Product
+from digiseller.records import SaleRecord, OperationRecord, ProductRecord
+
+
+def sale_row(i: int) -> dict:
+    return {
+        'invoice_id': 100000000 + i,
+        'product_id': 3000000 + i % 500,
+        'product_name': f'Товар {i % 500}',
+        'product_entry': '',
+        'date_pay': '2024-03-01 12:34:56',
+        'email': f'buyer{i}@example.com',
+        'amount_in': 199.0,
+        'amount_out': 189.05,
+        'amount_currency': 'RUB',
+        'method_pay': 'BankCard',
+        'ip': '127.0.0.1',
+        'partner_id': 0,
+        'lang': 'ru-RU',
+    }
+
+
+def operation_row(i: int) -> dict:
+    return {
+        'id': 5000000 + i,
+        'date': '2024-03-01T12:34:56',
+        'amount': 189.05,
+        'currency': 'WMR',
+        'type': 'product_sales',
+        'invoice_id': 100000000 + i,
+        'description': f'Продажа {i}',
+    }
+
+
+def product_row(i: int) -> dict:
+    return {
+        'id': 3000000 + i,
+        'name': f'Товар {i}',
+        'price': 199.0,
+        'currency': 'RUR',
+        'base_price': 199.0,
+        'base_currency': 'RUR',
+        'cnt_sell': i % 1000,
+        'in_stock': 1,
+    }
+
+
+def measure(cls, rows: list) -> tuple[float, float]:
+    """
+    :return: (время создания в секундах, память на запись в байтах)
+    """
+    gc.collect()
+    started = time.perf_counter()
+    objects = [cls.from_dict(row) for row in rows]
+    elapsed = time.perf_counter() - started
+    del objects
+
+    gc.collect()
+    tracemalloc.start()
+    objects = [cls.from_dict(row) for row in rows]
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+
+    return elapsed, memory / len(rows)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    cases = [
+        ('sale', sale_row, Sale, SaleRecord),
+        ('operation', operation_row, Operation, OperationRecord),
+        ('product', product_row, Product, ProductRecord),
+    ]
+
+    print(f'{count} записей')
+    print(f'{"тип":<10} {"класс":<16} {"записей/с":>12} {"байт/запись":>12}')
+    for name, make_row, model_cls, record_cls in cases:
+        rows = [make_row(i) for i in range(count)]
+        for cls in (model_cls, record_cls):
+            elapsed, memory = measure(cls, rows)
+            print(f'{name:<10} {cls.__name__:<16} {count / elapsed:>12,.0f} {memory:>12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
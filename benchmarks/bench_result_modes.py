@@ -0,0 +1,73 @@
+"""
+Стоимость преобразования одной записи ответа API в каждом режиме `ResultMode`
+
+    python -m benchmarks.bench_result_modes [количество записей] [размер страницы]
+"""
+import gc
+import sys
+import time
+from functools import partial
+
+from benchmarks.bench_records import sale_row, operation_row, product_row
+from digiseller.api.statistics import Sale
+from digiseller.api.operations import Operation
+from digiseller.api.products import Product
+from digiseller.api.dialogs import Dialogs
+from digiseller.records import SaleRecord, OperationRecord, ProductRecord, DialogRecord
+from digiseller.results import ResultMode, construct, convert_rows
+
+
+def dialog_row(i: int) -> dict:
+    return {
+        'id_i': 100000000 + i,
+        'email': f'buyer{i}@example.com',
+        'product': f'Товар {i % 500}',
+        'last_date': '2024-03-01T12:34:56',
+        'cnt_msg': i % 20,
+        'cnt_new': i % 3,
+    }
+
+
+def measure(pages: list, mode: ResultMode, converters: dict) -> float:
+    """
+    :return: Время преобразования всех страниц в секундах
+    """
+    gc.collect()
+    started = time.perf_counter()
+    for rows in pages:
+        convert_rows(rows, mode, **converters)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    dialogs = Dialogs(None)
+    cases = [
+        ('sale', sale_row, dict(model=Sale.from_dict,
+                                record=SaleRecord.from_dict,
+                                constructed=partial(construct, Sale))),
+        ('operation', operation_row, dict(model=Operation.from_dict,
+                                          record=OperationRecord.from_dict,
+                                          constructed=partial(construct, Operation))),
+        ('product', product_row, dict(model=Product.from_dict,
+                                      record=ProductRecord.from_dict,
+                                      constructed=partial(construct, Product))),
+        ('dialog', dialog_row, dict(model=dialogs._make_dialog,
+                                    record=DialogRecord.from_dict,
+                                    constructed=dialogs._make_dialog)),
+    ]
+
+    print(f'{count} записей, страницы по {page_size}')
+    print(f'{"тип":<10} {"режим":<12} {"мкс/запись":>12} {"записей/с":>12}')
+    for name, make_row, converters in cases:
+        rows = [make_row(i) for i in range(count)]
+        pages = [rows[i:i + page_size] for i in range(0, count, page_size)]
+        for mode in ResultMode:
+            elapsed = measure(pages, mode, converters)
+            print(f'{name:<10} {mode.value:<12} {elapsed / count * 1e6:>12.3f} {count / elapsed:>12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,13 @@
 from .digiseller import Digiseller
+from .token_store import TokenStore, MemoryTokenStore, FileTokenStore
+from .rate_limit import RateLimiter, RetryPolicy
+from .cache import ResponseCache
+from .metrics import Instrumentation, OpenTelemetryHooks
+from .transport import TransportConfig
+from .batching import SalesBatcher
+from .scheduling import FairScheduler
+from .pool import DigisellerPool
+from .export import Exporter
+from .records import SaleRecord, OperationRecord, ProductRecord, DialogRecord
+from .results import ResultMode
+from .catalog import CategoryIndex, CatalogCrawler, CatalogSnapshot
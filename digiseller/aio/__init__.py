@@ -0,0 +1,2 @@
+from .digiseller import AsyncDigiseller
+from .notifications import NotificationReceiver
@@ -0,0 +1,4 @@
+from .statistics import Statistics
+from .operations import Operations
+from .products import Products
+from .dialogs import Dialogs
@@ -0,0 +1,114 @@
+import asyncio
+from datetime import datetime
+from typing import Iterable, List, Dict
+
+from digiseller.api import ApiCategoryBase
+from digiseller.api.dialogs import Dialog, BulkResult
+
+
+class Dialogs(ApiCategoryBase):
+    """
+    Асинхронный класс для взаимодействия с диалогами (переписка с покупателями)
+    """
+
+    def __init__(self, digiseller: object) -> None:
+        super().__init__(digiseller)
+
+    async def get_all(self,
+                      limit: int = 20) -> List[Dialog]:
+        if limit == 0:
+            limit = 9999
+
+        current_page = 1
+
+        dialogs = []
+        while True:
+            resp = await self.digiseller.make_request(
+                'get', 'debates/v2/chats',
+                filter_new=0,
+                pagesize=limit if limit < 200 else 200,
+                page=current_page
+            )
+            data = await resp.json(content_type=None)
+            pages_count: int = data['pages']
+
+            for dialog in data['chats']:
+                if len(dialogs) >= limit:
+                    break
+
+                dialogs.append(
+                    Dialog(
+                        digiseller=self.digiseller,
+                        order_id=dialog['id_i'],
+                        email=dialog['email'],
+                        product_name=dialog['product'],
+                        last_date=datetime.fromisoformat(dialog['last_date']),
+                        messages_count=dialog['cnt_msg'],
+                        new_messages_count=dialog['cnt_new']
+                    )
+                )
+
+            if current_page >= pages_count or len(dialogs) >= limit:
+                break
+            else:
+                current_page += 1
+
+        return dialogs
+
+    async def get_status(self,
+                         order_id: int) -> Dict:
+        resp = await self.digiseller.make_request(
+            'get', 'debates/v2/chat-state',
+            id_i=order_id
+        )
+        data = await resp.json(content_type=None)
+
+        return {
+            'state': Dialog.DialogState(data['chat_state']),
+            'may_change': bool(data['may_change'])
+        }
+
+    async def change_status(self,
+                            order_id: int,
+                            closed: bool) -> bool:
+        resp = await self.digiseller.make_request(
+            'post', 'debates/v2/chat-state',
+            use_json=False,
+            raise_for_status=False,
+            id_i=order_id,
+            chat_state=0 if closed else 1
+        )
+        return resp.status == 200
+
+    @staticmethod
+    async def _gather_bulk(order_ids: List[int], coroutines) -> BulkResult:
+        results, errors = {}, {}
+        for order_id, result in zip(order_ids, await asyncio.gather(*coroutines, return_exceptions=True)):
+            if isinstance(result, Exception):
+                errors[order_id] = result
+            else:
+                results[order_id] = result
+
+        return BulkResult(results, errors)
+
+    async def get_statuses(self,
+                           order_ids: Iterable[int]) -> BulkResult:
+        """
+        Статусы нескольких диалогов; количество одновременных запросов ограничивает `max_concurrency` клиента
+
+        :param order_ids: ID заказов
+        :return: `BulkResult`: {order_id: статус как в `get_status`} и {order_id: ошибка}
+        """
+        order_ids = list(order_ids)
+        return await self._gather_bulk(order_ids, (self.get_status(order_id) for order_id in order_ids))
+
+    async def change_statuses(self,
+                              statuses: Dict[int, bool]) -> BulkResult:
+        """
+        Изменение статуса нескольких диалогов
+
+        :param statuses: {order_id: closed}
+        :return: `BulkResult`: {order_id: результат как в `change_status`} и {order_id: ошибка}
+        """
+        return await self._gather_bulk(list(statuses),
+                                       (self.change_status(order_id, closed) for order_id, closed in statuses.items()))
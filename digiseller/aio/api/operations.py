@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from typing import Optional, List
+
+from digiseller.api import ApiCategoryBase
+from digiseller.api.operations import Operation, Currency, OperationType, CodeFilter, AllowType
+
+
+class Operations(ApiCategoryBase):
+    """
+    Асинхронный класс для взаимодействия с операциями по аккаунту
+    """
+
+    def __init__(self, digiseller) -> None:
+        super().__init__(digiseller)
+
+    async def get_all(self,
+                      page: int = 1,
+                      count: int = 10,
+                      currency: Optional[Currency | str] = None,
+                      operation_type: Optional[OperationType | str] = None,
+                      code_filter: Optional[CodeFilter | str] = None,
+                      allow_type: Optional[AllowType | str] = None,
+                      date_start: Optional[datetime | str] = None,
+                      date_finish: Optional[datetime | str] = None) -> List[Operation]:
+        """
+        Получение списка операций по аккаунту
+        https://my.digiseller.com/inside/api_account.asp#digiseller
+
+        :param page: Номер страницы
+        :param count: Количество отображаемых операций (до 200)
+        :param currency: Валюта (Currency/str)
+        :param operation_type: Тип операции (OperationType/str)
+        :param code_filter: Операции, ожидающие проверки уникального кода (CodeFilter/str)
+        :param allow_type: Операции недоступные для вывода (AllowType/str)
+        :param date_start: Дата начала. По умолчанию - 2 недели назад
+        :param date_finish: Дата конца. По умолчанию - текущая дата и время
+
+        :return: Список объектов `Operation`, представляющих информацию об операции
+        """
+        if date_start is None:
+            date_start = datetime.now() - timedelta(weeks=2)
+        if date_finish is None:
+            date_finish = datetime.now()
+
+        resp = await self.digiseller.make_request(
+            'get', 'sellers/account/receipts',
+            page=page,
+            count=count,
+            currency=currency.value if isinstance(currency, Currency) else currency,
+            type=operation_type.value if isinstance(operation_type, OperationType) else operation_type,
+            codeFilter=code_filter.value if isinstance(code_filter, CodeFilter) else code_filter,
+            allowType=allow_type.value if isinstance(allow_type, AllowType) else allow_type,
+            start=date_start.strftime('%Y-%m-%dT%H:%M') if isinstance(date_start, datetime) else date_start,
+            finish=date_finish.strftime('%Y-%m-%dT%H:%M') if isinstance(date_finish, datetime) else date_finish
+        )
+        data = await resp.json(content_type=None)
+        items = data['content']['items']
+        operations = [Operation.from_dict(item) for item in items]
+
+        return operations
+
+    async def external_aggregators(self,
+                                   page: int = 1,
+                                   count: int = 10,
+                                   order: str = 'Date DESC',
+                                   allow_type: Optional[AllowType | str] = None,
+                                   aggregator: Optional[str] = 'freekassa') -> List[Operation]:
+        """
+        Получение списка операций проведенных через внешних агрегаторов
+        https://my.digiseller.com/inside/api_account.asp#external
+
+        :param page: Номер страницы
+        :param count: Количество операций на одной странице
+        :param order: Сортировка
+        :param allow_type: Операции недоступные для вывода (AllowType/str)
+        :param aggregator: Агрегатор (платежная система). Например: 'yandex' - ЮMoney, 'enot' - Enot.io
+
+        :return: Список объектов `Operation`, представляющих информацию об операции
+        """
+        resp = await self.digiseller.make_request(
+            'get', 'sellers/account/receipts/external',
+            page=page,
+            count=count,
+            order=order,
+            code=allow_type.value if isinstance(allow_type, AllowType) else allow_type,
+            aggregator=aggregator
+        )
+        data = await resp.json(content_type=None)
+        items = data['content']['items']
+        operations = [Operation.from_dict(item) for item in items]
+
+        return operations
+
+    async def get_balance(self) -> dict:
+        """
+        Получение баланса личного счета
+        https://my.digiseller.com/inside/api_account.asp#view_balance
+
+        :return: Словарь представляющий баланс счета
+        """
+        resp = await self.digiseller.make_request('get', 'sellers/account/balance/info')
+
+        data = await resp.json(content_type=None)
+        balances = data['content']
+
+        return balances
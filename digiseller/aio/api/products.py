@@ -0,0 +1,81 @@
+from typing import Optional, List
+
+from digiseller.api import ApiCategoryBase
+from digiseller.api.products import Category, Product
+
+
+class Products(ApiCategoryBase):
+    """
+    Асинхронный класс для взаимодействия с товарами и категориями
+    """
+
+    def __init__(self, digiseller) -> None:
+        super().__init__(digiseller)
+
+    async def get_categories(self,
+                             seller_id: Optional[int] = None,
+                             category_id: int = 0,
+                             lang: str = 'ru-RU'
+                             ) -> List[Category]:
+        """
+        Получение списка категорий и их подкатегорий
+        https://my.digiseller.com/inside/api_catgoods.asp#categories
+
+        :param seller_id: ID продавца
+        :param category_id: ID категории; по умолчанию - 0 (все категории)
+        :param lang: Язык отображения информации (ru-RU/en-US)
+        """
+        if not seller_id:
+            seller_id = self.digiseller.seller_id
+
+        resp = await self.digiseller.make_request(
+            'get', 'categories',
+            seller_id=seller_id,
+            category_id=category_id,
+            lang=lang
+        )
+
+        data = await resp.json(content_type=None)
+        categories_raw = data['category']
+        categories = [Category.from_dict(category_raw) for category_raw in categories_raw]
+
+        return categories
+
+    async def get_all_by_category(self,
+                                  seller_id: Optional[int] = None,
+                                  category_id: int = 0,
+                                  page: int = 1,
+                                  rows: int = 20,
+                                  order: Optional[str] = None,
+                                  currency: str = 'RUR',
+                                  lang: str = 'ru-RU') -> List[Product]:
+        """
+        Получение списка товаров из категории
+        https://my.digiseller.com/inside/api_catgoods.asp#products
+
+        :param seller_id: ID продавца
+        :param category_id: ID категории; по умолчанию - 0 (все категории)
+        :param page: Номер страницы
+        :param rows: Количество товаров на одной странице
+        :param order: Способ сортировки товаров
+        :param currency: Тип валюты для отображения товара
+        :param lang: Язык отображения информации (ru-RU/en-US)
+        """
+        if not seller_id:
+            seller_id = self.digiseller.seller_id
+
+        resp = await self.digiseller.make_request(
+            'get', 'shop/products',
+            seller_id=seller_id,
+            category_id=category_id,
+            page=page,
+            rows=rows,
+            order=order,
+            currency=currency,
+            lang=lang
+        )
+        data = await resp.json(content_type=None)
+        products_raw = data['product']
+        products = [Product.from_dict(product_raw) for product_raw in products_raw]
+
+        return products
@@ -0,0 +1,234 @@
+import asyncio
+import json
+import logging
+import time
+
+import aiohttp
+
+from ..validators import validate_param
+from ..api import general
+from ..token_store import TokenStore
+from ..rate_limit import RateLimiter, RetryPolicy
+from ..metrics import Instrumentation, RequestSpan
+
+from . import api
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDigiseller:
+    """
+    Асинхронный класс для взаимодействия с API Digiseller (asyncio + aiohttp)
+    """
+
+    BASE_URL = 'https://api.digiseller.ru/api/'
+
+    def __init__(self,
+                 seller_id: str | int,
+                 api_key: str,
+                 max_concurrency: int = 100,
+                 connections_limit: int = 100,
+                 keepalive_timeout: float = 30,
+                 token_store: TokenStore | None = None,
+                 rate_limiter: RateLimiter | None = None,
+                 retry_policy: RetryPolicy | None = None,
+                 base_url: str | None = None,
+                 instrumentation: Instrumentation | None = None) -> None:
+        """
+        Инициализация асинхронного клиента API Digiseller
+
+        :param seller_id: Идентификатор продавца (https://my.digiseller.com/inside/my_info.asp)
+        :param api_key: API ключ для аутентификации (https://my.digiseller.com/inside/api_keys.asp)
+        :param max_concurrency: Максимальное количество одновременно выполняемых запросов
+        :param connections_limit: Размер пула keep-alive соединений
+        :param keepalive_timeout: Время жизни простаивающего соединения в секундах
+        :param token_store: Хранилище токенов, общее для процессов (например `FileTokenStore`)
+        :param rate_limiter: Ограничение скорости запросов на стороне клиента
+        :param retry_policy: Политика повтора запросов при 429/5xx и сетевых ошибках
+        :param base_url: Адрес API вместо `BASE_URL` (например, локальный `FakeDigisellerServer`)
+        :param instrumentation: Сбор метрик и хуки трассировки запросов
+        """
+        validate_param(seller_id, (str, int), 'seller_id')
+        validate_param(api_key, str, 'api_key')
+        validate_param(max_concurrency, int, 'max_concurrency')
+
+        if base_url is not None:
+            self.BASE_URL = base_url
+
+        self.seller_id: int = int(seller_id)
+        self.api_key: str = api_key
+
+        self.token: str | None = None
+        self.token_expiration: int = 0
+        self.token_store: TokenStore | None = token_store
+        self.rate_limiter: RateLimiter | None = rate_limiter
+        self.retry_policy: RetryPolicy | None = retry_policy
+        self.instrumentation: Instrumentation | None = instrumentation
+
+        self.connections_limit: int = connections_limit
+        self.keepalive_timeout: float = keepalive_timeout
+
+        self.session: aiohttp.ClientSession | None = None
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
+        self._token_lock: asyncio.Lock = asyncio.Lock()
+
+        self.operations: api.Operations = api.Operations(self)
+        self.statistics: api.Statistics = api.Statistics(self)
+        self.products: api.Products = api.Products(self)
+        self.dialogs: api.Dialogs = api.Dialogs(self)
+
+    async def __aenter__(self) -> 'AsyncDigiseller':
+        await self.get_session()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Возвращает общую сессию с пулом keep-alive соединений, создавая её при первом обращении
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.connections_limit,
+                                             keepalive_timeout=self.keepalive_timeout)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'Content-Type': 'application/json; charset=UTF-8', 'Accept': 'application/json'}
+            )
+        return self.session
+
+    async def close(self) -> None:
+        """
+        Закрывает сессию и все соединения пула
+        """
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    async def __refresh_token_if_needed(self) -> None:
+        """
+        Обновляет токен если его время действия истекло или токен ещё не был установлен.
+        Одновременные вызовы ожидают одно общее обновление
+        """
+        if self.token is not None and int(time.time()) < self.token_expiration - 30:
+            return
+
+        async with self._token_lock:
+            # Пока ждали блокировку, токен мог обновить другой вызов
+            if self.token is None or int(time.time()) >= self.token_expiration - 30:
+                self.token, self.token_expiration = await self.__load_or_get_token()
+
+    async def __load_or_get_token(self) -> (str, int):
+        """
+        Берет действующий токен из хранилища или получает новый и сохраняет его
+        """
+        if self.token_store is None:
+            if self.instrumentation is not None:
+                self.instrumentation.record_token_refresh('login')
+            return await general.get_and_set_token_async(self)
+
+        stored = await asyncio.to_thread(self.token_store.load, self.seller_id)
+        if stored is not None and int(time.time()) < stored[1] - 30:
+            if self.instrumentation is not None:
+                self.instrumentation.record_token_refresh('store')
+            return stored
+
+        if self.instrumentation is not None:
+            self.instrumentation.record_token_refresh('login')
+        token, token_expiration = await general.get_and_set_token_async(self)
+        await asyncio.to_thread(self.token_store.save, self.seller_id, token, token_expiration)
+        return token, token_expiration
+
+    @staticmethod
+    def _prepare_params(options: dict) -> dict:
+        """
+        aiohttp не принимает bool в параметрах запроса, приводим к виду как в `requests`
+        """
+        return {k: str(v) if isinstance(v, bool) else v for k, v in options.items()}
+
+    async def make_request(self, method: str, endpoint: str, use_json: bool = True, raise_for_status: bool = True, **options) -> aiohttp.ClientResponse:
+        await self.__refresh_token_if_needed()
+
+        url = self.BASE_URL + endpoint
+
+        params = {}
+        json_data = {}
+
+        options = {k: v for k, v in options.items() if v is not None}  # Убираем все параметры None
+        if method.upper() in ['GET'] or not use_json:
+            options['token'] = self.token
+            params = self._prepare_params(options)
+        elif method.upper() in ['POST']:
+            params = {'token': self.token}
+            json_data = dict(options)
+
+        resp = await self._send(method, endpoint, url, params, json_data)
+
+        if raise_for_status:
+            resp.raise_for_status()
+
+        return resp
+
+    async def _send(self, method: str, endpoint: str, url: str, params: dict, json_data: dict) -> aiohttp.ClientResponse:
+        """
+        Отправляет запрос с учетом ограничения скорости и политики повторов
+        """
+        span = None
+        if self.instrumentation is not None:
+            span = self.instrumentation.start_request(method, endpoint)
+
+        try:
+            resp, body = await self.__send_with_retries(method, endpoint, url, params, json_data, span)
+        except Exception as e:
+            if span is not None:
+                span.error = e
+                self.instrumentation.end_request(span)
+            raise
+
+        if span is not None:
+            span.status_code = resp.status
+            span.bytes_sent = len(json.dumps(json_data).encode()) if json_data else 0
+            span.bytes_received = len(body)
+            self.instrumentation.end_request(span)
+
+        return resp
+
+    async def __send_with_retries(self, method: str, endpoint: str, url: str, params: dict, json_data: dict,
+                                  span: RequestSpan | None) -> (aiohttp.ClientResponse, bytes):
+        session = await self.get_session()
+        attempt = 0
+        while True:
+            if span is not None:
+                span.attempts = attempt + 1
+
+            if self.rate_limiter is not None:
+                delay = self.rate_limiter.reserve(endpoint)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            try:
+                async with self._semaphore:
+                    async with session.request(method=method, url=url, params=params, json=json_data) as resp:
+                        body = await resp.read()  # Тело кэшируется в ответе, соединение возвращается в пул
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if self.retry_policy is None or not self.retry_policy.can_retry(method, attempt):
+                    raise
+                self.__on_retry(endpoint, type(e).__name__, attempt)
+                await asyncio.sleep(self.retry_policy.get_delay(attempt))
+                attempt += 1
+                continue
+
+            retry_after = resp.headers.get('Retry-After')
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_response(endpoint, resp.status, retry_after)
+
+            if self.retry_policy is None or not self.retry_policy.should_retry(method, resp.status, attempt):
+                return resp, body
+
+            self.__on_retry(endpoint, str(resp.status), attempt)
+            await asyncio.sleep(self.retry_policy.get_delay(attempt, retry_after))
+            attempt += 1
+
+    def __on_retry(self, endpoint: str, reason: str, attempt: int) -> None:
+        logger.info('Повтор запроса %s (%s), попытка %d', endpoint, reason, attempt + 2)
+        if self.instrumentation is not None:
+            self.instrumentation.record_retry(endpoint, reason)
@@ -0,0 +1,271 @@
+import asyncio
+import hmac
+import inspect
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Optional, Union
+
+from aiohttp import web
+
+from ..api.statistics import Sale
+
+logger = logging.getLogger(__name__)
+
+SaleHandler = Callable[[Sale], Union[None, Awaitable[None]]]
+
+# Поля оповещения -> поля строки `seller-sells/v2`, чтобы обработчики получали одинаковые `Sale`
+NOTIFICATION_FIELDS = {
+    'id_i': 'invoice_id',
+    'id_d': 'product_id',
+    'amount': 'amount_in',
+    'currency': 'amount_currency',
+    'date': 'date_pay',
+    'email': 'email',
+}
+
+
+def sale_from_notification(fields: dict) -> Sale:
+    """
+    Преобразует поля оповещения о продаже в `Sale` с именами полей как в `Statistics.get_sales`.
+    Остальные поля сохраняются с именами в нижнем регистре
+    """
+    data = {}
+    for key, value in fields.items():
+        key = key.lower()
+        if key == 'sha256':
+            continue
+        data[NOTIFICATION_FIELDS.get(key, key)] = value
+
+    for key, cast in (('invoice_id', int), ('product_id', int), ('amount_in', float)):
+        if data.get(key) not in (None, ''):
+            data[key] = cast(data[key])
+    return Sale.from_dict(data)
+
+
+class NotificationReceiver:
+    """
+    Встроенный асинхронный приемник оповещений Digiseller о продажах.
+    Проверяет подпись API ключом, отбрасывает повторные оповещения по `invoice_id`
+    и передает продажи обработчикам через ограниченную очередь.
+    Опрос статистики (`start_polling`) остается редкой страховкой на случай потерянных оповещений
+    """
+
+    def __init__(self,
+                 api_key: str,
+                 make_sign: Callable[[str, dict], str],
+                 host: str = '127.0.0.1',
+                 port: int = 8080,
+                 path: str = '/digiseller/notify',
+                 queue_size: int = 1000,
+                 workers: int = 1,
+                 dedup_size: int = 100_000) -> None:
+        """
+        :param api_key: API ключ продавца, которым подписаны оповещения
+        :param make_sign: Функция подписи `(api_key, поля) -> hex` по схеме из настроек оповещений магазина;
+            `general.make_notification_sign` - пример для схемы `ID_I;ID_D;Amount;Currency;Date;<api_key>`
+        :param host: Адрес для приема оповещений; для приема извне укажите `'0.0.0.0'`
+        :param port: Порт (0 - выбрать свободный, см. `url` после `start()`)
+        :param path: Путь URL оповещений, указанный в настройках магазина
+        :param queue_size: Размер очереди продаж; при переполнении оповещение отклоняется с 503 и будет повторено
+        :param workers: Количество задач, одновременно вызывающих обработчики
+        :param dedup_size: Сколько последних `invoice_id` помнить для отбрасывания повторов
+        """
+        self.api_key: str = api_key
+        self.host: str = host
+        self.port: int = port
+        self.path: str = path
+        self.workers: int = workers
+        self.dedup_size: int = dedup_size
+        self.make_sign: Callable[[str, dict], str] = make_sign
+
+        self.handlers: List[SaleHandler] = []
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+        self._seen: OrderedDict[int, None] = OrderedDict()
+        self._runner: Optional[web.AppRunner] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}{self.path}'
+
+    def add_handler(self, handler: SaleHandler) -> SaleHandler:
+        """
+        Добавляет обработчик продаж (функцию или корутину); можно использовать как декоратор
+        """
+        self.handlers.append(handler)
+        return handler
+
+    async def __aenter__(self) -> 'NotificationReceiver':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        """
+        Запускает HTTP сервер и задачи обработчиков
+        """
+        app = web.Application()
+        app.router.add_route('*', self.path, self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self.port == 0:
+            self.port = site._server.sockets[0].getsockname()[1]
+
+        self._tasks.extend(asyncio.create_task(self._worker()) for _ in range(self.workers))
+
+    async def stop(self) -> None:
+        """
+        Останавливает прием оповещений, дожидается обработки очереди и останавливает задачи
+        """
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        if any(not task.done() for task in self._tasks):
+            await self.queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def verify(self, fields: dict) -> bool:
+        sign = next((v for k, v in fields.items() if k.lower() == 'sha256'), None)
+        if not sign:
+            return False
+        return hmac.compare_digest(str(sign).lower(), self.make_sign(self.api_key, fields))
+
+    def _is_new(self, invoice_id: int) -> bool:
+        if invoice_id in self._seen:
+            self._seen.move_to_end(invoice_id)
+            return False
+        self._seen[invoice_id] = None
+        if len(self._seen) > self.dedup_size:
+            self._seen.popitem(last=False)
+        return True
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        fields = dict(request.query)
+        if request.can_read_body:
+            if request.content_type == 'application/json':
+                try:
+                    body = await request.json()
+                except ValueError:
+                    return web.Response(status=400, text='Invalid JSON')
+                if not isinstance(body, dict):
+                    return web.Response(status=400, text='Invalid JSON')
+                fields.update(body)
+            else:
+                fields.update(await request.post())
+
+        return web.Response(status=self.deliver(fields), text='OK')
+
+    def deliver(self, fields: dict) -> int:
+        """
+        Обрабатывает поля одного оповещения
+
+        :return: HTTP статус ответа: 200 - принято или уже получено, 403 - неверная подпись,
+            400 - нет `ID_I` (или тело запроса - неверный JSON), 503 - очередь переполнена
+        """
+        if not self.verify(fields):
+            logger.warning('Оповещение с неверной подписью отклонено')
+            return 403
+
+        try:
+            sale = sale_from_notification(fields)
+            invoice_id = sale.invoice_id
+        except (AttributeError, ValueError):
+            return 400
+
+        if invoice_id in self._seen:
+            self._seen.move_to_end(invoice_id)
+            return 200
+        if self.queue.full():
+            # Не запоминаем invoice_id: Digiseller повторит оповещение
+            logger.warning('Очередь продаж переполнена, оповещение %s отклонено', invoice_id)
+            return 503
+
+        self._is_new(invoice_id)
+        self.queue.put_nowait(sale)
+        return 200
+
+    async def publish(self, sale: Sale) -> bool:
+        """
+        Передает продажу обработчикам, если её `invoice_id` ещё не встречался (ожидает места в очереди)
+
+        :return: True, если продажа новая
+        """
+        if not self._is_new(int(sale.invoice_id)):
+            return False
+        await self.queue.put(sale)
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            sale = await self.queue.get()
+            try:
+                for handler in self.handlers:
+                    result = handler(sale)
+                    if inspect.isawaitable(result):
+                        await result
+            except Exception:
+                logger.exception('Ошибка в обработчике продажи %s', getattr(sale, 'invoice_id', None))
+            finally:
+                self.queue.task_done()
+
+    async def poll(self, digiseller, lookback: timedelta = timedelta(hours=1), dispatch: bool = True) -> int:
+        """
+        Один опрос `seller-sells/v2` за последние `lookback`: продажи, о которых не пришло оповещение,
+        передаются обработчикам
+
+        :param digiseller: Экземпляр `AsyncDigiseller`
+        :param dispatch: False - только запомнить `invoice_id`, не вызывая обработчики
+        :return: Количество новых продаж
+        """
+        date_start = datetime.now() - lookback
+        new_count = 0
+        page = 1
+        while True:
+            sales = await digiseller.statistics.get_sales(date_start=date_start, page=page, rows=100)
+            for sale in sales:
+                if dispatch:
+                    new_count += await self.publish(sale)
+                else:
+                    new_count += self._is_new(int(sale.invoice_id))
+            if len(sales) < 100:
+                return new_count
+            page += 1
+
+    def start_polling(self,
+                      digiseller,
+                      interval: float = 300,
+                      lookback: timedelta = timedelta(hours=1),
+                      dispatch_initial: bool = False) -> asyncio.Task:
+        """
+        Запускает редкий опрос статистики как страховку от потерянных оповещений.
+        Продажи сравниваются по `invoice_id` с уже полученными
+
+        :param digiseller: Экземпляр `AsyncDigiseller`
+        :param interval: Интервал опроса в секундах
+        :param lookback: За какой период запрашивать продажи; должен быть больше `interval`
+        :param dispatch_initial: Передать обработчикам продажи из первого опроса (иначе они только запоминаются)
+        """
+        async def run() -> None:
+            dispatch = dispatch_initial
+            while True:
+                try:
+                    new_count = await self.poll(digiseller, lookback, dispatch)
+                    if dispatch and new_count:
+                        logger.info('Опрос нашел %d продаж без оповещений', new_count)
+                    dispatch = True
+                except Exception:
+                    logger.exception('Ошибка при опросе продаж')
+                await asyncio.sleep(interval)
+
+        task = asyncio.create_task(run())
+        self._tasks.append(task)
+        return task
@@ -1,10 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
-from typing import List, Dict, Optional
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Dict, NamedTuple, Optional, Tuple
 
 from pydantic import BaseModel
 
 from digiseller.api import ApiCategoryBase
+from digiseller.pagination import iter_pages
+from digiseller.records import DialogRecord
+from digiseller.results import ResultMode, convert_rows, resolve_result_mode
 
 
 class Message(BaseModel):
@@ -55,53 +61,83 @@ class Dialog(BaseModel):
         return messages
 
 
+class BulkResult(NamedTuple):
+    """
+    Результат массовой операции: результаты по заказам и ошибки отдельно
+    """
+    results: Dict[int, Any]
+    errors: Dict[int, Exception]
+
+
 class Dialogs(ApiCategoryBase):
     def __init__(self, digiseller: object) -> None:
         super().__init__(digiseller)
 
+    def _fetch_page(self,
+                    page: int,
+                    page_size: int = 200,
+                    filter_new: int = 0,
+                    result_mode: Optional[ResultMode | str] = None) -> Tuple[List[Any], Optional[int]]:
+        """
+        Запрос одной страницы диалогов
+
+        :return: Список диалогов и общее количество страниц
+        """
+        resp = self.digiseller.make_request(
+            'get', 'debates/v2/chats',
+            filter_new=filter_new,
+            email=None,
+            id_ids=None,
+            pagesize=page_size,
+            page=page
+        )
+        data = resp.json()
+        # Проверка полей pydantic быстрее `Dialog.model_construct`, поэтому CONSTRUCT создает `Dialog` так же, как MODEL
+        dialogs = convert_rows(data['chats'], resolve_result_mode(self.digiseller, result_mode),
+                               model=self._make_dialog,
+                               record=DialogRecord.from_dict,
+                               constructed=self._make_dialog)
+
+        return dialogs, data['pages']
+
+    def _make_dialog(self, dialog: dict) -> Dialog:
+        return Dialog(
+            digiseller=self.digiseller,
+            order_id=dialog['id_i'],
+            email=dialog['email'],
+            product_name=dialog['product'],
+            last_date=datetime.fromisoformat(dialog['last_date']),
+            messages_count=dialog['cnt_msg'],
+            new_messages_count=dialog['cnt_new']
+        )
+
     def get_all(self,
-                limit: int = 20) -> List[Dialog]:
+                limit: int = 20,
+                result_mode: Optional[ResultMode | str] = None) -> List[Dialog]:
         if limit == 0:
             limit = 9999
 
-        current_page = 1
+        return list(islice(self.iter_all(page_size=limit if limit < 200 else 200, result_mode=result_mode), limit))
 
-        dialogs = []
-        while True:
-            resp = self.digiseller.make_request(
-                'get', 'debates/v2/chats',
-                filter_new=0,
-                email=None,
-                id_ids=None,
-                pagesize=limit if limit < 200 else 200,
-                page=current_page
-            )
-            data = resp.json()
-            pages_count: int = data['pages']
-
-            _dialogs = data['chats']
-            for dialog in _dialogs:
-                if len(dialogs) >= limit:
-                    break
-
-                dialogs.append(
-                    Dialog(
-                        digiseller=self.digiseller,
-                        order_id=dialog['id_i'],
-                        email=dialog['email'],
-                        product_name=dialog['product'],
-                        last_date=datetime.fromisoformat(dialog['last_date']),
-                        messages_count=dialog['cnt_msg'],
-                        new_messages_count=dialog['cnt_new']
-                    )
-                )
+    def iter_all(self,
+                 page_size: int = 200,
+                 filter_new: int = 0,
+                 prefetch: bool = False,
+                 result_mode: Optional[ResultMode | str] = None) -> Iterator[Dialog]:
+        """
+        Постраничный обход диалогов
+        https://my.digiseller.com/inside/api_debates.asp#get_chats
 
-            if current_page >= pages_count:
-                break
-            else:
-                current_page += 1
+        :param page_size: Количество диалогов на одной странице (до 200)
+        :param filter_new: 0 - все диалоги; 1 - только с новыми сообщениями
+        :param prefetch: Загружать следующую страницу в фоне, пока обрабатывается текущая
+        :param result_mode: Вид записей; по умолчанию - `result_mode` клиента
 
-        return dialogs
+        :return: Генератор объектов `Dialog`
+        """
+        fetch_page = partial(self._fetch_page, page_size=page_size, filter_new=filter_new, result_mode=result_mode)
+        for dialogs in iter_pages(fetch_page, page_size=page_size, prefetch=prefetch):
+            yield from dialogs
 
     def get_status(self,
                    order_id: int):
@@ -134,6 +170,45 @@ class Dialogs(ApiCategoryBase):
         else:
             return False
 
+    @staticmethod
+    def _run_bulk(func: Callable, args: Iterable[Tuple[int, tuple]], workers: int) -> BulkResult:
+        results, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='digiseller-bulk') as executor:
+            futures = {order_id: executor.submit(func, *func_args) for order_id, func_args in args}
+            for order_id, future in futures.items():
+                try:
+                    results[order_id] = future.result()
+                except Exception as e:
+                    errors[order_id] = e
+
+        return BulkResult(results, errors)
+
+    def get_statuses(self,
+                     order_ids: Iterable[int],
+                     workers: int = 16) -> BulkResult:
+        """
+        Статусы нескольких диалогов, запрашиваемые параллельно
+
+        :param order_ids: ID заказов
+        :param workers: Количество одновременных запросов
+        :return: `BulkResult`: {order_id: статус как в `get_status`} и {order_id: ошибка}
+        """
+        return self._run_bulk(self.get_status, ((order_id, (order_id,)) for order_id in order_ids), workers)
+
+    def change_statuses(self,
+                        statuses: Dict[int, bool],
+                        workers: int = 16) -> BulkResult:
+        """
+        Изменение статуса нескольких диалогов параллельно
+
+        :param statuses: {order_id: closed}
+        :param workers: Количество одновременных запросов
+        :return: `BulkResult`: {order_id: результат как в `change_status`} и {order_id: ошибка}
+        """
+        return self._run_bulk(self.change_status,
+                              ((order_id, (order_id, closed)) for order_id, closed in statuses.items()),
+                              workers)
+
     def get_messages(self,
                      order_id: int,
                      limit: int = 20):
@@ -2,6 +2,46 @@ import hashlib
 import time
 
 
+def make_sign(api_key: str, timestamp: int) -> str:
+    """
+    Формирует подпись запроса авторизации
+
+    :param api_key: API ключ продавца
+    :param timestamp: Время формирования подписи (unix time)
+    :return: Подпись sha256 в hex
+    """
+    return hashlib.sha256((api_key + str(timestamp)).encode()).hexdigest()
+
+
+NOTIFICATION_SIGN_FIELDS = ('ID_I', 'ID_D', 'Amount', 'Currency', 'Date')
+
+
+def make_notification_sign(api_key: str, fields: dict) -> str:
+    """
+    Пример функции подписи оповещения о продаже (поле `SHA256`), которую использует `testing.FakeNotifier`.
+    Подписывается строка из значений полей `NOTIFICATION_SIGN_FIELDS` и API ключа, разделенных `;`:
+
+        ID_I;ID_D;Amount;Currency;Date;<api_key>
+
+    например `101;202;199.0;RUB;2024-03-01 12:34:56;key`. Отсутствующее поле дает пустое значение.
+    Это не формат Digiseller: набор и порядок полей подписи задаются в настройках оповещений магазина,
+    поэтому `NotificationReceiver` принимает функцию подписи обязательным аргументом `make_sign`.
+    Передавайте эту функцию, только если схема в настройках магазина совпадает с описанной
+
+    :param api_key: API ключ продавца
+    :param fields: Поля оповещения (регистр имен не важен)
+    :return: Подпись sha256 в hex
+    """
+    lower_fields = {k.lower(): v for k, v in fields.items()}
+    values = [str(lower_fields.get(name.lower(), '')) for name in NOTIFICATION_SIGN_FIELDS]
+    return hashlib.sha256(';'.join(values + [api_key]).encode()).hexdigest()
+
+
+def _record_login(instance, started: float, success: bool) -> None:
+    if instance.instrumentation is not None:
+        instance.instrumentation.record_login(time.perf_counter() - started, success)
+
+
 def get_and_set_token(instance, token_lifespan: int = 60*120) -> (str, int):
     """
     Получение и установка токена авторизации для API
@@ -12,16 +52,54 @@ def get_and_set_token(instance, token_lifespan: int = 60*120) -> (str, int):
     :return: Токен авторизации
     """
     current_time = int(time.time())
-    sign = hashlib.sha256((instance.api_key + str(current_time)).encode()).hexdigest()
+    sign = make_sign(instance.api_key, current_time)
     data = {
         'seller_id': instance.seller_id,
         'timestamp': current_time,
         'sign': sign
     }
-    resp = instance.session.post(instance.BASE_URL + 'apilogin', json=data)
+    started = time.perf_counter()
+    try:
+        resp = instance.session.post(instance.BASE_URL + 'apilogin', json=data, timeout=instance.transport.timeout)
+    except Exception:
+        _record_login(instance, started, False)
+        raise
+    _record_login(instance, started, resp.status_code == 200)
     if resp.status_code == 200:
         resp_data = resp.json()
         token = resp_data.get('token')
         return token, current_time + token_lifespan
     else:
         raise ValueError(f'Не удалось получить токен:\n{resp.text}')
+
+
+async def get_and_set_token_async(instance, token_lifespan: int = 60*120) -> (str, int):
+    """
+    Асинхронная версия `get_and_set_token` для `AsyncDigiseller`
+    https://my.digiseller.com/inside/api_general.asp#token
+
+    :param instance: Экземпляр класса `AsyncDigiseller`
+    :param token_lifespan: Время жизни токена в секундах, по умолчанию как в документации (120 мин)
+    :return: Токен авторизации
+    """
+    current_time = int(time.time())
+    data = {
+        'seller_id': instance.seller_id,
+        'timestamp': current_time,
+        'sign': make_sign(instance.api_key, current_time)
+    }
+    session = await instance.get_session()
+    started = time.perf_counter()
+    try:
+        resp = await session.post(instance.BASE_URL + 'apilogin', json=data)
+    except Exception:
+        _record_login(instance, started, False)
+        raise
+    _record_login(instance, started, resp.status == 200)
+    async with resp:
+        if resp.status == 200:
+            resp_data = await resp.json(content_type=None)
+            token = resp_data.get('token')
+            return token, current_time + token_lifespan
+        else:
+            raise ValueError(f'Не удалось получить токен:\n{await resp.text()}')
@@ -1,8 +1,16 @@
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Optional, List
+from functools import partial
+from typing import Any, Iterator, Optional, List, Tuple
+
+import requests
 
 from digiseller.api import ApiCategoryBase
+from digiseller.pagination import iter_pages
+from digiseller.records import OperationRecord
+from digiseller.results import ResultMode, construct, convert_rows, resolve_result_mode
+from digiseller.sharding import iter_sharded, record_key
+from digiseller.streaming import iter_json_array
 
 
 class Currency(Enum):
@@ -62,6 +70,63 @@ class Operations(ApiCategoryBase):
     def __init__(self, digiseller) -> None:
         super().__init__(digiseller)
 
+    @staticmethod
+    def _format_date(date: datetime | str) -> str:
+        return date.strftime('%Y-%m-%dT%H:%M') if isinstance(date, datetime) else date
+
+    def _request_page(self,
+                      page: int,
+                      count: int = 10,
+                      currency: Optional[Currency | str] = None,
+                      operation_type: Optional[OperationType | str] = None,
+                      code_filter: Optional[CodeFilter | str] = None,
+                      allow_type: Optional[AllowType | str] = None,
+                      date_start: Optional[datetime | str] = None,
+                      date_finish: Optional[datetime | str] = None,
+                      stream: bool = False) -> requests.Response:
+        """
+        Запрос одной страницы операций по аккаунту
+
+        :return: Ответ API
+        """
+        if date_start is None:
+            date_start = datetime.now() - timedelta(weeks=2)
+        if date_finish is None:
+            date_finish = datetime.now()
+
+        return self.digiseller.make_request(
+            'get', 'sellers/account/receipts',
+            stream=stream,
+            page=page,
+            count=count,
+            currency=currency.value if isinstance(currency, Currency) else currency,
+            type=operation_type.value if isinstance(operation_type, OperationType) else operation_type,
+            codeFilter=code_filter.value if isinstance(code_filter, CodeFilter) else code_filter,
+            allowType=allow_type.value if isinstance(allow_type, AllowType) else allow_type,
+            start=self._format_date(date_start),
+            finish=self._format_date(date_finish)
+        )
+
+    def _fetch_rows(self, page: int, **options) -> Tuple[List[dict], Optional[int]]:
+        """
+        Запрос одной страницы операций по аккаунту
+
+        :return: Список операций (словари ответа API) и общее количество страниц (если известно)
+        """
+        content = self._request_page(page, **options).json()['content']
+        return content['items'], content.get('total_pages')
+
+    def _fetch_page(self,
+                    page: int,
+                    result_mode: Optional[ResultMode | str] = None,
+                    **options) -> Tuple[List[Any], Optional[int]]:
+        items, pages_count = self._fetch_rows(page, **options)
+        operations = convert_rows(items, resolve_result_mode(self.digiseller, result_mode),
+                                  model=Operation.from_dict,
+                                  record=OperationRecord.from_dict,
+                                  constructed=partial(construct, Operation))
+        return operations, pages_count
+
     def get_all(self,
                 page: int = 1,
                 count: int = 10,
@@ -69,8 +134,9 @@ class Operations(ApiCategoryBase):
                 operation_type: Optional[OperationType | str] = None,
                 code_filter: Optional[CodeFilter | str] = None,
                 allow_type: Optional[AllowType | str] = None,
-                date_start: datetime = (datetime.now() - timedelta(weeks=2)).strftime('%Y-%m-%dT%H:%M'),
-                date_finish: datetime = datetime.now().strftime('%Y-%m-%dT%H:%M')) -> List[Operation]:
+                date_start: Optional[datetime | str] = None,
+                date_finish: Optional[datetime | str] = None,
+                result_mode: Optional[ResultMode | str] = None) -> List[Operation]:
         """
         Получение списка операций по аккаунту
         https://my.digiseller.com/inside/api_account.asp#digiseller
@@ -83,26 +149,156 @@ class Operations(ApiCategoryBase):
         :param allow_type: Операции недоступные для вывода (AllowType/str)
         :param date_start: Дата начала. По умолчанию - 2 недели назад
         :param date_finish: Дата конца. По умолчанию - текущая дата и время
+        :param result_mode: Вид записей; по умолчанию - `result_mode` клиента
 
         :return: Список объектов `Operation`, представляющих информацию об операции
         """
-        resp = self.digiseller.make_request(
-            'get', 'sellers/account/receipts',
-            page=page,
+        operations, _ = self._fetch_page(
+            page,
             count=count,
-            currency=currency.value if isinstance(currency, Currency) else currency,
-            type=operation_type.value if isinstance(operation_type, OperationType) else operation_type,
-            codeFilter=code_filter.value if isinstance(code_filter, CodeFilter) else code_filter,
-            allowType=allow_type.value if isinstance(allow_type, AllowType) else allow_type,
-            start=date_start,
-            finish=date_finish
+            currency=currency,
+            operation_type=operation_type,
+            code_filter=code_filter,
+            allow_type=allow_type,
+            date_start=date_start,
+            date_finish=date_finish,
+            result_mode=result_mode
         )
-        data = resp.json()
-        items = data['content']['items']
-        operations = [Operation.from_dict(item) for item in items]
-
         return operations
 
+    def iter_all(self,
+                 count: int = 200,
+                 currency: Optional[Currency | str] = None,
+                 operation_type: Optional[OperationType | str] = None,
+                 code_filter: Optional[CodeFilter | str] = None,
+                 allow_type: Optional[AllowType | str] = None,
+                 date_start: Optional[datetime | str] = None,
+                 date_finish: Optional[datetime | str] = None,
+                 prefetch: bool = False,
+                 result_mode: Optional[ResultMode | str] = None) -> Iterator[Operation]:
+        """
+        Постраничный обход операций по аккаунту (все страницы `get_all`)
+
+        :param count: Количество операций на одной странице (до 200)
+        :param currency: Валюта (Currency/str)
+        :param operation_type: Тип операции (OperationType/str)
+        :param code_filter: Операции, ожидающие проверки уникального кода (CodeFilter/str)
+        :param allow_type: Операции недоступные для вывода (AllowType/str)
+        :param date_start: Дата начала. По умолчанию - 2 недели назад
+        :param date_finish: Дата конца. По умолчанию - текущая дата и время
+        :param prefetch: Загружать следующую страницу в фоне, пока обрабатывается текущая
+        :param result_mode: Вид записей; по умолчанию - `result_mode` клиента
+
+        :return: Генератор объектов `Operation`
+        """
+        fetch_page = partial(
+            self._fetch_page,
+            count=count,
+            currency=currency,
+            operation_type=operation_type,
+            code_filter=code_filter,
+            allow_type=allow_type,
+            date_start=date_start or datetime.now() - timedelta(weeks=2),
+            date_finish=date_finish or datetime.now(),
+            result_mode=result_mode
+        )
+        for operations in iter_pages(fetch_page, page_size=count, prefetch=prefetch):
+            yield from operations
+
+    def stream_all(self,
+                   page: int = 1,
+                   count: int = 200,
+                   currency: Optional[Currency | str] = None,
+                   operation_type: Optional[OperationType | str] = None,
+                   code_filter: Optional[CodeFilter | str] = None,
+                   allow_type: Optional[AllowType | str] = None,
+                   date_start: Optional[datetime | str] = None,
+                   date_finish: Optional[datetime | str] = None,
+                   chunk_size: int = 64 * 1024) -> Iterator[Operation]:
+        """
+        Потоковая версия `get_all`: операции страницы возвращаются по мере чтения ответа,
+        без загрузки всего тела ответа в память
+
+        :param page: Номер страницы
+        :param count: Количество операций на одной странице (до 200)
+        :param currency: Валюта (Currency/str)
+        :param operation_type: Тип операции (OperationType/str)
+        :param code_filter: Операции, ожидающие проверки уникального кода (CodeFilter/str)
+        :param allow_type: Операции недоступные для вывода (AllowType/str)
+        :param date_start: Дата начала. По умолчанию - 2 недели назад
+        :param date_finish: Дата конца. По умолчанию - текущая дата и время
+        :param chunk_size: Размер читаемой части ответа в байтах
+
+        :return: Генератор объектов `Operation`
+        """
+        resp = self._request_page(
+            page,
+            count=count,
+            currency=currency,
+            operation_type=operation_type,
+            code_filter=code_filter,
+            allow_type=allow_type,
+            date_start=date_start,
+            date_finish=date_finish,
+            stream=True
+        )
+        with resp:
+            for item in iter_json_array(resp.iter_content(chunk_size), ('content', 'items'), resp.encoding or 'utf-8'):
+                yield Operation.from_dict(item)
+
+    def iter_all_sharded(self,
+                         date_start: datetime,
+                         date_finish: Optional[datetime] = None,
+                         count: int = 200,
+                         currency: Optional[Currency | str] = None,
+                         operation_type: Optional[OperationType | str] = None,
+                         code_filter: Optional[CodeFilter | str] = None,
+                         allow_type: Optional[AllowType | str] = None,
+                         workers: int = 8,
+                         max_pages_per_shard: int = 10,
+                         min_shard: timedelta = timedelta(minutes=1),
+                         result_mode: Optional[ResultMode | str] = None) -> Iterator[Operation]:
+        """
+        Выгрузка операций по аккаунту за большой период: период делится на подынтервалы,
+        которые загружаются параллельно; плотные подынтервалы дробятся дальше.
+        Операции возвращаются по мере загрузки, без повторов по `id`
+
+        :param date_start: Дата начала
+        :param date_finish: Дата конца. По умолчанию - текущая дата и время
+        :param count: Количество операций на одной странице (до 200)
+        :param currency: Валюта (Currency/str)
+        :param operation_type: Тип операции (OperationType/str)
+        :param code_filter: Операции, ожидающие проверки уникального кода (CodeFilter/str)
+        :param allow_type: Операции недоступные для вывода (AllowType/str)
+        :param workers: Количество одновременно загружаемых подынтервалов
+        :param max_pages_per_shard: Максимум страниц в подынтервале, при превышении он дробится
+        :param min_shard: Минимальная длина подынтервала (API принимает даты с точностью до минуты)
+        :param result_mode: Вид записей; по умолчанию - `result_mode` клиента
+
+        :return: Генератор объектов `Operation`
+        """
+        def make_fetch_page(start: datetime, finish: datetime):
+            return partial(
+                self._fetch_page,
+                count=count,
+                currency=currency,
+                operation_type=operation_type,
+                code_filter=code_filter,
+                allow_type=allow_type,
+                date_start=start,
+                date_finish=finish,
+                result_mode=result_mode
+            )
+
+        yield from iter_sharded(
+            make_fetch_page, date_start, date_finish or datetime.now(),
+            key=record_key('id'),
+            page_size=count,
+            workers=workers,
+            max_pages_per_shard=max_pages_per_shard,
+            min_shard=min_shard
+        )
+
     def external_aggregators(self,
                              page: int = 1,
                              count: int = 10,
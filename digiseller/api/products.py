@@ -1,6 +1,15 @@
-from typing import Optional, List
+import os
+import time
+from functools import partial
+from typing import Any, Iterator, Optional, List, Tuple
+
+import requests
 
 from digiseller.api import ApiCategoryBase
+from digiseller.pagination import iter_pages
+from digiseller.records import ProductRecord
+from digiseller.results import ResultMode, construct, convert_rows, resolve_result_mode
+from digiseller.streaming import iter_json_array
 
 
 class Category:
@@ -57,6 +66,23 @@ class Products(ApiCategoryBase):
     def __init__(self, digiseller) -> None:
         super().__init__(digiseller)
 
+    def _request_categories(self,
+                            seller_id: Optional[int] = None,
+                            category_id: int = 0,
+                            lang: str = 'ru-RU') -> List[dict]:
+        if not seller_id:
+            seller_id = self.digiseller.seller_id
+
+        resp = self.digiseller.make_request(
+            'get', 'categories',
+            seller_id=seller_id,
+            category_id=category_id,
+            lang=lang
+        )
+
+        data = resp.json()
+        return data['category'] or []
+
     def get_categories(self,
                        seller_id: Optional[int] = None,
                        category_id: int = 0,
@@ -70,21 +96,91 @@ class Products(ApiCategoryBase):
         :param category_id: ID категории; по умолчанию - 0 (все категории)
         :param lang: Язык отображения информации (ru-RU/en-US)
         """
+        categories_raw = self._request_categories(seller_id, category_id, lang)
+        categories = [Category.from_dict(category_raw) for category_raw in categories_raw]
+
+        return categories
+
+    def get_category_index(self,
+                           seller_id: Optional[int] = None,
+                           category_id: int = 0,
+                           lang: str = 'ru-RU',
+                           snapshot_path: Optional[str] = None,
+                           max_age: Optional[float] = None):
+        """
+        Получение индекса категорий (`CategoryIndex`) для быстрого поиска категории, родителя и сумм товаров
+
+        :param seller_id: ID продавца
+        :param category_id: ID категории; по умолчанию - 0 (все категории)
+        :param lang: Язык отображения информации (ru-RU/en-US)
+        :param snapshot_path: Файл снимка индекса; если он свежее `max_age` и построен с теми же
+            `seller_id`, `category_id` и `lang`, категории не запрашиваются
+        :param max_age: Максимальный возраст снимка в секундах; None - снимок используется всегда
+        """
+        from digiseller.catalog import CategoryIndex
+
+        source = {'seller_id': int(seller_id or self.digiseller.seller_id), 'category_id': category_id, 'lang': lang}
+        if snapshot_path and os.path.exists(snapshot_path):
+            if max_age is None or time.time() - os.path.getmtime(snapshot_path) < max_age:
+                index = CategoryIndex.load(snapshot_path)
+                if index.source == source:
+                    return index
+
+        index = CategoryIndex.from_raw(self._request_categories(seller_id, category_id, lang))
+        index.source = source
+        if snapshot_path:
+            index.save(snapshot_path)
+
+        return index
+
+    def _request_products(self,
+                          page: int,
+                          seller_id: Optional[int] = None,
+                          category_id: int = 0,
+                          rows: int = 20,
+                          order: Optional[str] = None,
+                          currency: str = 'RUR',
+                          lang: str = 'ru-RU',
+                          stream: bool = False) -> requests.Response:
+        """
+        Запрос одной страницы товаров из категории
+
+        :return: Ответ API
+        """
         if not seller_id:
             seller_id = self.digiseller.seller_id
 
-        resp = self.digiseller.make_request(
-            'get', 'categories',
+        return self.digiseller.make_request(
+            'get', 'shop/products',
+            stream=stream,
             seller_id=seller_id,
             category_id=category_id,
+            page=page,
+            rows=rows,
+            order=order,
+            currency=currency,
             lang=lang
         )
 
-        data = resp.json()
-        categories_raw = data['category']
-        categories = [Category.from_dict(category_raw) for category_raw in categories_raw]
+    def _fetch_products_rows(self, page: int, **options) -> Tuple[List[dict], Optional[int]]:
+        """
+        Запрос одной страницы товаров из категории
 
-        return categories
+        :return: Список товаров (словари ответа API) и общее количество страниц (если известно)
+        """
+        data = self._request_products(page, **options).json()
+        return data['product'] or [], data.get('totalPages', data.get('pages'))
+
+    def _fetch_products_page(self,
+                             page: int,
+                             result_mode: Optional[ResultMode | str] = None,
+                             **options) -> Tuple[List[Any], Optional[int]]:
+        products_raw, pages_count = self._fetch_products_rows(page, **options)
+        products = convert_rows(products_raw, resolve_result_mode(self.digiseller, result_mode),
+                                model=Product.from_dict,
+                                record=ProductRecord.from_dict,
+                                constructed=partial(construct, Product))
+        return products, pages_count
 
     def get_all_by_category(self,
                             seller_id: Optional[int] = None,
@@ -93,7 +189,8 @@ class Products(ApiCategoryBase):
                             rows: int = 20,
                             order: Optional[str] = None,
                             currency: str = 'RUR',
-                            lang: str = 'ru-RU') -> List[Product]:
+                            lang: str = 'ru-RU',
+                            result_mode: Optional[ResultMode | str] = None) -> List[Product]:
         """
         Получение списка товаров из категории
         https://my.digiseller.com/inside/api_catgoods.asp#products
@@ -105,22 +202,90 @@ class Products(ApiCategoryBase):
         :param order: Способ сортировки товаров
         :param currency: Тип валюты для отображения товара
         :param lang: Язык отображения информации (ru-RU/en-US)
+        :param result_mode: Вид записей; по умолчанию - `result_mode` клиента
         """
-        if not seller_id:
-            seller_id = self.digiseller.seller_id
+        products, _ = self._fetch_products_page(
+            page,
+            seller_id=seller_id,
+            category_id=category_id,
+            rows=rows,
+            order=order,
+            currency=currency,
+            lang=lang,
+            result_mode=result_mode
+        )
+        return products
 
-        resp = self.digiseller.make_request(
-            'get', 'shop/products',
+    def iter_all_by_category(self,
+                             seller_id: Optional[int] = None,
+                             category_id: int = 0,
+                             rows: int = 100,
+                             order: Optional[str] = None,
+                             currency: str = 'RUR',
+                             lang: str = 'ru-RU',
+                             prefetch: bool = False,
+                             result_mode: Optional[ResultMode | str] = None) -> Iterator[Product]:
+        """
+        Постраничный обход товаров из категории (все страницы `get_all_by_category`)
+
+        :param seller_id: ID продавца
+        :param category_id: ID категории; по умолчанию - 0 (все категории)
+        :param rows: Количество товаров на одной странице
+        :param order: Способ сортировки товаров
+        :param currency: Тип валюты для отображения товара
+        :param lang: Язык отображения информации (ru-RU/en-US)
+        :param prefetch: Загружать следующую страницу в фоне, пока обрабатывается текущая
+        :param result_mode: Вид записей; по умолчанию - `result_mode` клиента
+
+        :return: Генератор объектов `Product`
+        """
+        fetch_page = partial(
+            self._fetch_products_page,
             seller_id=seller_id,
             category_id=category_id,
-            page=page,
             rows=rows,
             order=order,
             currency=currency,
-            lang=lang
+            lang=lang,
+            result_mode=result_mode
         )
-        data = resp.json()
-        products_raw = data['product']
-        products = [Product.from_dict(product_raw) for product_raw in products_raw]
+        for products in iter_pages(fetch_page, page_size=rows, prefetch=prefetch):
+            yield from products
 
-        return products
+    def stream_all_by_category(self,
+                               seller_id: Optional[int] = None,
+                               category_id: int = 0,
+                               page: int = 1,
+                               rows: int = 500,
+                               order: Optional[str] = None,
+                               currency: str = 'RUR',
+                               lang: str = 'ru-RU',
+                               chunk_size: int = 64 * 1024) -> Iterator[Product]:
+        """
+        Потоковая версия `get_all_by_category`: товары страницы возвращаются по мере чтения ответа,
+        без загрузки всего тела ответа в память
+
+        :param seller_id: ID продавца
+        :param category_id: ID категории; по умолчанию - 0 (все категории)
+        :param page: Номер страницы
+        :param rows: Количество товаров на одной странице
+        :param order: Способ сортировки товаров
+        :param currency: Тип валюты для отображения товара
+        :param lang: Язык отображения информации (ru-RU/en-US)
+        :param chunk_size: Размер читаемой части ответа в байтах
+
+        :return: Генератор объектов `Product`
+        """
+        resp = self._request_products(
+            page,
+            seller_id=seller_id,
+            category_id=category_id,
+            rows=rows,
+            order=order,
+            currency=currency,
+            lang=lang,
+            stream=True
+        )
+        with resp:
+            for product_raw in iter_json_array(resp.iter_content(chunk_size), 'product', resp.encoding or 'utf-8'):
+                yield Product.from_dict(product_raw)
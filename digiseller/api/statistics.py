@@ -1,7 +1,16 @@
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Iterator, List, Optional, Tuple
+
+import requests
 
 from digiseller.api import ApiCategoryBase
+from digiseller.columnar import SalesColumns
+from digiseller.records import SaleRecord
+from digiseller.results import ResultMode, construct, convert_rows, resolve_result_mode
+from digiseller.pagination import iter_pages, iter_pages_parallel
+from digiseller.streaming import iter_json_array
+from digiseller.sharding import iter_sharded, record_key
 
 
 class Sale:
@@ -53,13 +62,83 @@ class Statistics(ApiCategoryBase):
 
         return sales
 
+    def stream_latest_sales(self, group: bool = True, top: int = 1000, chunk_size: int = 64 * 1024) -> Iterator[Sale]:
+        """
+        Потоковая версия `get_latest_sales`: продажи возвращаются по мере чтения ответа,
+        без загрузки всего тела ответа в память
+
+        :param group: Флаг для группировки результатов по товарам
+        :param top: Количество последних продаж для получения.
+        :param chunk_size: Размер читаемой части ответа в байтах
+
+        :return: Генератор объектов `Sale`
+        """
+        resp = self.digiseller.make_request(
+            'get', 'seller-last-sales',
+            stream=True,
+            seller_id=self.digiseller.seller_id,
+            group=group,
+            top=top
+        )
+        with resp:
+            for last_sale_raw in iter_json_array(resp.iter_content(chunk_size), 'sales', resp.encoding or 'utf-8'):
+                yield Sale.from_dict(last_sale_raw['product'])
+
+    def _request_sales(self,
+                       endpoint: str,
+                       partner_id: Optional[int] = None,
+                       product_ids: Optional[List[int]] = None,
+                       date_start: datetime = datetime(2000, 1, 1, 0, 0, 0),
+                       date_finish: Optional[datetime] = None,
+                       returned: int = 0,
+                       page: int = 1,
+                       rows: int = 10,
+                       stream: bool = False) -> requests.Response:
+        """
+        Запрос одной страницы статистики продаж (`seller-sells/v2` или `agent-sales/v2`)
+
+        :return: Ответ API
+        """
+        if date_finish is None:
+            date_finish = datetime.now()
+
+        resp = self.digiseller.make_request(
+            'post', endpoint,
+            stream=stream,
+            id_partner=partner_id,
+            product_ids=product_ids,
+            date_start=date_start.strftime('%Y-%m-%d %H:%M:%S'),
+            date_finish=date_finish.strftime('%Y-%m-%d %H:%M:%S'),
+            returned=returned,
+            page=page,
+            rows=rows
+        )
+        return resp
+
+    def _fetch_sales_rows(self, endpoint: str, page: int, **options) -> Tuple[List[dict], Optional[int]]:
+        data = self._request_sales(endpoint, page=page, **options).json()
+        return data['rows'], data.get('pages')
+
+    def _fetch_sales_page(self,
+                          endpoint: str,
+                          page: int,
+                          result_mode: Optional[ResultMode | str] = None,
+                          **options) -> Tuple[List[Any], Optional[int]]:
+        sales_raw, pages_count = self._fetch_sales_rows(endpoint, page, **options)
+        sales = convert_rows(sales_raw, resolve_result_mode(self.digiseller, result_mode),
+                             model=Sale.from_dict,
+                             record=SaleRecord.from_dict,
+                             constructed=partial(construct, Sale))
+        return sales, pages_count
+
     def get_sales(self,
                   product_ids: Optional[List[int]] = None,
                   date_start: datetime = datetime(2000, 1, 1, 0, 0, 0),
-                  date_finish: datetime = datetime.now(),
+                  date_finish: Optional[datetime] = None,
                   returned: int = 0,
                   page: int = 1,
-                  rows: int = 10) -> List[Sale]:
+                  rows: int = 10,
+                  result_mode: Optional[ResultMode | str] = None) -> List[Sale]:
         """
         Получение подробной статистики по продажам.
         https://my.digiseller.com/inside/api_statistics.asp#statisticsells
@@ -70,33 +149,181 @@ class Statistics(ApiCategoryBase):
         :param returned: 0 - включить возвраты; 1 - без возвратов; 2 - только возвраты
         :param page: Номер страницы
         :param rows: Количество продаж на одной странице. До 100 продаж.
+        :param result_mode: Вид записей; по умолчанию - `result_mode` клиента
 
         :return: Список объектов `Sale`, представляющих информацию о продаже
         """
-        resp = self.digiseller.make_request(
-            'post', 'seller-sells/v2',
+        sales, _ = self._fetch_sales_page(
+            'seller-sells/v2',
+            page=page,
             product_ids=product_ids,
-            date_start=date_start.strftime('%Y-%m-%d %H:%M:%S'),
-            date_finish=date_finish.strftime('%Y-%m-%d %H:%M:%S'),
+            date_start=date_start,
+            date_finish=date_finish,
+            returned=returned,
+            rows=rows,
+            result_mode=result_mode
+        )
+        return sales
+
+    def iter_sales(self,
+                   product_ids: Optional[List[int]] = None,
+                   date_start: datetime = datetime(2000, 1, 1, 0, 0, 0),
+                   date_finish: Optional[datetime] = None,
+                   returned: int = 0,
+                   rows: int = 100,
+                   prefetch: bool = False,
+                   result_mode: Optional[ResultMode | str] = None) -> Iterator[Sale]:
+        """
+        Постраничный обход подробной статистики по продажам (все страницы `get_sales`)
+
+        :param product_ids: Список ID товаров. Если не указано - по всем товарам.
+        :param date_start: Дата начала. По умолчанию - 2000 год (чтобы получить все продажи)
+        :param date_finish: Дата конца. По умолчанию - текущая дата и время
+        :param returned: 0 - включить возвраты; 1 - без возвратов; 2 - только возвраты
+        :param rows: Количество продаж на одной странице. До 100 продаж.
+        :param prefetch: Загружать следующую страницу в фоне, пока обрабатывается текущая
+        :param result_mode: Вид записей; по умолчанию - `result_mode` клиента
+
+        :return: Генератор объектов `Sale`
+        """
+        fetch_page = partial(
+            self._fetch_sales_page, 'seller-sells/v2',
+            product_ids=product_ids,
+            date_start=date_start,
+            date_finish=date_finish or datetime.now(),
+            returned=returned,
+            rows=rows,
+            result_mode=result_mode
+        )
+        for sales in iter_pages(fetch_page, page_size=rows, prefetch=prefetch):
+            yield from sales
+
+    def iter_sales_bulk(self,
+                        product_ids: Optional[List[int]] = None,
+                        date_start: datetime = datetime(2000, 1, 1, 0, 0, 0),
+                        date_finish: Optional[datetime] = None,
+                        returned: int = 0,
+                        rows: int = 100,
+                        workers: int = 8,
+                        ordered: bool = True,
+                        retries: int = 3,
+                        result_mode: Optional[ResultMode | str] = None) -> Iterator[Sale]:
+        """
+        Массовая выгрузка статистики по продажам: после первой страницы остальные загружаются параллельно
+
+        :param product_ids: Список ID товаров. Если не указано - по всем товарам.
+        :param date_start: Дата начала. По умолчанию - 2000 год (чтобы получить все продажи)
+        :param date_finish: Дата конца. По умолчанию - текущая дата и время
+        :param returned: 0 - включить возвраты; 1 - без возвратов; 2 - только возвраты
+        :param rows: Количество продаж на одной странице. До 100 продаж.
+        :param workers: Количество одновременно загружаемых страниц
+        :param ordered: True - продажи в порядке страниц; False - по мере загрузки страниц
+        :param retries: Количество повторных попыток для каждой страницы
+        :param result_mode: Вид записей; по умолчанию - `result_mode` клиента
+
+        :return: Генератор объектов `Sale`
+        """
+        fetch_page = partial(
+            self._fetch_sales_page, 'seller-sells/v2',
+            product_ids=product_ids,
+            date_start=date_start,
+            date_finish=date_finish or datetime.now(),
+            returned=returned,
+            rows=rows,
+            result_mode=result_mode
+        )
+        for sales in iter_pages_parallel(fetch_page, page_size=rows, workers=workers, ordered=ordered, retries=retries):
+            yield from sales
+
+    def get_sales_columnar(self,
+                           product_ids: Optional[List[int]] = None,
+                           date_start: datetime = datetime(2000, 1, 1, 0, 0, 0),
+                           date_finish: Optional[datetime] = None,
+                           returned: int = 0,
+                           rows: int = 100,
+                           workers: int = 8) -> SalesColumns:
+        """
+        Загрузка всех страниц статистики по продажам сразу в колоночный вид, без создания объектов `Sale`
+
+        :param product_ids: Список ID товаров. Если не указано - по всем товарам.
+        :param date_start: Дата начала. По умолчанию - 2000 год (чтобы получить все продажи)
+        :param date_finish: Дата конца. По умолчанию - текущая дата и время
+        :param returned: 0 - включить возвраты; 1 - без возвратов; 2 - только возвраты
+        :param rows: Количество продаж на одной странице. До 100 продаж.
+        :param workers: Количество одновременно загружаемых страниц
+
+        :return: Объект `SalesColumns` с колонками и агрегациями
+        """
+        fetch_page = partial(
+            self._fetch_sales_rows, 'seller-sells/v2',
+            product_ids=product_ids,
+            date_start=date_start,
+            date_finish=date_finish or datetime.now(),
             returned=returned,
-            page=page,
             rows=rows
         )
-        data = resp.json()
-        sales_raw = data['rows']
-        sales = [Sale.from_dict(sale_raw) for sale_raw in sales_raw]
+        columns = SalesColumns()
+        for sales_raw in iter_pages_parallel(fetch_page, page_size=rows, workers=workers, ordered=False):
+            columns.extend(sales_raw)
 
-        return sales
+        return columns
+
+    def iter_sales_sharded(self,
+                           product_ids: Optional[List[int]] = None,
+                           date_start: datetime = datetime(2000, 1, 1, 0, 0, 0),
+                           date_finish: Optional[datetime] = None,
+                           returned: int = 0,
+                           rows: int = 100,
+                           workers: int = 8,
+                           max_pages_per_shard: int = 10,
+                           min_shard: timedelta = timedelta(minutes=1),
+                           result_mode: Optional[ResultMode | str] = None) -> Iterator[Sale]:
+        """
+        Выгрузка статистики по продажам за большой период: период делится на подынтервалы,
+        которые загружаются параллельно; плотные подынтервалы дробятся дальше.
+        Продажи возвращаются по мере загрузки, без повторов по `invoice_id`
+
+        :param product_ids: Список ID товаров. Если не указано - по всем товарам.
+        :param date_start: Дата начала. По умолчанию - 2000 год (чтобы получить все продажи)
+        :param date_finish: Дата конца. По умолчанию - текущая дата и время
+        :param returned: 0 - включить возвраты; 1 - без возвратов; 2 - только возвраты
+        :param rows: Количество продаж на одной странице. До 100 продаж.
+        :param workers: Количество одновременно загружаемых подынтервалов
+        :param max_pages_per_shard: Максимум страниц в подынтервале, при превышении он дробится
+        :param min_shard: Минимальная длина подынтервала
+        :param result_mode: Вид записей; по умолчанию - `result_mode` клиента
+
+        :return: Генератор объектов `Sale`
+        """
+        def make_fetch_page(start: datetime, finish: datetime):
+            return partial(
+                self._fetch_sales_page, 'seller-sells/v2',
+                product_ids=product_ids,
+                date_start=start,
+                date_finish=finish,
+                returned=returned,
+                rows=rows,
+                result_mode=result_mode
+            )
+
+        yield from iter_sharded(
+            make_fetch_page, date_start, date_finish or datetime.now(),
+            key=record_key('invoice_id'),
+            page_size=rows,
+            workers=workers,
+            max_pages_per_shard=max_pages_per_shard,
+            min_shard=min_shard
+        )
 
     def get_sales_as_agent(self,
                            partner_id: Optional[int] = None,
                            product_ids: Optional[List[int]] = None,
                            date_start: datetime = datetime(2000, 1, 1, 0, 0, 0),
-                           date_finish: datetime = datetime.now(),
+                           date_finish: Optional[datetime] = None,
                            returned: int = 0,
-                           page: int = 0,
-                           rows: int = 10
-                           ):
+                           page: int = 1,
+                           rows: int = 10,
+                           result_mode: Optional[ResultMode | str] = None):
         """
             Получение статистики по продажам в качестве агента
             https://my.digiseller.com/inside/api_statistics.asp#statistics_agent_sales
@@ -106,23 +333,96 @@ class Statistics(ApiCategoryBase):
             :param date_start: Дата начала. По умолчанию - 2000 год (чтобы получить все продажи)
             :param date_finish: Дата конца. По умолчанию - текущая дата и время
             :param returned: 0 - включить возвраты; 1 - без возвратов; 2 - только возвраты
-            :param page: Номер страницы
+            :param page: Номер страницы (начиная с 1)
             :param rows: Количество продаж на одной странице. До 1000 продаж.
+            :param result_mode: Вид записей; по умолчанию - `result_mode` клиента
 
             :return: Список объектов `Sale`, представляющих информацию о продаже
         """
-        resp = self.digiseller.make_request(
-            'post', 'agent-sales/v2',
-            id_partner=partner_id,
+        sales, _ = self._fetch_sales_page(
+            'agent-sales/v2',
+            page=page,
+            partner_id=partner_id,
             product_ids=product_ids,
-            date_start=date_start.strftime('%Y-%m-%d %H:%M:%S'),
-            date_finish=date_finish.strftime('%Y-%m-%d %H:%M:%S'),
+            date_start=date_start,
+            date_finish=date_finish,
             returned=returned,
-            page=page,
-            rows=rows
+            rows=rows,
+            result_mode=result_mode
         )
-        data = resp.json()
-        sales_raw = data['rows']
-        sales = [Sale.from_dict(sale_raw) for sale_raw in sales_raw]
-
         return sales
+
+    def iter_sales_as_agent(self,
+                            partner_id: Optional[int] = None,
+                            product_ids: Optional[List[int]] = None,
+                            date_start: datetime = datetime(2000, 1, 1, 0, 0, 0),
+                            date_finish: Optional[datetime] = None,
+                            returned: int = 0,
+                            rows: int = 1000,
+                            prefetch: bool = False,
+                            result_mode: Optional[ResultMode | str] = None) -> Iterator[Sale]:
+        """
+        Постраничный обход статистики по продажам в качестве агента (все страницы `get_sales_as_agent`)
+
+        :param partner_id: ID партнера
+        :param product_ids: Список ID товаров. Если не указано - по всем товарам.
+        :param date_start: Дата начала. По умолчанию - 2000 год (чтобы получить все продажи)
+        :param date_finish: Дата конца. По умолчанию - текущая дата и время
+        :param returned: 0 - включить возвраты; 1 - без возвратов; 2 - только возвраты
+        :param rows: Количество продаж на одной странице. До 1000 продаж.
+        :param prefetch: Загружать следующую страницу в фоне, пока обрабатывается текущая
+        :param result_mode: Вид записей; по умолчанию - `result_mode` клиента
+
+        :return: Генератор объектов `Sale`
+        """
+        fetch_page = partial(
+            self._fetch_sales_page, 'agent-sales/v2',
+            partner_id=partner_id,
+            product_ids=product_ids,
+            date_start=date_start,
+            date_finish=date_finish or datetime.now(),
+            returned=returned,
+            rows=rows,
+            result_mode=result_mode
+        )
+        for sales in iter_pages(fetch_page, page_size=rows, prefetch=prefetch):
+            yield from sales
+
+    def stream_sales_as_agent(self,
+                              partner_id: Optional[int] = None,
+                              product_ids: Optional[List[int]] = None,
+                              date_start: datetime = datetime(2000, 1, 1, 0, 0, 0),
+                              date_finish: Optional[datetime] = None,
+                              returned: int = 0,
+                              page: int = 1,
+                              rows: int = 1000,
+                              chunk_size: int = 64 * 1024) -> Iterator[Sale]:
+        """
+        Потоковая версия `get_sales_as_agent`: продажи страницы возвращаются по мере чтения ответа,
+        без загрузки всего тела ответа в память
+
+        :param partner_id: ID партнера
+        :param product_ids: Список ID товаров. Если не указано - по всем товарам.
+        :param date_start: Дата начала. По умолчанию - 2000 год (чтобы получить все продажи)
+        :param date_finish: Дата конца. По умолчанию - текущая дата и время
+        :param returned: 0 - включить возвраты; 1 - без возвратов; 2 - только возвраты
+        :param page: Номер страницы
+        :param rows: Количество продаж на одной странице. До 1000 продаж.
+        :param chunk_size: Размер читаемой части ответа в байтах
+
+        :return: Генератор объектов `Sale`
+        """
+        resp = self._request_sales(
+            'agent-sales/v2',
+            partner_id=partner_id,
+            product_ids=product_ids,
+            date_start=date_start,
+            date_finish=date_finish,
+            returned=returned,
+            page=page,
+            rows=rows,
+            stream=True
+        )
+        with resp:
+            for sale_raw in iter_json_array(resp.iter_content(chunk_size), 'rows', resp.encoding or 'utf-8'):
+                yield Sale.from_dict(sale_raw)
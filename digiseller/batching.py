@@ -0,0 +1,168 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .api.statistics import Sale
+from .results import ResultMode
+
+logger = logging.getLogger(__name__)
+
+BatchKey = Tuple[datetime, Optional[datetime], int]  # (date_start, date_finish, returned)
+
+
+class _Batch:
+    __slots__ = ('key', 'futures', 'timer')
+
+    def __init__(self, key: BatchKey) -> None:
+        self.key: BatchKey = key
+        self.futures: Dict[int, List[Future]] = {}  # product_id -> ожидающие вызовы
+        self.timer: Optional[threading.Timer] = None
+
+
+class SalesBatcher:
+    """
+    Объединяет запросы продаж по отдельным товарам в общие запросы `seller-sells/v2`.
+    Запросы с одинаковым периодом, пришедшие в течение `window` секунд, отправляются одним
+    `product_ids` (не более `max_batch` товаров на запрос), а полученные продажи
+    распределяются между вызывающими по `product_id`.
+
+    В одну группу попадают только запросы с совпадающими `date_start`, `date_finish` и `returned`;
+    даты сравниваются с точностью до секунды, как их принимает API. Чтобы запросы «по текущий момент»
+    объединялись, передавайте `date_finish=None`, а не `datetime.now()`
+    """
+
+    def __init__(self,
+                 digiseller,
+                 window: float = 0.02,
+                 max_batch: int = 100,
+                 workers: int = 4,
+                 rows: int = 100) -> None:
+        """
+        :param digiseller: Экземпляр класса `Digiseller`
+        :param window: Сколько секунд собирать запросы перед отправкой
+        :param max_batch: Максимальное количество товаров в одном запросе; полная группа отправляется сразу
+        :param workers: Количество одновременно выполняемых общих запросов
+        :param rows: Количество продаж на одной странице общего запроса (до 100)
+        """
+        self.digiseller = digiseller
+        self.window: float = window
+        self.max_batch: int = max_batch
+        self.rows: int = rows
+
+        self._pending: Dict[BatchKey, _Batch] = {}
+        self._lock = threading.Lock()
+        self._closed: bool = False
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='digiseller-sales-batcher')
+
+    def __enter__(self) -> 'SalesBatcher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def submit(self,
+               product_id: int,
+               date_start: datetime = datetime(2000, 1, 1, 0, 0, 0),
+               date_finish: Optional[datetime] = None,
+               returned: int = 0) -> 'Future[List[Sale]]':
+        """
+        Добавляет товар в ближайший общий запрос
+
+        :param product_id: ID товара
+        :param date_start: Дата начала
+        :param date_finish: Дата конца. По умолчанию - время отправки общего запроса
+        :param returned: 0 - включить возвраты; 1 - без возвратов; 2 - только возвраты
+
+        :return: Future со списком объектов `Sale` этого товара
+        :raises RuntimeError: Если батчер уже закрыт
+        """
+        future: Future = Future()
+        key = (date_start.replace(microsecond=0),
+               date_finish.replace(microsecond=0) if date_finish is not None else None,
+               returned)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('SalesBatcher закрыт')
+
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = self._pending[key] = _Batch(key)
+                batch.timer = threading.Timer(self.window, self._flush_batch, (batch,))
+                batch.timer.daemon = True
+                batch.timer.start()
+
+            batch.futures.setdefault(int(product_id), []).append(future)
+            if len(batch.futures) >= self.max_batch:
+                batch.timer.cancel()
+                self._dispatch(batch)
+        return future
+
+    def get_sales(self,
+                  product_id: int,
+                  date_start: datetime = datetime(2000, 1, 1, 0, 0, 0),
+                  date_finish: Optional[datetime] = None,
+                  returned: int = 0) -> List[Sale]:
+        """
+        Все продажи товара за период; блокирует поток до выполнения общего запроса
+
+        :return: Список объектов `Sale`
+        """
+        return self.submit(product_id, date_start, date_finish, returned).result()
+
+    def flush(self) -> None:
+        """
+        Немедленно отправляет все собранные запросы
+        """
+        with self._lock:
+            for batch in list(self._pending.values()):
+                batch.timer.cancel()
+                self._dispatch(batch)
+
+    def close(self) -> None:
+        """
+        Отправляет собранные запросы и дожидается их выполнения; после этого `submit` недоступен
+        """
+        with self._lock:
+            self._closed = True
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _flush_batch(self, batch: _Batch) -> None:
+        with self._lock:
+            if self._pending.get(batch.key) is batch:
+                self._dispatch(batch)
+
+    def _dispatch(self, batch: _Batch) -> None:
+        """
+        Отправляет группу на выполнение. Вызывается только под блокировкой
+        """
+        del self._pending[batch.key]
+        self._executor.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch: _Batch) -> None:
+        date_start, date_finish, returned = batch.key
+        try:
+            by_product: Dict[int, List[Sale]] = {product_id: [] for product_id in batch.futures}
+            sales = self.digiseller.statistics.iter_sales(product_ids=sorted(batch.futures),
+                                                          date_start=date_start,
+                                                          date_finish=date_finish,
+                                                          returned=returned,
+                                                          rows=self.rows,
+                                                          result_mode=ResultMode.MODEL)
+            for sale in sales:
+                product_sales = by_product.get(int(getattr(sale, 'product_id', 0)))
+                if product_sales is not None:
+                    product_sales.append(sale)
+        except Exception as e:
+            logger.warning('Не удалось получить продажи для %d товаров', len(batch.futures), exc_info=True)
+            for futures in batch.futures.values():
+                for future in futures:
+                    future.set_exception(e)
+            return
+
+        for product_id, futures in batch.futures.items():
+            for future in futures:
+                # Каждый вызывающий получает свой список, общий только для объектов `Sale`
+                future.set_result(list(by_product[product_id]))
@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+CacheKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def make_key(endpoint: str, params: dict) -> CacheKey:
+    """
+    Ключ запроса: эндпоинт и нормализованные параметры без меняющегося `token`
+
+    :param endpoint: Эндпоинт API
+    :param params: Параметры запроса
+    """
+    return endpoint, tuple(sorted((k, str(v)) for k, v in params.items() if k != 'token' and v is not None))
+
+
+class ResponseCache:
+    """
+    Потокобезопасный TTL/LRU кэш ответов для редко меняющихся GET эндпоинтов.
+    Кэшируются только эндпоинты, для которых задано время жизни.
+    Значения хранятся без копирования: при попадании `Digiseller.make_request` возвращает
+    тот же объект `Response` всем вызывающим, поэтому его можно только читать
+    """
+
+    DEFAULT_TTL: Dict[str, float] = {
+        'categories': 300,
+        'shop/products': 60,
+        'sellers/account/balance/info': 10,
+    }
+
+    def __init__(self,
+                 ttl: Optional[Dict[str, float]] = None,
+                 max_size: int = 1024,
+                 stale_while_revalidate: float = 0) -> None:
+        """
+        :param ttl: Время жизни ответов по эндпоинтам в секундах, по умолчанию - `DEFAULT_TTL`
+        :param max_size: Максимальное количество ответов в кэше, самые давно использованные вытесняются
+        :param stale_while_revalidate: Сколько секунд после истечения TTL отдавать устаревший ответ, обновляя его в фоне
+        """
+        self.ttl: Dict[str, float] = dict(self.DEFAULT_TTL if ttl is None else ttl)
+        self.max_size: int = max_size
+        self.stale_while_revalidate: float = stale_while_revalidate
+
+        self._entries: OrderedDict[Hashable, Tuple[Any, float, float]] = OrderedDict()  # ключ -> (значение, время сохранения, TTL)
+        self._revalidating: set = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_cacheable(self, endpoint: str) -> bool:
+        return endpoint in self.ttl
+
+    def get(self, key: CacheKey) -> Optional[Tuple[Any, bool]]:
+        """
+        :return: (значение, устарело ли оно) или None, если значения нет или оно слишком старое
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, stored_at, ttl = entry
+            age = time.monotonic() - stored_at
+            if age >= ttl + self.stale_while_revalidate:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value, age >= ttl
+
+    def set(self, key: CacheKey, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic(), self.ttl[key[0]])
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def begin_revalidate(self, key: CacheKey) -> bool:
+        """
+        Отмечает начало фонового обновления ключа
+
+        :return: False, если ключ уже обновляется
+        """
+        with self._lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            return True
+
+    def end_revalidate(self, key: CacheKey) -> None:
+        with self._lock:
+            self._revalidating.discard(key)
+
+    def invalidate(self, endpoint: Optional[str] = None, **params) -> int:
+        """
+        Удаляет ответы из кэша: все, все по эндпоинту или по эндпоинту с указанными параметрами
+
+        :param endpoint: Эндпоинт; если не указан - кэш очищается полностью
+        :param params: Параметры запроса, которые должны совпасть
+        :return: Количество удаленных ответов
+        """
+        expected = {(k, str(v)) for k, v in params.items()}
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if endpoint is None or (key[0] == endpoint and expected.issubset(key[1]))
+            ]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        self.invalidate()
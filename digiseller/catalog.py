@@ -0,0 +1,354 @@
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from .api.products import Category, Product
+from .pagination import fetch_page_with_retry, has_next_page
+
+
+class CategoryIndex:
+    """
+    Плоский индекс дерева категорий: поиск категории, родителя, пути и суммы товаров поддерева за O(1).
+    Строится без рекурсии, поэтому глубина дерева не ограничена лимитом рекурсии Python
+    """
+
+    def __init__(self) -> None:
+        self.names: Dict[int, str] = {}
+        self.products_count: Dict[int, int] = {}
+        self.parents: Dict[int, Optional[int]] = {}
+        self.children: Dict[int, List[int]] = {}
+        self.subtree_products_count: Dict[int, int] = {}
+        self.paths: Dict[int, Tuple[int, ...]] = {}  # Путь от корня до категории включительно
+        self.source: Optional[dict] = None  # Параметры запроса категорий, по которому построен индекс
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, category_id: int) -> bool:
+        return category_id in self.names
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.names)
+
+    @property
+    def roots(self) -> List[int]:
+        return [category_id for category_id, parent_id in self.parents.items() if parent_id is None]
+
+    @classmethod
+    def from_raw(cls, categories_raw: Iterable[dict]) -> 'CategoryIndex':
+        """
+        Строит индекс из ответа `categories` (список словарей с вложенными `sub`)
+        """
+        index = cls()
+        queue = deque((category_raw, None) for category_raw in categories_raw)
+        while queue:
+            category_raw, parent_id = queue.popleft()
+            index._add(category_raw['id'], category_raw['name'], category_raw['products_count'], parent_id)
+            for subcategory_raw in category_raw.get('sub') or ():
+                queue.append((subcategory_raw, category_raw['id']))
+
+        index._compute_totals()
+        return index
+
+    @classmethod
+    def from_categories(cls, categories: Iterable[Category]) -> 'CategoryIndex':
+        """
+        Строит индекс из дерева объектов `Category`
+        """
+        index = cls()
+        queue = deque((category, None) for category in categories)
+        while queue:
+            category, parent_id = queue.popleft()
+            index._add(category.id, category.name, category.products_count, parent_id)
+            for subcategory in category.subcategories or ():
+                queue.append((subcategory, category.id))
+
+        index._compute_totals()
+        return index
+
+    def _add(self, category_id: int, name: str, products_count: int, parent_id: Optional[int]) -> None:
+        self.names[category_id] = name
+        self.products_count[category_id] = products_count
+        self.parents[category_id] = parent_id
+        self.children.setdefault(category_id, [])
+        if parent_id is None:
+            self.paths[category_id] = (category_id,)
+        else:
+            self.children[parent_id].append(category_id)
+            self.paths[category_id] = self.paths[parent_id] + (category_id,)
+
+    def _compute_totals(self) -> None:
+        """
+        Суммы товаров поддеревьев: категории добавлены в порядке обхода в ширину,
+        поэтому обратный порядок гарантирует, что дети посчитаны раньше родителя
+        """
+        totals = dict(self.products_count)
+        for category_id in reversed(list(self.names)):
+            parent_id = self.parents[category_id]
+            if parent_id is not None:
+                totals[parent_id] += totals[category_id]
+        self.subtree_products_count = totals
+
+    def get(self, category_id: int) -> Category:
+        """
+        Категория без подкатегорий (для обхода используйте `children`)
+        """
+        return Category(_id=category_id,
+                        name=self.names[category_id],
+                        products_count=self.products_count[category_id],
+                        subcategories=None)
+
+    def parent(self, category_id: int) -> Optional[int]:
+        return self.parents[category_id]
+
+    def ancestors(self, category_id: int) -> Tuple[int, ...]:
+        """
+        ID предков категории от корня (без самой категории)
+        """
+        return self.paths[category_id][:-1]
+
+    def path_names(self, category_id: int, separator: str = ' / ') -> str:
+        return separator.join(self.names[path_id] for path_id in self.paths[category_id])
+
+    def descendants(self, category_id: int) -> List[int]:
+        """
+        ID всех потомков категории (обход в ширину)
+        """
+        result = []
+        queue = deque(self.children[category_id])
+        while queue:
+            child_id = queue.popleft()
+            result.append(child_id)
+            queue.extend(self.children[child_id])
+        return result
+
+    def subtree_total(self, category_id: int) -> int:
+        """
+        Количество товаров в категории вместе со всеми подкатегориями
+        """
+        return self.subtree_products_count[category_id]
+
+    def to_dict(self) -> dict:
+        return {
+            'source': self.source,
+            'categories': [
+                [category_id, self.names[category_id], self.products_count[category_id], self.parents[category_id]]
+                for category_id in self.names
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CategoryIndex':
+        index = cls()
+        for category_id, name, products_count, parent_id in data['categories']:
+            index._add(category_id, name, products_count, parent_id)
+        index._compute_totals()
+        index.source = data.get('source')
+        return index
+
+    def save(self, path: str) -> None:
+        """
+        Сохраняет снимок индекса на диск для быстрого старта
+        """
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'CategoryIndex':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def product_hash(product_raw: dict, category_ids: Iterable[int] = (), ignore_fields: Iterable[str] = ()) -> str:
+    """
+    Короткий хэш содержимого товара (64 бита в hex) для сравнения снимков каталога
+
+    :param product_raw: Товар в виде словаря ответа API
+    :param category_ids: Категории, в которых найден товар (перенос в другую категорию - тоже изменение)
+    :param ignore_fields: Поля, изменения которых не учитываются (например, счетчик продаж)
+    """
+    ignore_fields = set(ignore_fields)
+    content = {k: v for k, v in product_raw.items() if k not in ignore_fields}
+    payload = json.dumps([content, sorted(category_ids)], sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+
+class CatalogDiff(NamedTuple):
+    added: List[int]
+    removed: List[int]
+    changed: List[int]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+class CatalogSnapshot:
+    """
+    Компактный снимок каталога: хэш содержимого для каждого ID товара
+    """
+
+    def __init__(self, hashes: Optional[Dict[int, str]] = None, created_at: Optional[float] = None) -> None:
+        self.hashes: Dict[int, str] = hashes or {}
+        self.created_at: float = time.time() if created_at is None else created_at
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def __contains__(self, product_id: int) -> bool:
+        return product_id in self.hashes
+
+    def diff(self, previous: Optional['CatalogSnapshot']) -> CatalogDiff:
+        """
+        Изменения относительно предыдущего снимка (без него все товары считаются добавленными)
+        """
+        previous_hashes = previous.hashes if previous is not None else {}
+        return CatalogDiff(
+            added=sorted(self.hashes.keys() - previous_hashes.keys()),
+            removed=sorted(previous_hashes.keys() - self.hashes.keys()),
+            changed=sorted(product_id for product_id, product_hash_ in self.hashes.items()
+                           if product_id in previous_hashes and previous_hashes[product_id] != product_hash_),
+        )
+
+    def to_dict(self) -> dict:
+        return {'created_at': self.created_at, 'products': {str(k): v for k, v in self.hashes.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CatalogSnapshot':
+        return cls({int(k): v for k, v in data['products'].items()}, data.get('created_at'))
+
+    def save(self, path: str) -> None:
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'CatalogSnapshot':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+class CrawlResult(NamedTuple):
+    snapshot: CatalogSnapshot
+    diff: CatalogDiff
+    products: Dict[int, Product]  # Только добавленные и измененные товары
+    categories: CategoryIndex
+
+
+class CatalogCrawler:
+    """
+    Полный обход каталога продавца: категории и все страницы товаров каждой категории
+    загружаются параллельно, а результат сравнивается с предыдущим снимком по хэшам товаров
+    """
+
+    def __init__(self,
+                 digiseller,
+                 seller_id: Optional[int] = None,
+                 workers: int = 8,
+                 rows: int = 100,
+                 currency: str = 'RUR',
+                 lang: str = 'ru-RU',
+                 ignore_fields: Iterable[str] = (),
+                 retries: int = 3,
+                 retry_delay: float = 1.0) -> None:
+        """
+        :param digiseller: Экземпляр класса `Digiseller`
+        :param seller_id: ID продавца, по умолчанию - продавец клиента
+        :param workers: Количество одновременно загружаемых страниц
+        :param rows: Количество товаров на одной странице
+        :param currency: Тип валюты для отображения товаров
+        :param lang: Язык отображения информации (ru-RU/en-US)
+        :param ignore_fields: Поля товара, изменения которых не считаются изменением (например `cnt_sell`)
+        :param retries: Количество повторных попыток для каждой страницы
+        :param retry_delay: Задержка перед первой повторной попыткой в секундах
+        """
+        self.digiseller = digiseller
+        self.seller_id: Optional[int] = seller_id
+        self.workers: int = workers
+        self.rows: int = rows
+        self.currency: str = currency
+        self.lang: str = lang
+        self.ignore_fields: Tuple[str, ...] = tuple(ignore_fields)
+        self.retries: int = retries
+        self.retry_delay: float = retry_delay
+
+    def fetch(self) -> Tuple[CategoryIndex, Dict[int, dict], Dict[int, Set[int]]]:
+        """
+        Загружает весь каталог
+
+        :return: Индекс категорий, товары `{product_id: словарь API}` и категории каждого товара
+        """
+        products = self.digiseller.products
+        index = CategoryIndex.from_raw(products._request_categories(self.seller_id, lang=self.lang))
+
+        products_raw: Dict[int, dict] = {}
+        product_categories: Dict[int, Set[int]] = {}
+
+        def fetch_page(category_id: int, page: int) -> Tuple[List[dict], Optional[int]]:
+            fetch = partial(products._fetch_products_rows,
+                            seller_id=self.seller_id,
+                            category_id=category_id,
+                            rows=self.rows,
+                            currency=self.currency,
+                            lang=self.lang)
+            return fetch_page_with_retry(fetch, page, self.retries, self.retry_delay)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = {
+                executor.submit(fetch_page, category_id, 1): (category_id, 1)
+                for category_id in index if index.products_count[category_id] > 0
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    category_id, page = pending.pop(future)
+                    items, pages_count = future.result()
+                    for product_raw in items:
+                        product_id = int(product_raw['id'])
+                        products_raw[product_id] = product_raw
+                        product_categories.setdefault(product_id, set()).add(category_id)
+
+                    if page == 1 and pages_count is not None:
+                        next_pages = range(2, pages_count + 1)
+                    elif pages_count is None and has_next_page(page, items, None, self.rows):
+                        next_pages = (page + 1,)
+                    else:
+                        next_pages = ()
+                    for next_page in next_pages:
+                        pending[executor.submit(fetch_page, category_id, next_page)] = (category_id, next_page)
+
+        return index, products_raw, product_categories
+
+    def crawl(self, previous: Optional[CatalogSnapshot] = None) -> CrawlResult:
+        """
+        Загружает каталог и сравнивает его с предыдущим снимком
+
+        :param previous: Предыдущий снимок; без него все товары считаются добавленными
+        """
+        index, products_raw, product_categories = self.fetch()
+        snapshot = CatalogSnapshot({
+            product_id: product_hash(product_raw, product_categories[product_id], self.ignore_fields)
+            for product_id, product_raw in products_raw.items()
+        })
+        diff = snapshot.diff(previous)
+        changed_products = {
+            product_id: Product.from_dict(products_raw[product_id])
+            for product_id in diff.added + diff.changed
+        }
+        return CrawlResult(snapshot, diff, changed_products, index)
+
+    def sync(self, snapshot_path: str) -> CrawlResult:
+        """
+        Обход с сохранением снимка: сравнивает каталог со снимком из файла и перезаписывает его
+        """
+        previous = CatalogSnapshot.load(snapshot_path) if os.path.exists(snapshot_path) else None
+        result = self.crawl(previous)
+        result.snapshot.save(snapshot_path)
+        return result
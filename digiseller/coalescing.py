@@ -0,0 +1,64 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters: int = 0
+
+
+class SingleFlight:
+    """
+    Объединение одновременных одинаковых вызовов: пока вызов с ключом выполняется,
+    остальные потоки с тем же ключом ждут и получают его результат (или его исключение)
+    вместо повторного запроса к API
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """
+        Количество выполняющихся сейчас вызовов
+        """
+        return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        :param key: Ключ вызова (например `cache.make_key(endpoint, params)`)
+        :param fn: Функция, выполняемая только первым потоком с этим ключом
+        :return: (результат, получен ли он от вызова другого потока)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Ключ удаляется до пробуждения ожидающих: новые вызовы после завершения идут в API заново
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
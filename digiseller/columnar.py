@@ -0,0 +1,153 @@
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Tuple
+
+from .utils import parse_date
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SECONDS_PER_DAY = 86400
+_DAY_BITS = 20  # Дни с 1970 года помещаются в 20 бит до 4840 года
+
+
+def _timestamp(value) -> float:
+    """
+    Дата продажи как unix time; время из API считается "настенным" и не сдвигается по часовому поясу
+    """
+    date = parse_date(value)
+    if date is None:
+        return float('nan')
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.timestamp()
+
+
+def _is_returned(row: dict) -> bool:
+    return bool(row.get('date_return') or row.get('returned'))
+
+
+class SalesColumns:
+    """
+    Продажи в колоночном виде: каждое поле хранится в типизированном массиве (`array`),
+    что позволяет агрегировать миллионы продаж без создания объектов на каждую строку.
+    Если установлен numpy, агрегации выполняются векторно
+    """
+
+    def __init__(self) -> None:
+        self.invoice_id: array = array('q')
+        self.product_id: array = array('q')
+        self.amount_in: array = array('d')
+        self.amount_out: array = array('d')
+        self.paid_at: array = array('d')  # unix time
+        self.returned: array = array('b')
+
+    def __len__(self) -> int:
+        return len(self.invoice_id)
+
+    def extend(self, rows: Iterable[dict]) -> None:
+        """
+        Добавляет строки ответа `seller-sells/v2` / `agent-sales/v2`
+        """
+        for row in rows:
+            self.invoice_id.append(row['invoice_id'])
+            self.product_id.append(row.get('product_id') or 0)
+            self.amount_in.append(float(row.get('amount_in') or 0))
+            self.amount_out.append(float(row.get('amount_out') or 0))
+            self.paid_at.append(_timestamp(row.get('date_pay')))
+            self.returned.append(_is_returned(row))
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict]) -> 'SalesColumns':
+        columns = cls()
+        columns.extend(rows)
+        return columns
+
+    def to_numpy(self, copy: bool = False) -> Dict[str, 'np.ndarray']:
+        """
+        Колонки в виде массивов numpy. По умолчанию - представления данных `array` без копирования:
+        пока такие массивы существуют, буферы `array` заблокированы и `extend()` вызывает `BufferError`.
+        Если колонки будут пополняться, используйте `copy=True` или удалите массивы перед `extend()`
+
+        :param copy: Скопировать данные вместо создания представлений
+        """
+        if np is None:
+            raise ImportError('Для to_numpy() нужен numpy: pip install numpy')
+        columns = {
+            'invoice_id': np.frombuffer(self.invoice_id, dtype=np.int64),
+            'product_id': np.frombuffer(self.product_id, dtype=np.int64),
+            'amount_in': np.frombuffer(self.amount_in, dtype=np.float64),
+            'amount_out': np.frombuffer(self.amount_out, dtype=np.float64),
+            'paid_at': np.frombuffer(self.paid_at, dtype=np.float64),
+            'returned': np.frombuffer(self.returned, dtype=np.bool_),  # В `returned` только 0 и 1
+        }
+        if copy:
+            columns = {name: column.copy() for name, column in columns.items()}
+        return columns
+
+    def revenue_by_product_day(self, amount: str = 'amount_in', include_returned: bool = False) -> Dict[Tuple[int, datetime], float]:
+        """
+        Выручка по товарам и дням
+
+        :param amount: Колонка суммы: `amount_in` (оплачено покупателем) или `amount_out` (получено продавцом)
+        :param include_returned: Учитывать возвращенные продажи
+        :return: {(product_id, дата дня): сумма}
+        """
+        if np is not None:
+            cols = self.to_numpy()
+            mask = ~np.isnan(cols['paid_at'])
+            if not include_returned:
+                mask &= ~cols['returned']
+            days = (cols['paid_at'][mask] // SECONDS_PER_DAY).astype(np.int64)
+            keys = (cols['product_id'][mask] << _DAY_BITS) | days
+            unique_keys, inverse = np.unique(keys, return_inverse=True)
+            totals = np.bincount(inverse, weights=cols[amount][mask])
+            result = {
+                (int(key) >> _DAY_BITS, int(key) & ((1 << _DAY_BITS) - 1)): float(total)
+                for key, total in zip(unique_keys, totals)
+            }
+        else:
+            result = {}
+            amounts = getattr(self, amount)
+            for product_id, paid_at, value, returned in zip(self.product_id, self.paid_at, amounts, self.returned):
+                if paid_at != paid_at or (returned and not include_returned):  # NaN - дата не распознана
+                    continue
+                key = (product_id, int(paid_at // SECONDS_PER_DAY))
+                result[key] = result.get(key, 0.0) + value
+
+        return {
+            (product_id, datetime.fromtimestamp(day * SECONDS_PER_DAY, timezone.utc).replace(tzinfo=None)): total
+            for (product_id, day), total in result.items()
+        }
+
+    def refund_ratio_by_product(self) -> Dict[int, float]:
+        """
+        Доля возвратов по товарам
+
+        :return: {product_id: количество возвратов / количество продаж}
+        """
+        if np is not None:
+            cols = self.to_numpy()
+            unique_ids, inverse = np.unique(cols['product_id'], return_inverse=True)
+            sales = np.bincount(inverse)
+            refunds = np.bincount(inverse, weights=cols['returned'])
+            return {int(product_id): float(r / s) for product_id, r, s in zip(unique_ids, refunds, sales)}
+
+        sales, refunds = {}, {}
+        for product_id, returned in zip(self.product_id, self.returned):
+            sales[product_id] = sales.get(product_id, 0) + 1
+            refunds[product_id] = refunds.get(product_id, 0) + returned
+        return {product_id: refunds[product_id] / count for product_id, count in sales.items()}
+
+    def total(self, amount: str = 'amount_in', include_returned: bool = False) -> float:
+        """
+        Сумма по колонке `amount`
+        """
+        if np is not None:
+            cols = self.to_numpy()
+            values = cols[amount] if include_returned else cols[amount][~cols['returned']]
+            return float(values.sum())
+        amounts = getattr(self, amount)
+        return sum(value for value, returned in zip(amounts, self.returned) if include_returned or not returned)
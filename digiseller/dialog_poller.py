@@ -0,0 +1,142 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from .api.dialogs import Dialog
+from .results import ResultMode
+
+logger = logging.getLogger(__name__)
+
+CursorState = Tuple[str, int]  # (last_date, cnt_new)
+
+
+class DialogPoller:
+    """
+    Периодический опрос диалогов, возвращающий только изменившиеся.
+    Запрашиваются лишь диалоги с новыми сообщениями (`filter_new=1`), а изменения определяются
+    по курсору из `last_date` и `cnt_new` каждого диалога, поэтому стоимость опроса
+    зависит от количества новых сообщений, а не от общего количества диалогов
+    """
+
+    def __init__(self,
+                 digiseller,
+                 callback: Optional[Callable[[Dialog], None]] = None,
+                 interval: float = 5.0,
+                 page_size: int = 200,
+                 cursor_path: Optional[str] = None,
+                 max_backoff: float = 60.0) -> None:
+        """
+        :param digiseller: Экземпляр класса `Digiseller`
+        :param callback: Функция, вызываемая для каждого изменившегося диалога
+        :param interval: Интервал опроса в секундах
+        :param page_size: Количество диалогов на одной странице (до 200)
+        :param cursor_path: Файл для сохранения курсора между перезапусками
+        :param max_backoff: Максимальная пауза в секундах после неудачных опросов подряд
+        """
+        self.digiseller = digiseller
+        self.callback: Optional[Callable[[Dialog], None]] = callback
+        self.interval: float = interval
+        self.page_size: int = page_size
+        self.cursor_path: Optional[str] = cursor_path
+        self.max_backoff: float = max_backoff
+
+        self.cursor: Dict[int, CursorState] = self._load_cursor()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _load_cursor(self) -> Dict[int, CursorState]:
+        if not self.cursor_path or not os.path.exists(self.cursor_path):
+            return {}
+        with open(self.cursor_path, 'r', encoding='utf-8') as f:
+            return {int(order_id): tuple(state) for order_id, state in json.load(f).items()}
+
+    def _save_cursor(self) -> None:
+        if not self.cursor_path:
+            return
+        tmp_path = f'{self.cursor_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.cursor, f)
+        os.replace(tmp_path, self.cursor_path)
+
+    def poll(self) -> List[Dialog]:
+        """
+        Один опрос: возвращает диалоги, в которых появились новые сообщения с прошлого опроса,
+        и передает их в `callback`
+        """
+        cursor = {}
+        changed = []
+        for dialog in self.digiseller.dialogs.iter_all(page_size=self.page_size, filter_new=1,
+                                                       result_mode=ResultMode.MODEL):
+            state = (dialog.last_date.isoformat(), dialog.new_messages_count)
+            cursor[dialog.order_id] = state
+            if self.cursor.get(dialog.order_id) != state:
+                changed.append(dialog)
+
+        # Прочитанные диалоги пропадают из выдачи и из курсора
+        self.cursor = cursor
+        self._save_cursor()
+
+        if self.callback is not None:
+            for dialog in changed:
+                self.callback(dialog)
+
+        return changed
+
+    def _next_delay(self, failures: int) -> float:
+        """
+        Пауза перед следующим опросом: `interval`, а после неудачных опросов подряд - вдвое больше за каждый,
+        но не больше `max_backoff`
+        """
+        if not failures:
+            return self.interval
+        return min(self.interval * 2 ** failures, max(self.max_backoff, self.interval))
+
+    def run(self) -> None:
+        """
+        Опрашивает диалоги каждые `interval` секунд до вызова `stop()`
+        """
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                self.poll()
+                failures = 0
+            except Exception:
+                failures += 1
+                logger.exception('Ошибка при опросе диалогов')
+            self._stop.wait(self._next_delay(failures))
+
+    def start(self) -> threading.Thread:
+        """
+        Запускает опрос в фоновом потоке
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name='digiseller-dialog-poller', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    async def __aiter__(self) -> AsyncIterator[Dialog]:
+        """
+        Асинхронный итератор изменившихся диалогов: `async for dialog in poller`.
+        Ошибка опроса не завершает итерацию: она записывается в лог, а опрос повторяется после паузы
+        """
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                changed = await asyncio.to_thread(self.poll)
+                failures = 0
+            except Exception:
+                failures += 1
+                logger.exception('Ошибка при опросе диалогов')
+                changed = []
+            for dialog in changed:
+                yield dialog
+            await asyncio.sleep(self._next_delay(failures))
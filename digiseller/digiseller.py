@@ -1,11 +1,22 @@
 import logging
+import threading
 import time
 
 import requests
 from .validators import validate_param
+from .token_manager import TokenManager
+from .token_store import TokenStore
+from .rate_limit import RateLimiter, RetryPolicy
+from .cache import ResponseCache, CacheKey, make_key
+from .metrics import Instrumentation, RequestSpan
+from .transport import TransportConfig, build_session
+from .coalescing import SingleFlight
+from .scheduling import FairScheduler
+from .results import ResultMode
 
 from . import api
 
+logger = logging.getLogger(__name__)
 
 class Digiseller:
     """
@@ -14,72 +25,241 @@ class Digiseller:
 
     BASE_URL = 'https://api.digiseller.ru/api/'
 
-    def __init__(self, seller_id: str | int, api_key: str) -> None:
+    def __init__(self,
+                 seller_id: str | int,
+                 api_key: str,
+                 background_token_refresh: bool = True,
+                 token_store: TokenStore | None = None,
+                 rate_limiter: RateLimiter | None = None,
+                 retry_policy: RetryPolicy | None = None,
+                 cache: ResponseCache | None = None,
+                 base_url: str | None = None,
+                 instrumentation: Instrumentation | None = None,
+                 transport: TransportConfig | None = None,
+                 session: requests.Session | None = None,
+                 coalesce_requests: bool = False,
+                 scheduler: FairScheduler | None = None,
+                 result_mode: ResultMode | str = ResultMode.MODEL) -> None:
         """
         Инициализация основного класса для взаимодействия с API Digiseller
 
         :param seller_id: Идентификатор продавца (https://my.digiseller.com/inside/my_info.asp)
         :param api_key: API ключ для аутентификации (https://my.digiseller.com/inside/api_keys.asp)
+        :param background_token_refresh: Обновлять токен в фоне до истечения его времени жизни
+        :param token_store: Хранилище токенов, общее для процессов (например `FileTokenStore`)
+        :param rate_limiter: Ограничение скорости запросов на стороне клиента
+        :param retry_policy: Политика повтора запросов при 429/5xx и сетевых ошибках
+        :param cache: Кэш ответов для редко меняющихся GET эндпоинтов (категории, товары, баланс)
+        :param base_url: Адрес API вместо `BASE_URL` (например, локальный `FakeDigisellerServer`)
+        :param instrumentation: Сбор метрик и хуки трассировки запросов
+        :param transport: Размер пула соединений, таймауты, keep-alive, сжатие и HTTP/2
+        :param session: Готовая сессия (например, общая для нескольких клиентов); не закрывается в `close()`
+        :param coalesce_requests: Объединять одновременные одинаковые GET запросы в один запрос к API;
+            все ожидающие потоки получают один и тот же объект `Response`, который нельзя изменять
+        :param scheduler: Общее для нескольких аккаунтов ограничение одновременных запросов (см. `DigisellerPool`)
+        :param result_mode: Вид записей методов выгрузки по умолчанию (объекты, компактные записи или словари API)
         """
         validate_param(seller_id, (str, int), 'seller_id')
         validate_param(api_key, str, 'api_key')
 
-        self.session: requests.Session = requests.Session()
-        self.session.headers = {'Content-Type': 'application/json; charset=UTF-8', 'Accept': 'application/json'}
+        self.transport: TransportConfig = transport or TransportConfig()
+        self._owns_session: bool = session is None
+        if session is None:
+            session = build_session(self.transport)
+        else:
+            session.headers.update(self.transport.headers)
+        self.session: requests.Session = session
+
+        if base_url is not None:
+            self.BASE_URL = base_url
 
         self.seller_id: int = int(seller_id)
         self.api_key: str = api_key
 
-        self.token: str | None = None
-        self.token_expiration: int = 0
+        self.rate_limiter: RateLimiter | None = rate_limiter
+        self.retry_policy: RetryPolicy | None = retry_policy
+        self.cache: ResponseCache | None = cache
+        self.instrumentation: Instrumentation | None = instrumentation
+        self.single_flight: SingleFlight | None = SingleFlight() if coalesce_requests else None
+        self.scheduler: FairScheduler | None = scheduler
+        self.result_mode: ResultMode = ResultMode(result_mode)
+
+        self.token_manager: TokenManager = TokenManager(self,
+                                                        background_refresh=background_token_refresh,
+                                                        token_store=token_store)
 
         self.operations: api.Operations = api.Operations(self)
         self.statistics: api.Statistics = api.Statistics(self)
         self.products: api.Products = api.Products(self)
         self.dialogs: api.Dialogs = api.Dialogs(self)
 
-    def __get_and_set_token(self) -> str:
+    @property
+    def token(self) -> str | None:
+        return self.token_manager.token
+
+    @property
+    def token_expiration(self) -> int:
+        return self.token_manager.token_expiration
+
+    def close(self) -> None:
         """
-        Получает и устанавливает токен и время жизни токена
+        Останавливает фоновое обновление токена и закрывает сессию, если она создана клиентом
         """
-        token, token_expiration = api.general.get_and_set_token(self)
-        self.token = token
-        self.token_expiration = token_expiration
+        self.token_manager.close()
+        if self._owns_session:
+            self.session.close()
 
-        return token
+    def make_request(self, method: str, endpoint: str, use_json: bool = True, raise_for_status: bool = True, stream: bool = False, **options) -> requests.Response:
+        options = {k: v for k, v in options.items() if v is not None}  # Убираем все параметры None
+
+        cache_key = None
+        if self.cache is not None and not stream and method.upper() == 'GET' and self.cache.is_cacheable(endpoint):
+            cache_key = make_key(endpoint, options)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                resp, stale = cached
+                if self.instrumentation is not None:
+                    self.instrumentation.record_cache_hit(endpoint)
+                if stale and self.cache.begin_revalidate(cache_key):
+                    threading.Thread(target=self.__revalidate,
+                                     args=(cache_key, method, endpoint, use_json, options),
+                                     daemon=True).start()
+                return resp
+
+        if self.single_flight is not None and not stream and method.upper() == 'GET':
+            # Одновременные одинаковые GET запросы получают один общий ответ
+            resp, shared = self.single_flight.do(cache_key or make_key(endpoint, options),
+                                                 lambda: self.__request_and_cache(cache_key, method, endpoint, use_json, options))
+            if shared and self.instrumentation is not None:
+                self.instrumentation.record_coalesced(endpoint)
+        else:
+            resp = self.__request_and_cache(cache_key, method, endpoint, use_json, options, stream)
+
+        if raise_for_status:
+            try:
+                resp.raise_for_status()
+            except requests.HTTPError:
+                if stream:
+                    resp.close()  # Тело потокового ответа не прочитано - соединение нужно вернуть в пул
+                raise
 
-    def __refresh_token_if_needed(self) -> None:
+        return resp
+
+    def __request_and_cache(self, cache_key: CacheKey | None, method: str, endpoint: str, use_json: bool, options: dict,
+                            stream: bool = False) -> requests.Response:
+        resp = self._request(method, endpoint, use_json, options, stream)
+        if cache_key is not None and resp.status_code == 200:
+            self.cache.set(cache_key, resp)
+        return resp
+
+    def __revalidate(self, cache_key: CacheKey, method: str, endpoint: str, use_json: bool, options: dict) -> None:
         """
-        Обновляет токен если его время действия истекло или токен ещё не был установлен
+        Фоновое обновление устаревшего ответа в кэше
         """
-        current_time = int(time.time())
-        if self.token is None or current_time >= self.token_expiration - 30:  # На всякий -30 сек от времени жизни токена
-            self.__get_and_set_token()
+        try:
+            resp = self._request(method, endpoint, use_json, options)
+            if resp.status_code == 200:
+                self.cache.set(cache_key, resp)
+        except Exception:
+            logger.warning('Не удалось обновить кэш %s', endpoint, exc_info=True)
+        finally:
+            self.cache.end_revalidate(cache_key)
 
-    def make_request(self, method: str, endpoint: str, use_json: bool = True, raise_for_status: bool = True, **options) -> requests.Response:
-        self.__refresh_token_if_needed()
+    def _request(self, method: str, endpoint: str, use_json: bool, options: dict, stream: bool = False) -> requests.Response:
+        """
+        Добавляет токен к параметрам и отправляет запрос
+        """
+        token = self.token_manager.get_token()
 
         url = self.BASE_URL + endpoint
 
         params = {}
         json_data = {}
 
-        options = {k: v for k, v in options.items() if v is not None}  # Убираем все параметры None
         if method.upper() in ['GET'] or not use_json:
-            options['token'] = self.token
-            params = options
+            params = dict(options, token=token)
         elif method.upper() in ['POST']:
-            params = {'token': self.token}
+            params = {'token': token}
             json_data = dict(options)
 
-        resp = self.session.request(
+        return self._send(method, endpoint, url, params, json_data, stream)
+
+    def _send(self, method: str, endpoint: str, url: str, params: dict, json_data: dict, stream: bool = False) -> requests.Response:
+        """
+        Отправляет запрос с учетом ограничения скорости и политики повторов
+        """
+        span = None
+        if self.instrumentation is not None:
+            span = self.instrumentation.start_request(method, endpoint)
+
+        try:
+            resp = self.__send_with_retries(method, endpoint, url, params, json_data, stream, span)
+        except Exception as e:
+            if span is not None:
+                span.error = e
+                self.instrumentation.end_request(span)
+            raise
+
+        if span is not None:
+            span.status_code = resp.status_code
+            span.bytes_sent = len(resp.request.body or b'')
+            if stream:
+                span.bytes_received = int(resp.headers.get('Content-Length') or 0)
+            else:
+                span.bytes_received = len(resp.content)
+            self.instrumentation.end_request(span)
+
+        return resp
+
+    def __send_with_retries(self, method: str, endpoint: str, url: str, params: dict, json_data: dict,
+                            stream: bool, span: RequestSpan | None) -> requests.Response:
+        attempt = 0
+        while True:
+            if span is not None:
+                span.attempts = attempt + 1
+
+            # Ожидание лимита скорости - до получения места в общем планировщике, чтобы
+            # аккаунт, ожидающий лимита (или Retry-After), не занимал место других аккаунтов
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint)
+
+            try:
+                if self.scheduler is None:
+                    resp = self.__send_once(method, endpoint, url, params, json_data, stream)
+                else:
+                    with self.scheduler.slot(self.seller_id):
+                        resp = self.__send_once(method, endpoint, url, params, json_data, stream)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if self.retry_policy is None or not self.retry_policy.can_retry(method, attempt):
+                    raise
+                self.__on_retry(endpoint, type(e).__name__, attempt)
+                time.sleep(self.retry_policy.get_delay(attempt))
+                attempt += 1
+                continue
+
+            retry_after = resp.headers.get('Retry-After')
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_response(endpoint, resp.status_code, retry_after)
+
+            if self.retry_policy is None or not self.retry_policy.should_retry(method, resp.status_code, attempt):
+                return resp
+
+            resp.close()
+            self.__on_retry(endpoint, str(resp.status_code), attempt)
+            time.sleep(self.retry_policy.get_delay(attempt, retry_after))
+            attempt += 1
+
+    def __send_once(self, method: str, endpoint: str, url: str, params: dict, json_data: dict, stream: bool) -> requests.Response:
+        return self.session.request(
             method=method,
             url=url,
             params=params,
             json=json_data,
+            stream=stream,
+            timeout=self.transport.timeout,
         )
 
-        if raise_for_status:
-            resp.raise_for_status()
-
-        return resp
+    def __on_retry(self, endpoint: str, reason: str, attempt: int) -> None:
+        logger.info('Повтор запроса %s (%s), попытка %d', endpoint, reason, attempt + 2)
+        if self.instrumentation is not None:
+            self.instrumentation.record_retry(endpoint, reason)
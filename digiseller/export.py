@@ -0,0 +1,401 @@
+import csv
+import glob
+import gzip
+import io
+import json
+import os
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .api.operations import AllowType, CodeFilter, Currency, OperationType
+from .pagination import iter_pages
+
+Field = Tuple[str, str]  # (имя, тип: int/float/str)
+
+SALES_FIELDS: Tuple[Field, ...] = (
+    ('invoice_id', 'int'),
+    ('product_id', 'int'),
+    ('product_name', 'str'),
+    ('product_entry', 'str'),
+    ('date_pay', 'str'),
+    ('email', 'str'),
+    ('amount_in', 'float'),
+    ('amount_out', 'float'),
+    ('amount_currency', 'str'),
+    ('method_pay', 'str'),
+    ('ip', 'str'),
+    ('partner_id', 'int'),
+    ('lang', 'str'),
+    ('date_return', 'str'),
+)
+
+OPERATIONS_FIELDS: Tuple[Field, ...] = (
+    ('id', 'int'),
+    ('date', 'str'),
+    ('amount', 'float'),
+    ('currency', 'str'),
+    ('type', 'str'),
+    ('invoice_id', 'int'),
+    ('description', 'str'),
+)
+
+FORMATS = ('csv', 'jsonl', 'parquet')
+
+_CASTS: Dict[str, Callable] = {'int': int, 'float': float, 'str': str}
+
+
+def _cast(value, type_name: str):
+    if value is None or value == '':
+        return None
+    try:
+        return _CASTS[type_name](value)
+    except (TypeError, ValueError):
+        return None
+
+
+class _FileWriter:
+    """
+    Запись страниц в один файл. При сжатии gzip каждая страница - отдельный gzip блок,
+    поэтому файл можно обрезать по границе страницы и дописать
+    """
+
+    def __init__(self, path: str, fields: Sequence[Field], compression: Optional[str]) -> None:
+        if compression not in (None, 'gzip'):
+            raise ValueError(f'Сжатие {compression} не поддерживается для CSV/JSONL, используйте gzip')
+        self.path: str = path
+        self.fields: Sequence[Field] = fields
+        self.compression: Optional[str] = compression
+        self.file = None
+
+    def open(self, offset: Optional[int]) -> None:
+        """
+        :param offset: Позиция, с которой продолжить запись (None - начать файл заново)
+        """
+        if offset is None:
+            self.file = open(self.path, 'wb')
+            self._write(self.header())
+        else:
+            self.file = open(self.path, 'r+b')
+            self.file.truncate(offset)
+            self.file.seek(offset)
+
+    def header(self) -> str:
+        return ''
+
+    def format_rows(self, rows: List[dict]) -> str:
+        raise NotImplementedError
+
+    def _write(self, text: str) -> None:
+        if not text:
+            return
+        data = text.encode('utf-8')
+        if self.compression == 'gzip':
+            data = gzip.compress(data)
+        self.file.write(data)
+
+    def write(self, rows: List[dict]) -> None:
+        self._write(self.format_rows(rows))
+        self.file.flush()
+
+    def position(self) -> int:
+        return self.file.tell()
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class _CsvWriter(_FileWriter):
+    def header(self) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(name for name, _ in self.fields)
+        return buffer.getvalue()
+
+    def format_rows(self, rows: List[dict]) -> str:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(_cast(row.get(name), type_name) for name, type_name in self.fields)
+        return buffer.getvalue()
+
+
+class _JsonlWriter(_FileWriter):
+    def format_rows(self, rows: List[dict]) -> str:
+        return ''.join(
+            json.dumps({name: _cast(row.get(name), type_name) for name, type_name in self.fields},
+                       ensure_ascii=False) + '\n'
+            for row in rows
+        )
+
+
+class _ParquetWriter:
+    """
+    Запись в каталог part-файлов Parquet: каждая страница - row group, каждые `pages_per_part`
+    страниц - новый файл. Позиция для продолжения - количество завершенных файлов
+    """
+
+    def __init__(self, path: str, fields: Sequence[Field], compression: Optional[str], pages_per_part: int) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError('Для Parquet нужен pyarrow: pip install digiseller[parquet]') from None
+
+        self._pa = pa
+        self._pq = pq
+        types = {'int': pa.int64(), 'float': pa.float64(), 'str': pa.string()}
+        self.schema = pa.schema([(name, types[type_name]) for name, type_name in fields])
+        self.path: str = path
+        self.fields: Sequence[Field] = fields
+        self.compression: str = compression or 'snappy'
+        self.pages_per_part: int = pages_per_part
+
+        self.parts: int = 0
+        self._writer = None
+        self._pages_in_part: int = 0
+
+    def _part_path(self, index: int) -> str:
+        return os.path.join(self.path, f'part-{index:05d}.parquet')
+
+    def open(self, offset: Optional[int]) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        self.parts = offset or 0
+        # Незавершенные и оставшиеся от прошлой выгрузки файлы удаляются
+        for part_path in glob.glob(os.path.join(self.path, 'part-*.parquet')):
+            if int(os.path.basename(part_path)[5:10]) >= self.parts:
+                os.remove(part_path)
+
+    def write(self, rows: List[dict]) -> None:
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._part_path(self.parts), self.schema, compression=self.compression)
+        columns = [[_cast(row.get(name), type_name) for row in rows] for name, type_name in self.fields]
+        self._writer.write_table(self._pa.Table.from_arrays(columns, schema=self.schema))
+        self._pages_in_part += 1
+        if self._pages_in_part >= self.pages_per_part:
+            self._finish_part()
+
+    def _finish_part(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self.parts += 1
+        self._pages_in_part = 0
+
+    def position(self) -> int:
+        """
+        Продолжить можно только с границы part-файла
+        """
+        return self.parts
+
+    def close(self) -> None:
+        self._finish_part()
+
+
+class Exporter:
+    """
+    Выгрузка продаж и операций в CSV, JSON Lines или Parquet с постоянным расходом памяти:
+    записи пишутся постранично по фиксированной схеме, а после каждой страницы сохраняется
+    контрольная точка (страница и позиция в файле), с которой прерванная выгрузка продолжается
+    """
+
+    def __init__(self,
+                 digiseller,
+                 path: str,
+                 format: str = 'csv',
+                 fields: Optional[Sequence[Field]] = None,
+                 compression: Optional[str] = None,
+                 checkpoint_path: Optional[str] = None,
+                 pages_per_part: int = 50,
+                 prefetch: bool = True) -> None:
+        """
+        :param digiseller: Экземпляр класса `Digiseller`
+        :param path: Файл выгрузки (для Parquet - каталог part-файлов)
+        :param format: csv, jsonl или parquet
+        :param fields: Схема `[(поле, 'int'/'float'/'str'), ...]`, по умолчанию `SALES_FIELDS`/`OPERATIONS_FIELDS`
+        :param compression: gzip для CSV/JSONL; кодек Parquet (snappy, zstd, gzip...)
+        :param checkpoint_path: Файл контрольной точки, по умолчанию `path + '.checkpoint'`
+        :param pages_per_part: Страниц в одном part-файле Parquet
+        :param prefetch: Загружать следующую страницу, пока записывается текущая
+        """
+        if format not in FORMATS:
+            raise ValueError(f'Неизвестный формат {format}, доступны: {", ".join(FORMATS)}')
+
+        self.digiseller = digiseller
+        self.path: str = path
+        self.format: str = format
+        self.fields: Optional[Sequence[Field]] = fields
+        self.compression: Optional[str] = compression
+        self.checkpoint_path: str = checkpoint_path or path.rstrip('/\\') + '.checkpoint'
+        self.pages_per_part: int = pages_per_part
+        self.prefetch: bool = prefetch
+
+    def _make_writer(self, fields: Sequence[Field]):
+        if self.format == 'parquet':
+            return _ParquetWriter(self.path, fields, self.compression, self.pages_per_part)
+        writer_class = _CsvWriter if self.format == 'csv' else _JsonlWriter
+        return writer_class(self.path, fields, self.compression)
+
+    def _load_checkpoint(self, params: dict) -> Optional[dict]:
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        if checkpoint['params'] != params:
+            raise ValueError(f'Контрольная точка {self.checkpoint_path} создана для другой выгрузки, удалите её')
+        return checkpoint
+
+    def _save_checkpoint(self, checkpoint: dict) -> None:
+        tmp_path = f'{self.checkpoint_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _export(self, fetch_page, params: dict, fields: Sequence[Field], page_size: int) -> int:
+        """
+        :param fetch_page: Функция запроса страницы `(page) -> (список словарей, количество страниц)`
+        :param params: Параметры выгрузки для проверки контрольной точки (`date_finish` уже определен)
+        :return: Общее количество записанных записей, включая записанные до перезапуска
+        """
+        params = dict(params, format=self.format, fields=[list(field) for field in fields], compression=self.compression)
+        checkpoint = self._load_checkpoint(params)
+        writer = self._make_writer(fields)
+        if checkpoint is None:
+            writer.open(None)
+            checkpoint = {'params': params, 'page': 1, 'offset': writer.position(), 'rows': 0}
+        else:
+            writer.open(checkpoint['offset'])
+
+        page, rows_total = checkpoint['page'], checkpoint['rows']
+        try:
+            for rows in iter_pages(fetch_page, start_page=page, page_size=page_size, prefetch=self.prefetch):
+                writer.write(rows)
+                page += 1
+                rows_total += len(rows)
+                # Parquet можно продолжить только с границы part-файла, поэтому позиция меняется не на каждой странице
+                if writer.position() != checkpoint['offset']:
+                    checkpoint.update(page=page, offset=writer.position(), rows=rows_total)
+                    self._save_checkpoint(checkpoint)
+        finally:
+            writer.close()
+
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        return rows_total
+
+    def export_sales(self,
+                     product_ids: Optional[List[int]] = None,
+                     date_start: datetime = datetime(2000, 1, 1, 0, 0, 0),
+                     date_finish: Optional[datetime] = None,
+                     returned: int = 0,
+                     rows: int = 100) -> int:
+        """
+        Выгрузка статистики по продажам (`Statistics.get_sales`)
+
+        :param product_ids: Список ID товаров. Если не указано - по всем товарам.
+        :param date_start: Дата начала. По умолчанию - 2000 год (чтобы получить все продажи)
+        :param date_finish: Дата конца. По умолчанию - время первого запуска выгрузки
+        :param returned: 0 - включить возвраты; 1 - без возвратов; 2 - только возвраты
+        :param rows: Количество продаж на одной странице. До 100 продаж.
+
+        :return: Количество выгруженных продаж
+        """
+        return self._export_sales('seller-sells/v2', None, product_ids, date_start, date_finish, returned, rows)
+
+    def export_sales_as_agent(self,
+                              partner_id: Optional[int] = None,
+                              product_ids: Optional[List[int]] = None,
+                              date_start: datetime = datetime(2000, 1, 1, 0, 0, 0),
+                              date_finish: Optional[datetime] = None,
+                              returned: int = 0,
+                              rows: int = 1000) -> int:
+        """
+        Выгрузка статистики по продажам в качестве агента (`Statistics.get_sales_as_agent`)
+
+        :param partner_id: ID партнера
+        :param rows: Количество продаж на одной странице. До 1000 продаж.
+
+        :return: Количество выгруженных продаж
+        """
+        return self._export_sales('agent-sales/v2', partner_id, product_ids, date_start, date_finish, returned, rows)
+
+    def _export_sales(self, endpoint: str, partner_id: Optional[int], product_ids: Optional[List[int]],
+                      date_start: datetime, date_finish: Optional[datetime], returned: int, rows: int) -> int:
+        params = {
+            'endpoint': endpoint,
+            'partner_id': partner_id,
+            'product_ids': product_ids,
+            'date_start': date_start.isoformat(),
+            'returned': returned,
+            'rows': rows,
+        }
+        date_finish = self._resolve_date_finish(params, date_finish)
+        fetch_page = partial(
+            self.digiseller.statistics._fetch_sales_rows, endpoint,
+            partner_id=partner_id,
+            product_ids=product_ids,
+            date_start=date_start,
+            date_finish=date_finish,
+            returned=returned,
+            rows=rows
+        )
+        return self._export(fetch_page, dict(params, date_finish=date_finish.isoformat()),
+                            self.fields or SALES_FIELDS, rows)
+
+    def export_operations(self,
+                          count: int = 200,
+                          currency: Optional[Currency | str] = None,
+                          operation_type: Optional[OperationType | str] = None,
+                          code_filter: Optional[CodeFilter | str] = None,
+                          allow_type: Optional[AllowType | str] = None,
+                          date_start: datetime = datetime(2000, 1, 1, 0, 0, 0),
+                          date_finish: Optional[datetime] = None) -> int:
+        """
+        Выгрузка операций по аккаунту (`Operations.get_all`)
+
+        :param count: Количество операций на одной странице (до 200)
+        :param currency: Валюта (Currency/str)
+        :param operation_type: Тип операции (OperationType/str)
+        :param code_filter: Операции, ожидающие проверки уникального кода (CodeFilter/str)
+        :param allow_type: Операции недоступные для вывода (AllowType/str)
+        :param date_start: Дата начала. По умолчанию - 2000 год
+        :param date_finish: Дата конца. По умолчанию - время первого запуска выгрузки
+
+        :return: Количество выгруженных операций
+        """
+        params = {
+            'endpoint': 'sellers/account/receipts',
+            'count': count,
+            'currency': getattr(currency, 'value', currency),
+            'operation_type': getattr(operation_type, 'value', operation_type),
+            'code_filter': getattr(code_filter, 'value', code_filter),
+            'allow_type': getattr(allow_type, 'value', allow_type),
+            'date_start': date_start.isoformat(),
+        }
+        date_finish = self._resolve_date_finish(params, date_finish)
+        fetch_page = partial(
+            self.digiseller.operations._fetch_rows,
+            count=count,
+            currency=currency,
+            operation_type=operation_type,
+            code_filter=code_filter,
+            allow_type=allow_type,
+            date_start=date_start,
+            date_finish=date_finish
+        )
+        return self._export(fetch_page, dict(params, date_finish=date_finish.isoformat()),
+                            self.fields or OPERATIONS_FIELDS, count)
+
+    def _resolve_date_finish(self, params: dict, date_finish: Optional[datetime]) -> datetime:
+        """
+        Конец периода фиксируется при первом запуске, чтобы продолженная выгрузка не сдвигала страницы
+        """
+        if date_finish is not None:
+            return date_finish
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                checkpoint_params = json.load(f)['params']
+            if all(checkpoint_params.get(k) == v for k, v in params.items()):
+                return datetime.fromisoformat(checkpoint_params['date_finish'])
+        return datetime.now().replace(microsecond=0)
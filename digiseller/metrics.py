@@ -0,0 +1,348 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """
+    Гистограмма с фиксированными границами корзин (как `histogram` в Prometheus)
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)  # Последняя корзина - +Inf
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[int]:
+        result = []
+        total = 0
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+    def quantile(self, q: float) -> float:
+        """
+        Оценка квантиля линейной интерполяцией внутри корзины (как `histogram_quantile`)
+
+        :param q: Квантиль от 0 до 1
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        lower = 0.0
+        total = 0
+        for upper, count in zip(self.buckets, self.counts):
+            if count and total + count >= rank:
+                return lower + (upper - lower) * (rank - total) / count
+            total += count
+            lower = upper
+        return self.buckets[-1] if self.buckets else 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+class RequestSpan:
+    """
+    Сведения об одном запросе к API, передаваемые в хуки начала и окончания запроса.
+    В `context` хуки могут сохранять свое состояние (например, span OpenTelemetry)
+    """
+
+    __slots__ = ('method', 'endpoint', 'start_time', 'duration', 'attempts', 'status_code',
+                 'bytes_sent', 'bytes_received', 'error', 'context', '_started')
+
+    def __init__(self, method: str, endpoint: str) -> None:
+        self.method: str = method.upper()
+        self.endpoint: str = endpoint
+        self.start_time: float = time.time()
+        self.duration: float = 0.0
+        self.attempts: int = 1
+        self.status_code: Optional[int] = None
+        self.bytes_sent: int = 0
+        self.bytes_received: int = 0
+        self.error: Optional[BaseException] = None
+        self.context: Dict[str, Any] = {}
+        self._started: float = time.perf_counter()
+
+    def __repr__(self) -> str:
+        return (f'RequestSpan({self.method} {self.endpoint}, status={self.status_code}, '
+                f'duration={self.duration:.4f}, attempts={self.attempts})')
+
+
+RequestHook = Callable[[RequestSpan], None]
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any]) -> str:
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)) + '}'
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Instrumentation:
+    """
+    Метрики и трассировка запросов клиента: гистограммы задержек по эндпоинтам, счетчики байт,
+    повторов, объединенных запросов, получений и обновлений токена, хуки начала и окончания запроса.
+    Экспортируется в текстовом формате Prometheus (`to_prometheus`), а `summary` показывает,
+    какие эндпоинты занимают больше всего времени
+    """
+
+    def __init__(self,
+                 buckets: Sequence[float] = DEFAULT_BUCKETS,
+                 slow_request_threshold: Optional[float] = None) -> None:
+        """
+        :param buckets: Границы корзин гистограмм задержек в секундах
+        :param slow_request_threshold: Запросы дольше этого времени (в секундах) пишутся в лог с уровнем WARNING
+        """
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self.slow_request_threshold: Optional[float] = slow_request_threshold
+
+        self.start_hooks: List[RequestHook] = []
+        self.end_hooks: List[RequestHook] = []
+
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Обнуляет все накопленные метрики (хуки сохраняются)
+        """
+        with self._lock:
+            self.latency: Dict[Tuple[str, str], Histogram] = {}  # (endpoint, method)
+            self.requests: Dict[Tuple[str, str, str], int] = {}  # (endpoint, method, status)
+            self.errors: Dict[Tuple[str, str, str], int] = {}  # (endpoint, method, error)
+            self.retries: Dict[Tuple[str, str], int] = {}  # (endpoint, reason)
+            self.bytes_sent: Dict[str, int] = {}
+            self.bytes_received: Dict[str, int] = {}
+            self.cache_hits: Dict[str, int] = {}
+            self.coalesced: Dict[str, int] = {}
+            self.logins: Dict[str, int] = {}  # result
+            self.login_latency: Histogram = Histogram(self.buckets)
+            self.token_refreshes: Dict[Tuple[str, str], int] = {}  # (source, mode)
+
+    def add_hooks(self, on_start: Optional[RequestHook] = None, on_end: Optional[RequestHook] = None) -> None:
+        """
+        Добавляет хуки, вызываемые в начале и по окончании каждого запроса к API.
+        Исключения в хуках пишутся в лог и не прерывают запрос
+
+        :param on_start: Вызывается перед первой попыткой запроса
+        :param on_end: Вызывается после получения ответа или ошибки, с заполненными `status_code`, `duration` и т.д.
+        """
+        if on_start is not None:
+            self.start_hooks.append(on_start)
+        if on_end is not None:
+            self.end_hooks.append(on_end)
+
+    def _call_hooks(self, hooks: List[RequestHook], span: RequestSpan) -> None:
+        for hook in hooks:
+            try:
+                hook(span)
+            except Exception:
+                logger.exception('Ошибка в хуке запроса %s %s', span.method, span.endpoint)
+
+    def start_request(self, method: str, endpoint: str) -> RequestSpan:
+        span = RequestSpan(method, endpoint)
+        self._call_hooks(self.start_hooks, span)
+        return span
+
+    def end_request(self, span: RequestSpan) -> None:
+        span.duration = time.perf_counter() - span._started
+        endpoint = span.endpoint
+
+        with self._lock:
+            histogram = self.latency.get((endpoint, span.method))
+            if histogram is None:
+                histogram = self.latency[(endpoint, span.method)] = Histogram(self.buckets)
+            histogram.observe(span.duration)
+
+            if span.error is not None:
+                key = (endpoint, span.method, type(span.error).__name__)
+                self.errors[key] = self.errors.get(key, 0) + 1
+            else:
+                key = (endpoint, span.method, str(span.status_code))
+                self.requests[key] = self.requests.get(key, 0) + 1
+
+            self.bytes_sent[endpoint] = self.bytes_sent.get(endpoint, 0) + span.bytes_sent
+            self.bytes_received[endpoint] = self.bytes_received.get(endpoint, 0) + span.bytes_received
+
+        if self.slow_request_threshold is not None and span.duration > self.slow_request_threshold:
+            logger.warning('Медленный запрос %s %s: %.3f с, статус %s, попыток %d',
+                           span.method, endpoint, span.duration, span.status_code, span.attempts)
+        else:
+            logger.debug('%s %s: %.3f с, статус %s, попыток %d',
+                         span.method, endpoint, span.duration, span.status_code, span.attempts)
+
+        self._call_hooks(self.end_hooks, span)
+
+    def record_retry(self, endpoint: str, reason: str) -> None:
+        """
+        :param reason: Код ответа или имя исключения, из-за которого запрос повторяется
+        """
+        with self._lock:
+            self.retries[(endpoint, reason)] = self.retries.get((endpoint, reason), 0) + 1
+
+    def record_cache_hit(self, endpoint: str) -> None:
+        with self._lock:
+            self.cache_hits[endpoint] = self.cache_hits.get(endpoint, 0) + 1
+
+    def record_coalesced(self, endpoint: str) -> None:
+        """
+        Запрос получил ответ одновременного одинакового запроса без обращения к API
+        """
+        with self._lock:
+            self.coalesced[endpoint] = self.coalesced.get(endpoint, 0) + 1
+
+    def record_login(self, duration: float, success: bool) -> None:
+        """
+        Запрос `apilogin` (получение нового токена)
+        """
+        result = 'success' if success else 'failure'
+        with self._lock:
+            self.logins[result] = self.logins.get(result, 0) + 1
+            self.login_latency.observe(duration)
+
+    def record_token_refresh(self, source: str, background: bool = False) -> None:
+        """
+        :param source: `login` - получен новый токен, `store` - взят действующий токен из хранилища
+        :param background: Обновление выполнено фоновым таймером, а не запросом
+        """
+        key = (source, 'background' if background else 'request')
+        with self._lock:
+            self.token_refreshes[key] = self.token_refreshes.get(key, 0) + 1
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Сводка по эндпоинтам, отсортированная по суммарному времени запросов
+
+        :return: Список словарей с полями endpoint, method, count, total, mean, p50, p90, p99 (секунды)
+        """
+        with self._lock:
+            rows = [
+                {
+                    'endpoint': endpoint,
+                    'method': method,
+                    'count': histogram.count,
+                    'total': histogram.sum,
+                    'mean': histogram.mean,
+                    'p50': histogram.quantile(0.5),
+                    'p90': histogram.quantile(0.9),
+                    'p99': histogram.quantile(0.99),
+                }
+                for (endpoint, method), histogram in self.latency.items()
+            ]
+        return sorted(rows, key=lambda row: row['total'], reverse=True)
+
+    def to_prometheus(self, prefix: str = 'digiseller') -> str:
+        """
+        Метрики в текстовом формате Prometheus (для эндпоинта `/metrics` или node_exporter textfile)
+        """
+        lines = []
+
+        def counter(name: str, help_text: str, label_names: Sequence[str], values: Dict[Any, int]) -> None:
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} counter')
+            for label_values, value in sorted(values.items()):
+                if not isinstance(label_values, tuple):
+                    label_values = (label_values,)
+                lines.append(f'{prefix}_{name}{_format_labels(label_names, label_values)} {_format_value(value)}')
+
+        def histogram(name: str, label_names: Sequence[str], label_values: Sequence[Any], hist: Histogram) -> None:
+            for upper, total in zip(self.buckets + (float('inf'),), hist.cumulative()):
+                le = '+Inf' if upper == float('inf') else _format_value(upper)
+                labels = _format_labels(tuple(label_names) + ('le',), tuple(label_values) + (le,))
+                lines.append(f'{prefix}_{name}_bucket{labels} {total}')
+            labels = _format_labels(label_names, label_values)
+            lines.append(f'{prefix}_{name}_sum{labels} {_format_value(hist.sum)}')
+            lines.append(f'{prefix}_{name}_count{labels} {hist.count}')
+
+        with self._lock:
+            lines.append(f'# HELP {prefix}_request_duration_seconds Длительность запросов к API с учетом повторов')
+            lines.append(f'# TYPE {prefix}_request_duration_seconds histogram')
+            for (endpoint, method), hist in sorted(self.latency.items()):
+                histogram('request_duration_seconds', ('endpoint', 'method'), (endpoint, method), hist)
+
+            counter('requests_total', 'Завершенные запросы к API', ('endpoint', 'method', 'status'), self.requests)
+            counter('request_errors_total', 'Запросы, завершившиеся исключением', ('endpoint', 'method', 'error'), self.errors)
+            counter('retries_total', 'Повторы запросов', ('endpoint', 'reason'), self.retries)
+            counter('request_bytes_total', 'Отправлено байт в телах запросов', ('endpoint',), self.bytes_sent)
+            counter('response_bytes_total', 'Получено байт в телах ответов', ('endpoint',), self.bytes_received)
+            counter('cache_hits_total', 'Ответы, взятые из кэша', ('endpoint',), self.cache_hits)
+            counter('coalesced_total', 'Ответы, полученные от одновременного одинакового запроса', ('endpoint',), self.coalesced)
+            counter('logins_total', 'Запросы нового токена (apilogin)', ('result',), self.logins)
+            counter('token_refreshes_total', 'Обновления токена', ('source', 'mode'), self.token_refreshes)
+
+            lines.append(f'# HELP {prefix}_login_duration_seconds Длительность запросов apilogin')
+            lines.append(f'# TYPE {prefix}_login_duration_seconds histogram')
+            histogram('login_duration_seconds', (), (), self.login_latency)
+
+        return '\n'.join(lines) + '\n'
+
+
+class OpenTelemetryHooks:
+    """
+    Хуки, создающие span OpenTelemetry на каждый запрос к API:
+    `instrumentation.add_hooks(*OpenTelemetryHooks(tracer))`.
+    Требуется пакет `opentelemetry-api`
+    """
+
+    def __init__(self, tracer) -> None:
+        """
+        :param tracer: Tracer OpenTelemetry (например `opentelemetry.trace.get_tracer(__name__)`)
+        """
+        from opentelemetry.trace import SpanKind, Status, StatusCode
+
+        self.tracer = tracer
+        self._kind = SpanKind.CLIENT
+        self._status = Status
+        self._error_code = StatusCode.ERROR
+
+    def __iter__(self):
+        return iter((self.on_start, self.on_end))
+
+    def on_start(self, span: RequestSpan) -> None:
+        span.context['otel_span'] = self.tracer.start_span(
+            f'{span.method} {span.endpoint}',
+            kind=self._kind,
+            start_time=int(span.start_time * 1e9),
+            attributes={'http.request.method': span.method, 'digiseller.endpoint': span.endpoint},
+        )
+
+    def on_end(self, span: RequestSpan) -> None:
+        otel_span = span.context.pop('otel_span', None)
+        if otel_span is None:
+            return
+
+        otel_span.set_attribute('http.request.resend_count', span.attempts - 1)
+        otel_span.set_attribute('http.request.body.size', span.bytes_sent)
+        otel_span.set_attribute('http.response.body.size', span.bytes_received)
+        if span.status_code is not None:
+            otel_span.set_attribute('http.response.status_code', span.status_code)
+
+        if span.error is not None:
+            otel_span.record_exception(span.error)
+            otel_span.set_status(self._status(self._error_code, str(span.error)))
+        elif span.status_code is not None and span.status_code >= 400:
+            otel_span.set_status(self._status(self._error_code))
+
+        otel_span.end(end_time=int((span.start_time + span.duration) * 1e9))
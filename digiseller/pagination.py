@@ -0,0 +1,149 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterator, List, Optional, Tuple
+
+PageFetcher = Callable[[int], Tuple[List, Optional[int]]]
+
+
+def has_next_page(page: int, items: List, pages_count: Optional[int], page_size: Optional[int]) -> bool:
+    """
+    Определяет, есть ли страница после текущей
+
+    :param page: Номер текущей страницы
+    :param items: Записи текущей страницы
+    :param pages_count: Общее количество страниц, если API его вернуло
+    :param page_size: Запрошенный размер страницы
+    """
+    if not items:
+        return False
+    if pages_count is not None:
+        return page < pages_count
+    if page_size is not None:
+        return len(items) >= page_size
+    return True
+
+
+def iter_pages(fetch_page: PageFetcher,
+               start_page: int = 1,
+               page_size: Optional[int] = None,
+               prefetch: bool = False) -> Iterator[List]:
+    """
+    Постранично обходит выдачу API, возвращая записи каждой страницы.
+    Обход прекращается, как только потребитель перестает читать генератор
+
+    :param fetch_page: Функция, принимающая номер страницы и возвращающая (записи, количество страниц или None)
+    :param start_page: Номер первой страницы
+    :param page_size: Размер страницы; используется, если API не вернуло количество страниц
+    :param prefetch: Загружать следующую страницу в фоне, пока обрабатывается текущая
+    """
+    if not prefetch:
+        page = start_page
+        while True:
+            items, pages_count = fetch_page(page)
+            if items:
+                yield items
+            if not has_next_page(page, items, pages_count, page_size):
+                return
+            page += 1
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='digiseller-prefetch')
+    future = executor.submit(fetch_page, start_page)
+    page = start_page
+    try:
+        while future is not None:
+            items, pages_count = future.result()
+            future = None
+            if has_next_page(page, items, pages_count, page_size):
+                future = executor.submit(fetch_page, page + 1)
+            if items:
+                yield items
+            page += 1
+    finally:
+        if future is not None:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def fetch_page_with_retry(fetch_page: PageFetcher,
+                          page: int,
+                          retries: int = 3,
+                          retry_delay: float = 1.0) -> Tuple[List, Optional[int]]:
+    """
+    Запрашивает страницу, повторяя запрос при ошибке с экспоненциальной задержкой
+
+    :param fetch_page: Функция запроса страницы
+    :param page: Номер страницы
+    :param retries: Количество повторных попыток
+    :param retry_delay: Задержка перед первой повторной попыткой в секундах
+    """
+    attempt = 0
+    while True:
+        try:
+            return fetch_page(page)
+        except Exception:
+            if attempt >= retries:
+                raise
+            time.sleep(retry_delay * 2 ** attempt)
+            attempt += 1
+
+
+def iter_pages_parallel(fetch_page: PageFetcher,
+                        start_page: int = 1,
+                        page_size: Optional[int] = None,
+                        workers: int = 8,
+                        ordered: bool = True,
+                        retries: int = 3,
+                        retry_delay: float = 1.0) -> Iterator[List]:
+    """
+    Загружает первую страницу, узнает из неё количество страниц и запрашивает остальные параллельно.
+    Неудачная страница повторяется отдельно, не прерывая остальные.
+    Если API не вернуло количество страниц, обход продолжается последовательно
+
+    :param fetch_page: Функция, принимающая номер страницы и возвращающая (записи, количество страниц или None)
+    :param start_page: Номер первой страницы
+    :param page_size: Размер страницы; используется, если API не вернуло количество страниц
+    :param workers: Количество одновременно загружаемых страниц
+    :param ordered: True - страницы возвращаются по порядку; False - по мере загрузки
+    :param retries: Количество повторных попыток для каждой страницы
+    :param retry_delay: Задержка перед первой повторной попыткой в секундах
+    """
+    items, pages_count = fetch_page_with_retry(fetch_page, start_page, retries, retry_delay)
+    if items:
+        yield items
+    if not has_next_page(start_page, items, pages_count, page_size):
+        return
+    if pages_count is None:
+        yield from iter_pages(fetch_page, start_page + 1, page_size)
+        return
+
+    pages = iter(range(start_page + 1, pages_count + 1))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='digiseller-pages')
+    pending = deque()
+
+    def submit_next() -> bool:
+        page = next(pages, None)
+        if page is None:
+            return False
+        pending.append(executor.submit(fetch_page_with_retry, fetch_page, page, retries, retry_delay))
+        return True
+
+    try:
+        # Держим в работе не больше 2 * workers страниц, чтобы не копить результаты в памяти
+        for _ in range(workers * 2):
+            if not submit_next():
+                break
+
+        while pending:
+            if ordered:
+                future = pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                pending.remove(future)
+            items, _ = future.result()
+            submit_next()
+            if items:
+                yield items
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
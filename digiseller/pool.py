@@ -0,0 +1,138 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+
+from .digiseller import Digiseller
+from .metrics import Instrumentation
+from .rate_limit import RateLimiter, RetryPolicy
+from .results import ResultMode
+from .scheduling import FairScheduler
+from .token_store import TokenStore
+from .transport import TransportConfig, build_session
+
+T = TypeVar('T')
+
+
+class DigisellerPool:
+    """
+    Клиенты для нескольких аккаунтов продавцов с общим пулом соединений.
+    У каждого аккаунта свой токен и его обновление, а одновременные запросы всех аккаунтов
+    ограничены общим `FairScheduler`, который распределяет места между аккаунтами по кругу
+    """
+
+    def __init__(self,
+                 accounts: Dict[int | str, str] | Iterable[Tuple[int | str, str]] = (),
+                 max_concurrency: int = 32,
+                 transport: TransportConfig | None = None,
+                 rate_limiter: RateLimiter | None = None,
+                 retry_policy: RetryPolicy | None = None,
+                 token_store: TokenStore | None = None,
+                 instrumentation: Instrumentation | None = None,
+                 background_token_refresh: bool = True,
+                 base_url: str | None = None,
+                 result_mode: ResultMode | str = ResultMode.MODEL) -> None:
+        """
+        :param accounts: Пары `seller_id` и `api_key` (или словарь `{seller_id: api_key}`)
+        :param max_concurrency: Максимальное количество одновременных запросов всех аккаунтов
+        :param transport: Настройки общего пула соединений, по умолчанию пул размером `max_concurrency`
+        :param rate_limiter: Ограничение скорости, общее для всех аккаунтов
+        :param retry_policy: Политика повторов для всех аккаунтов
+        :param token_store: Хранилище токенов (токены хранятся по `seller_id`)
+        :param instrumentation: Общий сбор метрик
+        :param background_token_refresh: Обновлять токены в фоне до истечения их времени жизни
+        :param base_url: Адрес API вместо `Digiseller.BASE_URL`
+        :param result_mode: Вид записей методов выгрузки для всех аккаунтов
+        """
+        self.transport: TransportConfig = transport or TransportConfig(pool_maxsize=max_concurrency)
+        self.session = build_session(self.transport)
+        self.scheduler: FairScheduler = FairScheduler(max_concurrency)
+
+        self.rate_limiter: RateLimiter | None = rate_limiter
+        self.retry_policy: RetryPolicy | None = retry_policy
+        self.token_store: TokenStore | None = token_store
+        self.instrumentation: Instrumentation | None = instrumentation
+        self.background_token_refresh: bool = background_token_refresh
+        self.base_url: str | None = base_url
+        self.result_mode: ResultMode = ResultMode(result_mode)
+
+        self.clients: Dict[int, Digiseller] = {}
+        self._lock = threading.Lock()
+
+        for seller_id, api_key in (accounts.items() if isinstance(accounts, dict) else accounts):
+            self.add(seller_id, api_key)
+
+    def __enter__(self) -> 'DigisellerPool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __getitem__(self, seller_id: int | str) -> Digiseller:
+        return self.clients[int(seller_id)]
+
+    def __contains__(self, seller_id: int | str) -> bool:
+        return int(seller_id) in self.clients
+
+    def __iter__(self) -> Iterator[Digiseller]:
+        return iter(list(self.clients.values()))
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def add(self, seller_id: int | str, api_key: str) -> Digiseller:
+        """
+        Добавляет аккаунт; клиент использует общие сессию и планировщик
+
+        :return: Клиент `Digiseller` аккаунта
+        """
+        client = Digiseller(seller_id, api_key,
+                            background_token_refresh=self.background_token_refresh,
+                            token_store=self.token_store,
+                            rate_limiter=self.rate_limiter,
+                            retry_policy=self.retry_policy,
+                            base_url=self.base_url,
+                            instrumentation=self.instrumentation,
+                            transport=self.transport,
+                            session=self.session,
+                            scheduler=self.scheduler,
+                            result_mode=self.result_mode)
+        with self._lock:
+            previous = self.clients.pop(client.seller_id, None)
+            self.clients[client.seller_id] = client
+        if previous is not None:
+            previous.close()
+        return client
+
+    def remove(self, seller_id: int | str) -> None:
+        """
+        Удаляет аккаунт и останавливает обновление его токена
+        """
+        with self._lock:
+            client = self.clients.pop(int(seller_id))
+        client.close()
+
+    def map(self, fn: Callable[[Digiseller], T], workers: Optional[int] = None) -> Dict[int, T]:
+        """
+        Выполняет `fn(client)` для всех аккаунтов одновременно
+
+        :param fn: Функция, принимающая клиент аккаунта
+        :param workers: Количество потоков, по умолчанию - по одному на аккаунт
+        :return: Словарь `{seller_id: результат}`; исключение любого аккаунта пробрасывается
+        """
+        clients = list(self)
+        if not clients:
+            return {}
+        with ThreadPoolExecutor(max_workers=workers or len(clients)) as executor:
+            results = executor.map(fn, clients)
+            return {client.seller_id: result for client, result in zip(clients, results)}
+
+    def close(self) -> None:
+        """
+        Останавливает обновление токенов всех аккаунтов и закрывает общую сессию
+        """
+        with self._lock:
+            clients = list(self.clients.values())
+            self.clients.clear()
+        for client in clients:
+            client.close()
+        self.session.close()
@@ -0,0 +1,182 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Разбирает заголовок `Retry-After` (секунды или HTTP дата)
+
+    :param value: Значение заголовка
+    :return: Задержка в секундах или None
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Потокобезопасный token bucket с адаптивной скоростью:
+    при ответах 429/5xx скорость снижается, при успешных - постепенно восстанавливается
+    """
+
+    def __init__(self,
+                 rate: float,
+                 burst: Optional[float] = None,
+                 min_rate: Optional[float] = None,
+                 decrease_factor: float = 0.5,
+                 increase_step: Optional[float] = None) -> None:
+        """
+        :param rate: Максимальное количество запросов в секунду
+        :param burst: Размер корзины (сколько запросов можно сделать разом), по умолчанию - `rate`
+        :param min_rate: Нижняя граница скорости при снижении, по умолчанию - `rate / 10`
+        :param decrease_factor: Во сколько раз умножается скорость при ответе 429/5xx
+        :param increase_step: Прибавка к скорости после успешного ответа, по умолчанию - `rate / 20`
+        """
+        self.max_rate: float = rate
+        self.rate: float = rate
+        self.burst: float = burst or rate
+        self.min_rate: float = min_rate or rate / 10
+        self.decrease_factor: float = decrease_factor
+        self.increase_step: float = increase_step or rate / 20
+
+        self._tokens: float = self.burst
+        self._updated: float = time.monotonic()
+        self._blocked_until: float = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Резервирует место для одного запроса
+
+        :return: Сколько секунд нужно подождать перед запросом
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(delay, self._blocked_until - now)
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> None:
+        """
+        Снижает скорость после ответа 429/5xx и приостанавливает запросы на `retry_after` секунд
+        """
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+    def on_success(self) -> None:
+        """
+        Постепенно возвращает скорость к максимальной
+        """
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+
+class RateLimiter:
+    """
+    Ограничение скорости запросов на стороне клиента: общая корзина и отдельные корзины для эндпоинтов
+    """
+
+    THROTTLE_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self,
+                 rate: float = 10,
+                 burst: Optional[float] = None,
+                 endpoint_limits: Optional[Dict[str, float | Tuple[float, float]]] = None) -> None:
+        """
+        :param rate: Запросов в секунду для эндпоинтов без отдельного лимита
+        :param burst: Размер общей корзины, по умолчанию - `rate`
+        :param endpoint_limits: Лимиты для отдельных эндпоинтов: {'seller-sells/v2': 5} или {'seller-sells/v2': (5, 10)}
+        """
+        self.default_bucket: TokenBucket = TokenBucket(rate, burst)
+        self.buckets: Dict[str, TokenBucket] = {}
+        for endpoint, limit in (endpoint_limits or {}).items():
+            endpoint_rate, endpoint_burst = limit if isinstance(limit, tuple) else (limit, None)
+            self.buckets[endpoint] = TokenBucket(endpoint_rate, endpoint_burst)
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        return self.buckets.get(endpoint, self.default_bucket)
+
+    def reserve(self, endpoint: str) -> float:
+        """
+        :return: Сколько секунд нужно подождать перед запросом к эндпоинту
+        """
+        return self.bucket(endpoint).reserve()
+
+    def acquire(self, endpoint: str) -> None:
+        """
+        Блокирует поток, пока запрос к эндпоинту не станет разрешен
+        """
+        delay = self.reserve(endpoint)
+        if delay > 0:
+            time.sleep(delay)
+
+    def on_response(self, endpoint: str, status_code: int, retry_after: Optional[str] = None) -> None:
+        """
+        Подстраивает скорость под ответ API
+        """
+        bucket = self.bucket(endpoint)
+        if status_code in self.THROTTLE_STATUSES:
+            bucket.on_throttled(parse_retry_after(retry_after))
+        else:
+            bucket.on_success()
+
+
+class RetryPolicy:
+    """
+    Повтор запросов при 429/5xx и сетевых ошибках с экспоненциальной задержкой и jitter.
+    По умолчанию повторяются только идемпотентные GET запросы
+    """
+
+    def __init__(self,
+                 max_retries: int = 3,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 30,
+                 retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+                 retry_methods: Iterable[str] = ('GET',)) -> None:
+        """
+        :param max_retries: Максимальное количество повторов
+        :param backoff_base: Базовая задержка в секундах
+        :param backoff_max: Максимальная задержка в секундах
+        :param retry_statuses: HTTP статусы, при которых запрос повторяется
+        :param retry_methods: HTTP методы, которые можно повторять
+        """
+        self.max_retries: int = max_retries
+        self.backoff_base: float = backoff_base
+        self.backoff_max: float = backoff_max
+        self.retry_statuses: frozenset = frozenset(retry_statuses)
+        self.retry_methods: frozenset = frozenset(m.upper() for m in retry_methods)
+
+    def can_retry(self, method: str, attempt: int) -> bool:
+        return method.upper() in self.retry_methods and attempt < self.max_retries
+
+    def should_retry(self, method: str, status_code: int, attempt: int) -> bool:
+        return status_code in self.retry_statuses and self.can_retry(method, attempt)
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Задержка перед повтором: `Retry-After`, если сервер его указал, иначе full jitter
+
+        :param attempt: Номер повтора, начиная с 0
+        :param retry_after: Значение заголовка `Retry-After`
+        """
+        delay = parse_retry_after(retry_after)
+        if delay is not None:
+            return min(delay, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
@@ -0,0 +1,227 @@
+from decimal import Decimal
+from typing import Any, Optional
+
+from .utils import parse_date
+
+
+class _Record:
+    """
+    Общие методы компактных записей. Поля хранятся в `__slots__`: нет `__dict__` у экземпляра,
+    поля API, не описанные в классе, хранятся в `extra` и доступны как атрибуты
+    """
+
+    __slots__ = ()
+
+    _fields: tuple = ()  # Атрибуты записи (без `extra`) в порядке аргументов `__init__`
+    _keys: tuple = ()  # Поля ответа API в порядке `_fields`
+    _field_set: frozenset = frozenset()
+
+    datetime_fields: tuple = ()
+    number_fields: tuple = ()
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        if data.keys() <= cls._field_set:
+            extra = None
+        else:
+            extra = {key: data[key] for key in data.keys() - cls._field_set}
+        return cls(*map(data.get, cls._keys), extra)
+
+    def __getattr__(self, name: str) -> Any:
+        # Вызывается только для отсутствующих атрибутов, заполненные поля из `__slots__` сюда не попадают
+        extra = self.extra if name != 'extra' else None
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError(f'{self.__class__.__name__!r} object has no attribute {name!r}')
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._fields + ('extra',))
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self._fields)
+        return f'{self.__class__.__name__}({fields})'
+
+    def to_dict(self) -> dict:
+        """
+        Словарь с именами полей как в ответе API (поля None опускаются)
+        """
+        data = {key: value for key, name in zip(self._keys, self._fields)
+                if (value := getattr(self, name)) is not None}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def as_datetime(self, field: str):
+        """
+        Значение поля, приведенное к datetime (преобразование выполняется при обращении)
+        """
+        return parse_date(getattr(self, field))
+
+    def as_decimal(self, field: str) -> Optional[Decimal]:
+        """
+        Значение поля, приведенное к Decimal (преобразование выполняется при обращении)
+        """
+        value = getattr(self, field)
+        return None if value is None or value == '' else Decimal(str(value))
+
+    def replace(self, **changes):
+        """
+        Копия записи с измененными полями
+        """
+        values = {name: getattr(self, name) for name in self._fields}
+        values.update(changes)
+        return self.__class__(extra=self.extra, **values)
+
+    def converted(self):
+        """
+        Копия записи, в которой поля дат приведены к datetime, а денежные поля - к Decimal
+        """
+        changes = {field: self.as_datetime(field) for field in self.datetime_fields}
+        changes.update({field: self.as_decimal(field) for field in self.number_fields})
+        return self.replace(**changes)
+
+
+class SaleRecord(_Record):
+    """
+    Компактное представление продажи (аналог `Sale`)
+    https://my.digiseller.com/inside/api_statistics.asp
+    """
+
+    __slots__ = ('invoice_id', 'product_id', 'product_name', 'product_entry', 'date_pay', 'email',
+                 'amount_in', 'amount_out', 'amount_currency', 'method_pay', 'ip', 'partner_id', 'lang', 'extra')
+    _fields = __slots__[:-1]
+    _keys = _fields
+    _field_set = frozenset(_keys)
+
+    datetime_fields = ('date_pay',)
+    number_fields = ('amount_in', 'amount_out')
+
+    def __init__(self,
+                 invoice_id: Optional[int] = None,
+                 product_id: Optional[int] = None,
+                 product_name: Optional[str] = None,
+                 product_entry: Optional[str] = None,
+                 date_pay: Optional[str] = None,
+                 email: Optional[str] = None,
+                 amount_in: Optional[float] = None,
+                 amount_out: Optional[float] = None,
+                 amount_currency: Optional[str] = None,
+                 method_pay: Optional[str] = None,
+                 ip: Optional[str] = None,
+                 partner_id: Optional[int] = None,
+                 lang: Optional[str] = None,
+                 extra: Optional[dict] = None) -> None:
+        self.invoice_id = invoice_id
+        self.product_id = product_id
+        self.product_name = product_name
+        self.product_entry = product_entry
+        self.date_pay = date_pay
+        self.email = email
+        self.amount_in = amount_in
+        self.amount_out = amount_out
+        self.amount_currency = amount_currency
+        self.method_pay = method_pay
+        self.ip = ip
+        self.partner_id = partner_id
+        self.lang = lang
+        self.extra = extra
+
+
+class OperationRecord(_Record):
+    """
+    Компактное представление операции по аккаунту (аналог `Operation`)
+    https://my.digiseller.com/inside/api_account.asp
+    """
+
+    __slots__ = ('id', 'date', 'amount', 'currency', 'type', 'invoice_id', 'description', 'extra')
+    _fields = __slots__[:-1]
+    _keys = _fields
+    _field_set = frozenset(_keys)
+
+    datetime_fields = ('date',)
+    number_fields = ('amount',)
+
+    def __init__(self,
+                 id: Optional[int] = None,
+                 date: Optional[str] = None,
+                 amount: Optional[float] = None,
+                 currency: Optional[str] = None,
+                 type: Optional[str] = None,
+                 invoice_id: Optional[int] = None,
+                 description: Optional[str] = None,
+                 extra: Optional[dict] = None) -> None:
+        self.id = id
+        self.date = date
+        self.amount = amount
+        self.currency = currency
+        self.type = type
+        self.invoice_id = invoice_id
+        self.description = description
+        self.extra = extra
+
+
+class ProductRecord(_Record):
+    """
+    Компактное представление товара (аналог `Product`)
+    https://my.digiseller.com/inside/api_catgoods.asp#products
+    """
+
+    __slots__ = ('id', 'name', 'price', 'currency', 'base_price', 'base_currency', 'cnt_sell', 'in_stock', 'extra')
+    _fields = __slots__[:-1]
+    _keys = _fields
+    _field_set = frozenset(_keys)
+
+    number_fields = ('price', 'base_price')
+
+    def __init__(self,
+                 id: Optional[int] = None,
+                 name: Optional[str] = None,
+                 price: Optional[float] = None,
+                 currency: Optional[str] = None,
+                 base_price: Optional[float] = None,
+                 base_currency: Optional[str] = None,
+                 cnt_sell: Optional[int] = None,
+                 in_stock: Optional[int] = None,
+                 extra: Optional[dict] = None) -> None:
+        self.id = id
+        self.name = name
+        self.price = price
+        self.currency = currency
+        self.base_price = base_price
+        self.base_currency = base_currency
+        self.cnt_sell = cnt_sell
+        self.in_stock = in_stock
+        self.extra = extra
+
+
+class DialogRecord(_Record):
+    """
+    Компактное представление диалога (аналог `Dialog`); поля названы как в `Dialog`,
+    `last_date` - строка ответа API
+    https://my.digiseller.com/inside/api_debates.asp#get_chats
+    """
+
+    __slots__ = ('order_id', 'email', 'product_name', 'last_date', 'messages_count', 'new_messages_count', 'extra')
+    _fields = __slots__[:-1]
+    _keys = ('id_i', 'email', 'product', 'last_date', 'cnt_msg', 'cnt_new')  # Поля ответа API в порядке `_fields`
+    _field_set = frozenset(_keys)
+
+    datetime_fields = ('last_date',)
+
+    def __init__(self,
+                 order_id: Optional[int] = None,
+                 email: Optional[str] = None,
+                 product_name: Optional[str] = None,
+                 last_date: Optional[str] = None,
+                 messages_count: Optional[int] = None,
+                 new_messages_count: Optional[int] = None,
+                 extra: Optional[dict] = None) -> None:
+        self.order_id = order_id
+        self.email = email
+        self.product_name = product_name
+        self.last_date = last_date
+        self.messages_count = messages_count
+        self.new_messages_count = new_messages_count
+        self.extra = extra
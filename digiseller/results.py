@@ -0,0 +1,59 @@
+from enum import Enum
+from typing import Any, Callable, List, Optional
+
+
+class ResultMode(Enum):
+    """
+    Вид записей, возвращаемых методами выгрузки:
+
+    - MODEL - объекты `Sale`/`Operation`/`Product`/`Dialog` (по умолчанию)
+    - CONSTRUCT - те же классы без вызова `__init__` (`Dialog` создается как в MODEL)
+    - NAMEDTUPLE - компактные записи `SaleRecord`/`OperationRecord`/`ProductRecord`/`DialogRecord`
+    - RAW - словари ответа API без преобразования
+    """
+
+    MODEL = 'model'
+    CONSTRUCT = 'construct'
+    NAMEDTUPLE = 'namedtuple'
+    RAW = 'raw'
+
+
+def resolve_result_mode(digiseller, result_mode: Optional[ResultMode | str]) -> ResultMode:
+    """
+    Режим вызова, а если он не указан - режим клиента (`Digiseller(result_mode=...)`)
+    """
+    if result_mode is None:
+        return getattr(digiseller, 'result_mode', ResultMode.MODEL)
+    return ResultMode(result_mode)
+
+
+def construct(cls: type, data: dict) -> Any:
+    """
+    Создает объект класса с атрибутами из словаря, не вызывая `__init__`
+    """
+    obj = cls.__new__(cls)
+    obj.__dict__.update(data)
+    return obj
+
+
+def convert_rows(rows: List[dict],
+                 mode: ResultMode,
+                 model: Callable[[dict], Any],
+                 record: Callable[[dict], Any],
+                 constructed: Callable[[dict], Any]) -> List[Any]:
+    """
+    Преобразует страницу ответа API в записи выбранного вида
+
+    :param rows: Словари ответа API
+    :param mode: Вид записей
+    :param model: Создание объекта модели с проверкой полей
+    :param record: Создание компактной записи
+    :param constructed: Создание объекта модели без проверки
+    """
+    if mode is ResultMode.RAW:
+        return rows
+    if mode is ResultMode.NAMEDTUPLE:
+        return list(map(record, rows))
+    if mode is ResultMode.CONSTRUCT:
+        return list(map(constructed, rows))
+    return list(map(model, rows))
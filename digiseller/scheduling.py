@@ -0,0 +1,71 @@
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Hashable, Iterator
+
+
+class FairScheduler:
+    """
+    Ограничение количества одновременных запросов, общее для нескольких аккаунтов.
+    Освободившееся место отдается аккаунтам по кругу, поэтому аккаунт с большой выгрузкой
+    не может занять все места и задержать запросы остальных
+    """
+
+    def __init__(self, max_concurrency: int = 32) -> None:
+        """
+        :param max_concurrency: Максимальное количество одновременных запросов всех аккаунтов
+        """
+        self.max_concurrency: int = max_concurrency
+        self._available: int = max_concurrency
+        self._waiters: OrderedDict[Hashable, Deque[threading.Event]] = OrderedDict()  # Порядок - очередь круга
+        self._in_flight: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self, account: Hashable) -> int:
+        """
+        Количество выполняющихся запросов аккаунта
+        """
+        return self._in_flight.get(account, 0)
+
+    def waiting(self, account: Hashable) -> int:
+        """
+        Количество запросов аккаунта, ожидающих места
+        """
+        return len(self._waiters.get(account, ()))
+
+    def acquire(self, account: Hashable) -> None:
+        with self._lock:
+            if self._available > 0 and not self._waiters:
+                self._available -= 1
+                self._in_flight[account] = self._in_flight.get(account, 0) + 1
+                return
+            granted = threading.Event()
+            self._waiters.setdefault(account, deque()).append(granted)
+
+        granted.wait()
+
+    def release(self, account: Hashable) -> None:
+        with self._lock:
+            self._in_flight[account] -= 1
+            if not self._in_flight[account]:
+                del self._in_flight[account]
+
+            if not self._waiters:
+                self._available += 1
+                return
+
+            # Место получает первый аккаунт круга, после чего он переходит в конец очереди
+            next_account, waiters = self._waiters.popitem(last=False)
+            granted = waiters.popleft()
+            if waiters:
+                self._waiters[next_account] = waiters
+            self._in_flight[next_account] = self._in_flight.get(next_account, 0) + 1
+            granted.set()
+
+    @contextmanager
+    def slot(self, account: Hashable) -> Iterator[None]:
+        self.acquire(account)
+        try:
+            yield
+        finally:
+            self.release(account)
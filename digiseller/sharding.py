@@ -0,0 +1,115 @@
+import math
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Callable, Hashable, Iterator, List, Optional, Tuple
+
+from .pagination import PageFetcher, fetch_page_with_retry, has_next_page
+
+WindowPageFetcher = Callable[[datetime, datetime], PageFetcher]
+
+
+def record_key(field: str) -> Callable[[Any], Hashable]:
+    """
+    Возвращает функцию получения идентификатора записи (объекта или словаря) по имени поля
+
+    :param field: Имя поля с идентификатором, например `invoice_id`
+    """
+    def key(record: Any) -> Hashable:
+        return record[field] if isinstance(record, dict) else getattr(record, field)
+
+    return key
+
+
+def split_window(date_start: datetime,
+                 date_finish: datetime,
+                 parts: int,
+                 granularity: timedelta = timedelta(minutes=1)) -> List[Tuple[datetime, datetime]]:
+    """
+    Делит интервал дат на равные подынтервалы, выравнивая границы по `granularity`.
+    Соседние подынтервалы имеют общую границу, дубликаты на ней отсеиваются при слиянии
+
+    :param date_start: Дата начала
+    :param date_finish: Дата конца
+    :param parts: Желаемое количество подынтервалов
+    :param granularity: Минимальный шаг границ (точность дат в API)
+    """
+    parts = max(1, min(parts, int((date_finish - date_start) / granularity) or 1))
+    step = (date_finish - date_start) / parts
+
+    bounds = [date_start]
+    for i in range(1, parts):
+        bound = date_start + step * i
+        bound -= (bound - date_start) % granularity
+        if bound > bounds[-1]:
+            bounds.append(bound)
+    bounds.append(date_finish)
+
+    return list(zip(bounds, bounds[1:]))
+
+
+def iter_sharded(make_fetch_page: WindowPageFetcher,
+                 date_start: datetime,
+                 date_finish: datetime,
+                 key: Callable[[Any], Hashable],
+                 page_size: Optional[int] = None,
+                 workers: int = 8,
+                 initial_shards: Optional[int] = None,
+                 max_pages_per_shard: int = 10,
+                 min_shard: timedelta = timedelta(minutes=1),
+                 retries: int = 3) -> Iterator[Any]:
+    """
+    Загружает записи за большой интервал дат, разбивая его на подынтервалы, которые запрашиваются параллельно.
+    Если в подынтервале больше `max_pages_per_shard` страниц, он дробится пропорционально плотности данных.
+    Записи возвращаются по мере загрузки подынтервалов, без повторов по `key`
+
+    :param make_fetch_page: Функция, принимающая (начало, конец) и возвращающая функцию запроса страницы
+    :param date_start: Дата начала
+    :param date_finish: Дата конца
+    :param key: Функция получения идентификатора записи для удаления дубликатов
+    :param page_size: Размер страницы; используется, если API не вернуло количество страниц
+    :param workers: Количество одновременно загружаемых подынтервалов
+    :param initial_shards: Начальное количество подынтервалов, по умолчанию - `workers`
+    :param max_pages_per_shard: Максимум страниц в подынтервале, при превышении он дробится
+    :param min_shard: Минимальная длина подынтервала, он же шаг выравнивания границ
+    :param retries: Количество повторных попыток для каждой страницы
+    """
+    def fetch_shard(start: datetime, finish: datetime) -> Tuple[List[Tuple[datetime, datetime]], List]:
+        fetch_page = partial(fetch_page_with_retry, make_fetch_page(start, finish), retries=retries)
+        items, pages_count = fetch_page(1)
+        if pages_count is not None and pages_count > max_pages_per_shard and finish - start >= 2 * min_shard:
+            parts = math.ceil(pages_count / max_pages_per_shard)
+            subshards = split_window(start, finish, parts, min_shard)
+            # Если подынтервал не делится (короче двух шагов выравнивания), он загружается постранично
+            if len(subshards) > 1:
+                return subshards, []
+
+        records = list(items)
+        page = 1
+        while has_next_page(page, items, pages_count, page_size):
+            page += 1
+            items, pages_count = fetch_page(page)
+            records.extend(items)
+
+        return [], records
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='digiseller-shards')
+    pending = {
+        executor.submit(fetch_shard, start, finish)
+        for start, finish in split_window(date_start, date_finish, initial_shards or workers, min_shard)
+    }
+    seen = set()
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                subshards, records = future.result()
+                for start, finish in subshards:
+                    pending.add(executor.submit(fetch_shard, start, finish))
+                for record in records:
+                    record_id = key(record)
+                    if record_id not in seen:
+                        seen.add(record_id)
+                        yield record
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
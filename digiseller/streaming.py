@@ -0,0 +1,85 @@
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator, Sequence
+
+_STRUCTURE = re.compile(r'["{}\[\]:,]')
+_STRING_END = re.compile(r'["\\]')
+
+
+def iter_json_array(chunks: Iterable[bytes], path: str | Sequence[str], encoding: str = 'utf-8') -> Iterator[Any]:
+    """
+    Потоково разбирает JSON ответ и возвращает элементы-объекты массива по пути `path`
+    по мере их получения, не загружая весь ответ в память.
+    Например, `path='rows'` для `{"retval": 0, "rows": [{...}, {...}]}`
+    или `path=('content', 'items')` для `{"content": {"items": [...]}}`
+
+    :param chunks: Части тела ответа (например `Response.iter_content()`)
+    :param path: Ключ или последовательность ключей до массива
+    :param encoding: Кодировка ответа
+    """
+    path = [path] if isinstance(path, str) else list(path)
+    decoder = codecs.getincrementaldecoder(encoding)()
+
+    buffer = ''
+    pos = 0
+    keys = []  # Текущий ключ для каждого открытого контейнера (None для массивов)
+    candidate_key = None  # Последняя прочитанная строка - возможно, ключ
+    target_depth = None  # Глубина целевого массива, когда мы внутри него
+    element_start = None
+
+    for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        while True:
+            match = _STRUCTURE.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+
+            char = match.group()
+            if char == '"':
+                end = match.end()
+                while True:
+                    string_end = _STRING_END.search(buffer, end)
+                    if string_end is None:
+                        break
+                    if string_end.group() == '\\':
+                        if string_end.end() >= len(buffer):
+                            string_end = None
+                            break
+                        end = string_end.end() + 1
+                        continue
+                    break
+                if string_end is None:
+                    pos = match.start()  # Строка ещё не получена полностью
+                    break
+                if element_start is None:
+                    candidate_key = json.loads(buffer[match.start():string_end.end()])
+                pos = string_end.end()
+                continue
+
+            pos = match.end()
+            if char == ':':
+                if keys:
+                    keys[-1] = candidate_key
+            elif char in '{[':
+                if target_depth is not None and len(keys) == target_depth and element_start is None:
+                    element_start = match.start()
+                if char == '[' and target_depth is None and keys == path:
+                    target_depth = len(keys) + 1
+                keys.append(None)
+            elif char in '}]':
+                keys.pop()
+                if element_start is not None and len(keys) == target_depth:
+                    yield json.loads(buffer[element_start:pos])
+                    element_start = None
+                elif target_depth is not None and len(keys) < target_depth:
+                    return  # Целевой массив закончился
+
+        # Отбрасываем уже разобранную часть, оставляя начало текущего элемента
+        keep_from = element_start if element_start is not None else pos
+        if keep_from:
+            buffer = buffer[keep_from:]
+            pos -= keep_from
+            if element_start is not None:
+                element_start = 0
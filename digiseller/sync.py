@@ -0,0 +1,259 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from .api.statistics import Sale
+from .api.operations import Operation
+from .results import ResultMode
+from .utils import parse_date
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS sales (
+    invoice_id INTEGER PRIMARY KEY,
+    product_id INTEGER,
+    date_pay TEXT,
+    amount_in REAL,
+    amount_out REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sales_date_pay ON sales (date_pay);
+CREATE INDEX IF NOT EXISTS sales_product_id ON sales (product_id, date_pay);
+
+CREATE TABLE IF NOT EXISTS operations (
+    id INTEGER PRIMARY KEY,
+    date TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS operations_date ON operations (date);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+'''
+
+DB_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _db_date(value) -> Optional[str]:
+    date = parse_date(value)
+    return date.strftime(DB_DATE_FORMAT) if date else None
+
+
+class SalesSync:
+    """
+    Инкрементальная синхронизация продаж (и операций по аккаунту) в локальную базу SQLite.
+    Хранит отметку последней синхронизации и при каждом запуске загружает только новые записи
+    с перекрытием `overlap`, чтобы учесть поздние возвраты и изменения
+    """
+
+    def __init__(self,
+                 digiseller,
+                 path: str,
+                 overlap: timedelta = timedelta(days=3),
+                 initial_date: datetime = datetime(2000, 1, 1, 0, 0, 0),
+                 batch_size: int = 500) -> None:
+        """
+        :param digiseller: Экземпляр класса `Digiseller`
+        :param path: Путь к файлу базы SQLite
+        :param overlap: На сколько раньше отметки начинать загрузку
+        :param initial_date: С какой даты загружать данные при первой синхронизации
+        :param batch_size: Сколько записей сохранять в одной транзакции
+        """
+        self.digiseller = digiseller
+        self.overlap: timedelta = overlap
+        self.initial_date: datetime = initial_date
+        self.batch_size: int = batch_size
+
+        self.connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'SalesSync':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def get_watermark(self, name: str) -> Optional[datetime]:
+        """
+        Возвращает отметку последней успешной синхронизации (`sales` или `operations`)
+        """
+        row = self.connection.execute('SELECT value FROM sync_state WHERE name = ?', (name,)).fetchone()
+        return datetime.strptime(row[0], DB_DATE_FORMAT) if row else None
+
+    def _set_watermark(self, name: str, value: datetime) -> None:
+        self.connection.execute(
+            'INSERT INTO sync_state (name, value) VALUES (?, ?) '
+            'ON CONFLICT (name) DO UPDATE SET value = excluded.value',
+            (name, value.strftime(DB_DATE_FORMAT))
+        )
+
+    def _window(self, name: str) -> tuple[datetime, datetime]:
+        watermark = self.get_watermark(name)
+        date_start = watermark - self.overlap if watermark else self.initial_date
+        return date_start, datetime.now().replace(microsecond=0)
+
+    def _save(self, sql: str, rows: Iterable[tuple]) -> int:
+        saved = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                with self.connection:
+                    self.connection.executemany(sql, batch)
+                saved += len(batch)
+                batch.clear()
+        if batch:
+            with self.connection:
+                self.connection.executemany(sql, batch)
+            saved += len(batch)
+        return saved
+
+    def sync_sales(self, returned: int = 0, prefetch: bool = True) -> int:
+        """
+        Загружает продажи с момента последней синхронизации (минус `overlap`)
+
+        :param returned: 0 - включить возвраты; 1 - без возвратов; 2 - только возвраты
+        :param prefetch: Загружать следующую страницу в фоне
+        :return: Количество сохраненных (новых и обновленных) продаж
+        """
+        with self._lock:
+            date_start, date_finish = self._window('sales')
+            sales = self.digiseller.statistics.iter_sales(
+                date_start=date_start,
+                date_finish=date_finish,
+                returned=returned,
+                rows=100,
+                prefetch=prefetch,
+                result_mode=ResultMode.RAW
+            )
+            rows = (
+                (
+                    data['invoice_id'],
+                    data.get('product_id'),
+                    _db_date(data.get('date_pay')),
+                    data.get('amount_in'),
+                    data.get('amount_out'),
+                    json.dumps(data, ensure_ascii=False)
+                )
+                for data in sales
+            )
+            saved = self._save(
+                'INSERT INTO sales (invoice_id, product_id, date_pay, amount_in, amount_out, data) '
+                'VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (invoice_id) DO UPDATE SET '
+                'product_id = excluded.product_id, date_pay = excluded.date_pay, '
+                'amount_in = excluded.amount_in, amount_out = excluded.amount_out, data = excluded.data',
+                rows
+            )
+            with self.connection:
+                self._set_watermark('sales', date_finish)
+
+            return saved
+
+    def sync_operations(self, prefetch: bool = True) -> int:
+        """
+        Загружает операции по аккаунту с момента последней синхронизации (минус `overlap`)
+
+        :param prefetch: Загружать следующую страницу в фоне
+        :return: Количество сохраненных (новых и обновленных) операций
+        """
+        with self._lock:
+            date_start, date_finish = self._window('operations')
+            operations = self.digiseller.operations.iter_all(
+                count=200,
+                date_start=date_start,
+                date_finish=date_finish,
+                prefetch=prefetch,
+                result_mode=ResultMode.RAW
+            )
+            rows = (
+                (data['id'], _db_date(data.get('date')), json.dumps(data, ensure_ascii=False))
+                for data in operations
+            )
+            saved = self._save(
+                'INSERT INTO operations (id, date, data) VALUES (?, ?, ?) '
+                'ON CONFLICT (id) DO UPDATE SET date = excluded.date, data = excluded.data',
+                rows
+            )
+            with self.connection:
+                self._set_watermark('operations', date_finish)
+
+            return saved
+
+    def sync(self, operations: bool = False) -> dict:
+        """
+        Синхронизирует продажи и, при необходимости, операции
+
+        :return: Количество сохраненных записей по таблицам
+        """
+        result = {'sales': self.sync_sales()}
+        if operations:
+            result['operations'] = self.sync_operations()
+        return result
+
+    def query(self, sql: str, params: Iterable = ()) -> List[tuple]:
+        """
+        Выполняет произвольный запрос к локальной базе
+        """
+        return self.connection.execute(sql, tuple(params)).fetchall()
+
+    def get_sales(self,
+                  date_start: Optional[datetime] = None,
+                  date_finish: Optional[datetime] = None,
+                  product_id: Optional[int] = None) -> List[Sale]:
+        """
+        Продажи из локальной базы
+
+        :param date_start: Дата оплаты не раньше
+        :param date_finish: Дата оплаты не позже
+        :param product_id: ID товара
+        :return: Список объектов `Sale`
+        """
+        conditions, params = [], []
+        if date_start is not None:
+            conditions.append('date_pay >= ?')
+            params.append(date_start.strftime(DB_DATE_FORMAT))
+        if date_finish is not None:
+            conditions.append('date_pay <= ?')
+            params.append(date_finish.strftime(DB_DATE_FORMAT))
+        if product_id is not None:
+            conditions.append('product_id = ?')
+            params.append(product_id)
+
+        sql = 'SELECT data FROM sales'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY date_pay'
+
+        return [Sale.from_dict(json.loads(row[0])) for row in self.query(sql, params)]
+
+    def get_operations(self,
+                       date_start: Optional[datetime] = None,
+                       date_finish: Optional[datetime] = None) -> List[Operation]:
+        """
+        Операции по аккаунту из локальной базы
+
+        :param date_start: Дата операции не раньше
+        :param date_finish: Дата операции не позже
+        :return: Список объектов `Operation`
+        """
+        conditions, params = [], []
+        if date_start is not None:
+            conditions.append('date >= ?')
+            params.append(date_start.strftime(DB_DATE_FORMAT))
+        if date_finish is not None:
+            conditions.append('date <= ?')
+            params.append(date_finish.strftime(DB_DATE_FORMAT))
+
+        sql = 'SELECT data FROM operations'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY date'
+
+        return [Operation.from_dict(json.loads(row[0])) for row in self.query(sql, params)]
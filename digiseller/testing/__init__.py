@@ -0,0 +1,2 @@
+from .fake_server import FakeDigisellerServer
+from .notifier import FakeNotifier
@@ -0,0 +1,335 @@
+import bisect
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ..utils import parse_date
+
+
+class FakeDigisellerServer:
+    """
+    Локальная замена API Digiseller для тестов и бенчмарков без сети.
+    Отдает сгенерированные данные для эндпоинтов, которые использует библиотека,
+    и умеет имитировать задержку, ограничение скорости (429) и ошибки (5xx)
+
+        with FakeDigisellerServer(sales_count=10_000, latency=0.005) as server:
+            digi = Digiseller(123, 'key', base_url=server.url)
+    """
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 latency: float | Tuple[float, float] = 0.0,
+                 rate_limit: Optional[float] = None,
+                 error_rate: float = 0.0,
+                 sales_count: int = 1000,
+                 operations_count: int = 1000,
+                 products_count: int = 200,
+                 chats_count: int = 100,
+                 date_start: datetime = datetime(2020, 1, 1),
+                 date_finish: datetime = datetime(2024, 1, 1),
+                 seed: int = 0) -> None:
+        """
+        :param host: Адрес сервера
+        :param port: Порт; 0 - выбрать свободный
+        :param latency: Задержка ответа в секундах или диапазон (мин, макс)
+        :param rate_limit: Максимум запросов в секунду; сверх него - 429 с `Retry-After`
+        :param error_rate: Доля ответов 500
+        :param sales_count: Количество продаж
+        :param operations_count: Количество операций по аккаунту
+        :param products_count: Количество товаров
+        :param chats_count: Количество диалогов
+        :param date_start: Начало периода, по которому распределены даты продаж и операций
+        :param date_finish: Конец периода
+        :param seed: Зерно генератора данных
+        """
+        self.latency: float | Tuple[float, float] = latency
+        self.rate_limit: Optional[float] = rate_limit
+        self.error_rate: float = error_rate
+
+        self.requests_count: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._window_start: float = time.monotonic()
+        self._window_count: int = 0
+        self._random = random.Random(seed)
+
+        self._generate(sales_count, operations_count, products_count, chats_count, date_start, date_finish)
+
+        self.routes: Dict[Tuple[str, str], Callable[[dict], Tuple[int, dict]]] = {
+            ('POST', 'apilogin'): self._login,
+            ('POST', 'seller-sells/v2'): self._sales,
+            ('POST', 'agent-sales/v2'): self._sales,
+            ('GET', 'seller-last-sales'): self._last_sales,
+            ('GET', 'sellers/account/receipts'): self._operations,
+            ('GET', 'sellers/account/balance/info'): self._balance,
+            ('GET', 'shop/products'): self._products,
+            ('GET', 'categories'): self._categories,
+            ('GET', 'debates/v2/chats'): self._chats,
+            ('GET', 'debates/v2/chat-state'): self._chat_state,
+            ('POST', 'debates/v2/chat-state'): self._change_chat_state,
+        }
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """
+        Базовый URL для `Digiseller(base_url=...)`
+        """
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}/api/'
+
+    def start(self) -> 'FakeDigisellerServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='fake-digiseller', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> 'FakeDigisellerServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _generate(self,
+                  sales_count: int,
+                  operations_count: int,
+                  products_count: int,
+                  chats_count: int,
+                  date_start: datetime,
+                  date_finish: datetime) -> None:
+        rnd = self._random
+        span = (date_finish - date_start).total_seconds()
+
+        def random_date() -> datetime:
+            return date_start + timedelta(seconds=int(rnd.random() * span))
+
+        self.categories: List[dict] = [
+            {'id': 100 + i, 'name': f'Категория {i}', 'products_count': 0,
+             'sub': [{'id': 1000 + i * 10 + j, 'name': f'Подкатегория {i}.{j}', 'products_count': 0} for j in range(3)]}
+            for i in range(5)
+        ]
+        leaf_ids = [sub['id'] for category in self.categories for sub in category['sub']]
+
+        self.products: List[dict] = []
+        for i in range(products_count):
+            price = round(rnd.uniform(50, 5000), 2)
+            self.products.append({
+                'id': 3000000 + i, 'name': f'Товар {i}', 'price': price, 'currency': 'RUR',
+                'base_price': price, 'base_currency': 'RUR', 'cnt_sell': rnd.randint(0, 1000),
+                'in_stock': 1, 'category_id': rnd.choice(leaf_ids),
+            })
+        for category in self.categories:
+            for sub in category['sub']:
+                sub['products_count'] = sum(1 for p in self.products if p['category_id'] == sub['id'])
+
+        self.sales: List[dict] = []
+        for i in range(sales_count):
+            product = rnd.choice(self.products) if self.products else {'id': 0, 'name': '', 'price': 100.0}
+            returned = rnd.random() < 0.03
+            date_pay = random_date()
+            self.sales.append({
+                'invoice_id': 100000000 + i, 'product_id': product['id'], 'product_name': product['name'],
+                'product_entry': '', 'date_pay': date_pay.strftime('%Y-%m-%d %H:%M:%S'),
+                'email': f'buyer{i}@example.com', 'amount_in': product['price'],
+                'amount_out': round(product['price'] * 0.95, 2), 'amount_currency': 'RUB',
+                'method_pay': 'BankCard', 'ip': '127.0.0.1', 'partner_id': 0, 'lang': 'ru-RU',
+                'date_return': (date_pay + timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S') if returned else None,
+            })
+        self.sales.sort(key=lambda sale: sale['date_pay'])
+        self._sales_dates: List[datetime] = [parse_date(sale['date_pay']) for sale in self.sales]
+
+        self.operations: List[dict] = [
+            {'id': 5000000 + i, 'date': random_date().strftime('%Y-%m-%dT%H:%M:%S'),
+             'amount': round(rnd.uniform(10, 5000), 2), 'currency': 'WMR', 'type': 'product_sales',
+             'invoice_id': 100000000 + i, 'description': f'Продажа {i}'}
+            for i in range(operations_count)
+        ]
+        self.operations.sort(key=lambda operation: operation['date'])
+        self._operations_dates: List[datetime] = [parse_date(operation['date']) for operation in self.operations]
+
+        self.chats: List[dict] = [
+            {'id_i': 200000000 + i, 'email': f'buyer{i}@example.com', 'product': f'Товар {i % max(products_count, 1)}',
+             'last_date': random_date().strftime('%Y-%m-%dT%H:%M:%S'), 'cnt_msg': rnd.randint(1, 30),
+             'cnt_new': rnd.randint(0, 3) if rnd.random() < 0.2 else 0}
+            for i in range(chats_count)
+        ]
+        self.chat_states: Dict[int, int] = {chat['id_i']: 1 for chat in self.chats}
+
+    @staticmethod
+    def _page(items: List[dict], page: int, size: int) -> Tuple[List[dict], int]:
+        size = max(size, 1)
+        pages = max((len(items) + size - 1) // size, 1)
+        return items[(page - 1) * size:page * size], pages
+
+    @staticmethod
+    def _in_window(items: List[dict], dates: List[datetime], start, finish) -> List[dict]:
+        """
+        Записи, отсортированные по дате, в интервале [start, finish]
+        """
+        start, finish = parse_date(start), parse_date(finish)
+        lo = bisect.bisect_left(dates, start) if start else 0
+        hi = bisect.bisect_right(dates, finish) if finish else len(items)
+        return items[lo:hi]
+
+    def _login(self, data: dict) -> Tuple[int, dict]:
+        if not data.get('seller_id') or not data.get('sign'):
+            return 400, {'retval': 1, 'desc': 'Bad request'}
+        return 200, {'retval': 0, 'token': f'token-{data["seller_id"]}-{data["timestamp"]}', 'valid_thru': ''}
+
+    def _sales(self, data: dict) -> Tuple[int, dict]:
+        sales = self._in_window(self.sales, self._sales_dates, data.get('date_start'), data.get('date_finish'))
+        if data.get('product_ids'):
+            product_ids = set(data['product_ids'])
+            sales = [sale for sale in sales if sale['product_id'] in product_ids]
+        returned = int(data.get('returned') or 0)
+        if returned == 1:
+            sales = [sale for sale in sales if not sale['date_return']]
+        elif returned == 2:
+            sales = [sale for sale in sales if sale['date_return']]
+        rows, pages = self._page(sales, int(data.get('page') or 1), int(data.get('rows') or 10))
+        return 200, {'retval': 0, 'retdesc': None, 'page': int(data.get('page') or 1), 'pages': pages,
+                     'total': len(sales), 'rows': rows}
+
+    def _last_sales(self, data: dict) -> Tuple[int, dict]:
+        top = int(data.get('top') or 1000)
+        sales = [
+            {'invoice_id': sale['invoice_id'], 'date': sale['date_pay'],
+             'product': {'id': sale['product_id'], 'name': sale['product_name'],
+                         'price_rub': sale['amount_in'], 'invoice_id': sale['invoice_id']}}
+            for sale in reversed(self.sales[-top:])
+        ]
+        return 200, {'retval': 0, 'sales': sales}
+
+    def _operations(self, data: dict) -> Tuple[int, dict]:
+        operations = self._in_window(self.operations, self._operations_dates, data.get('start'), data.get('finish'))
+        items, pages = self._page(operations, int(data.get('page') or 1), int(data.get('count') or 10))
+        return 200, {'retval': 0, 'content': {'page': int(data.get('page') or 1), 'total_pages': pages,
+                                              'total_count': len(operations), 'items': items}}
+
+    def _balance(self, data: dict) -> Tuple[int, dict]:
+        return 200, {'retval': 0, 'content': {'WMR': 1000.0, 'WMZ': 10.0}}
+
+    def _products(self, data: dict) -> Tuple[int, dict]:
+        category_id = int(data.get('category_id') or 0)
+        products = self.products
+        if category_id:
+            products = [product for product in products if product['category_id'] == category_id]
+        items, pages = self._page(products, int(data.get('page') or 1), int(data.get('rows') or 20))
+        return 200, {'retval': 0, 'totalPages': pages, 'totalItems': len(products), 'product': items}
+
+    def _categories(self, data: dict) -> Tuple[int, dict]:
+        return 200, {'retval': 0, 'category': self.categories}
+
+    def _chats(self, data: dict) -> Tuple[int, dict]:
+        chats = self.chats
+        if str(data.get('filter_new')) == '1':
+            chats = [chat for chat in chats if chat['cnt_new']]
+        chats = sorted(chats, key=lambda chat: chat['last_date'], reverse=True)
+        items, pages = self._page(chats, int(data.get('page') or 1), int(data.get('pagesize') or 20))
+        return 200, {'retval': 0, 'pages': pages, 'cnt': len(chats), 'chats': items}
+
+    def _chat_state(self, data: dict) -> Tuple[int, dict]:
+        order_id = int(data.get('id_i') or 0)
+        if order_id not in self.chat_states:
+            return 404, {'retval': 1, 'desc': 'Not found'}
+        return 200, {'chat_state': self.chat_states[order_id], 'may_change': 1}
+
+    def _change_chat_state(self, data: dict) -> Tuple[int, dict]:
+        order_id = int(data.get('id_i') or 0)
+        if order_id not in self.chat_states:
+            return 404, {'retval': 1, 'desc': 'Not found'}
+        self.chat_states[order_id] = int(data.get('chat_state') or 0)
+        return 200, {'retval': 0}
+
+    def _throttled(self) -> bool:
+        if self.rate_limit is None:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= 1:
+                self._window_start, self._window_count = now, 0
+            self._window_count += 1
+            return self._window_count > self.rate_limit
+
+    def _delay(self) -> None:
+        latency = self.latency
+        if isinstance(latency, tuple):
+            latency = self._random.uniform(*latency)
+        if latency:
+            time.sleep(latency)
+
+    def handle(self, method: str, path: str, query: dict, body: bytes) -> Tuple[int, dict, Dict[str, str]]:
+        """
+        Обрабатывает запрос
+
+        :return: (HTTP статус, тело ответа, заголовки)
+        """
+        endpoint = path.split('/api/', 1)[-1].strip('/')
+        with self._lock:
+            self.requests_count[endpoint] = self.requests_count.get(endpoint, 0) + 1
+
+        self._delay()
+        if self._throttled():
+            return 429, {'retval': 1, 'desc': 'Too many requests'}, {'Retry-After': '1'}
+        if self.error_rate and self._random.random() < self.error_rate:
+            return 500, {'retval': 1, 'desc': 'Internal error'}, {}
+
+        route = self.routes.get((method, endpoint))
+        if route is None:
+            return 404, {'retval': 1, 'desc': 'Unknown endpoint'}, {}
+
+        data = dict(query)
+        if method == 'POST' and body:
+            try:
+                data.update(json.loads(body))
+            except ValueError:
+                data.update({k: v[-1] for k, v in parse_qs(body.decode()).items()})
+        if endpoint != 'apilogin' and not data.get('token'):
+            return 401, {'retval': 1, 'desc': 'Token required'}, {}
+        if 'page' in data and int(data['page']) < 1:
+            return 400, {'retval': 1, 'desc': 'Page numbering starts at 1'}, {}
+
+        status, payload = route(data)
+        return status, payload, {}
+
+    def _make_handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def _respond(self) -> None:
+                url = urlsplit(self.path)
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+                status, payload, headers = server.handle(self.command, url.path, query, body)
+                raw = json.dumps(payload, ensure_ascii=False).encode()
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(raw)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(raw)
+
+            do_GET = _respond
+            do_POST = _respond
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
@@ -0,0 +1,95 @@
+import time
+from typing import Callable, Iterable, Optional
+
+import requests
+
+from ..api.general import make_notification_sign
+
+
+class FakeNotifier:
+    """
+    Имитация оповещений Digiseller о продажах: отправляет подписанные оповещения на URL приемника
+    и повторяет их, пока приемник не ответит 200 (как при недоступности сервера продавца)
+    """
+
+    def __init__(self,
+                 url: str,
+                 api_key: str,
+                 retries: int = 3,
+                 retry_delay: float = 0.1,
+                 timeout: float = 5.0,
+                 make_sign: Callable[[str, dict], str] = make_notification_sign) -> None:
+        """
+        :param url: URL приемника оповещений
+        :param api_key: API ключ продавца для подписи
+        :param retries: Количество повторов оповещения при ответе не 200
+        :param retry_delay: Задержка между повторами в секундах
+        :param timeout: Таймаут запроса в секундах
+        :param make_sign: Функция подписи, та же, что передана в `NotificationReceiver`
+        """
+        self.url: str = url
+        self.api_key: str = api_key
+        self.retries: int = retries
+        self.retry_delay: float = retry_delay
+        self.timeout: float = timeout
+        self.make_sign: Callable[[str, dict], str] = make_sign
+        self.session: requests.Session = requests.Session()
+        self.sent_count: int = 0
+
+    def close(self) -> None:
+        self.session.close()
+
+    def make_fields(self,
+                    invoice_id: int,
+                    product_id: int,
+                    amount: float,
+                    currency: str = 'RUB',
+                    date: Optional[str] = None,
+                    email: str = '',
+                    sign: bool = True) -> dict:
+        """
+        Поля оповещения; с `sign=False` подпись будет неверной
+        """
+        fields = {
+            'ID_I': invoice_id,
+            'ID_D': product_id,
+            'Amount': amount,
+            'Currency': currency,
+            'Date': date or time.strftime('%Y-%m-%d %H:%M:%S'),
+            'Email': email,
+        }
+        fields['SHA256'] = self.make_sign(self.api_key, fields) if sign else '0' * 64
+        return fields
+
+    def send(self, fields: dict, duplicates: int = 0) -> int:
+        """
+        Отправляет оповещение (и `duplicates` его копий, как при повторной доставке)
+
+        :return: Статус последнего ответа приемника
+        """
+        status = 0
+        for _ in range(duplicates + 1):
+            for attempt in range(self.retries + 1):
+                status = self.session.post(self.url, data=fields, timeout=self.timeout).status_code
+                self.sent_count += 1
+                if status == 200 or status in (400, 403):
+                    break
+                time.sleep(self.retry_delay)
+        return status
+
+    def send_sales(self, sales: Iterable[dict], duplicates: int = 0) -> int:
+        """
+        Оповещения о продажах в формате строк `seller-sells/v2` (например `FakeDigisellerServer.sales`)
+
+        :return: Количество оповещений, принятых приемником
+        """
+        accepted = 0
+        for sale in sales:
+            fields = self.make_fields(invoice_id=sale['invoice_id'],
+                                      product_id=sale['product_id'],
+                                      amount=sale['amount_in'],
+                                      currency=sale.get('amount_currency', 'RUB'),
+                                      date=sale.get('date_pay'),
+                                      email=sale.get('email', ''))
+            accepted += self.send(fields, duplicates) == 200
+        return accepted
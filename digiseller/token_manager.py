@@ -0,0 +1,150 @@
+import logging
+import threading
+import time
+
+from .api import general
+from .token_store import TokenStore
+
+logger = logging.getLogger(__name__)
+
+
+class TokenManager:
+    """
+    Потокобезопасное хранение и обновление токена авторизации.
+    Одновременные запросы ожидают одно общее обновление, а фоновый таймер
+    обновляет токен заранее, до истечения его времени жизни
+    """
+
+    def __init__(self,
+                 digiseller,
+                 expiration_margin: int = 30,
+                 refresh_ahead: int = 300,
+                 background_refresh: bool = True,
+                 retry_interval: int = 30,
+                 token_store: TokenStore | None = None) -> None:
+        """
+        :param digiseller: Экземпляр класса `Digiseller`
+        :param expiration_margin: За сколько секунд до истечения токен считается недействительным
+        :param refresh_ahead: За сколько секунд до истечения токен обновляется в фоне
+        :param background_refresh: Обновлять токен в фоне
+        :param retry_interval: Через сколько секунд повторить неудачное фоновое обновление
+        :param token_store: Хранилище токенов, общее с другими экземплярами и процессами
+        """
+        self.digiseller = digiseller
+        self.expiration_margin: int = expiration_margin
+        self.refresh_ahead: int = refresh_ahead
+        self.background_refresh: bool = background_refresh
+        self.retry_interval: int = retry_interval
+        self.token_store: TokenStore | None = token_store
+
+        self._state: tuple[str | None, int] = (None, 0)  # (токен, время истечения) меняются одновременно
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._closed: bool = False
+
+    @property
+    def token(self) -> str | None:
+        return self._state[0]
+
+    @property
+    def token_expiration(self) -> int:
+        return self._state[1]
+
+    def _is_valid(self, state: tuple[str | None, int] | None, margin: int | None = None) -> bool:
+        if state is None:
+            return False
+        token, token_expiration = state
+        if margin is None:
+            margin = self.expiration_margin
+        return token is not None and int(time.time()) < token_expiration - margin
+
+    def get_token(self) -> str:
+        """
+        Возвращает действующий токен, при необходимости получая новый.
+        Если токен уже обновляется в другом потоке, ожидает результат этого обновления
+        """
+        state = self._state
+        if self._is_valid(state):
+            return state[0]
+
+        with self._lock:
+            state = self._state
+            if not self._is_valid(state):
+                state = self._refresh()
+            return state[0]
+
+    def set_token(self, token: str, token_expiration: int) -> None:
+        """
+        Устанавливает полученный извне токен и планирует его фоновое обновление
+        """
+        with self._lock:
+            self._state = (token, token_expiration)
+            self._schedule_refresh()
+
+    def invalidate(self) -> None:
+        """
+        Сбрасывает токен; следующий запрос получит новый
+        """
+        with self._lock:
+            self._state = (None, 0)
+
+    def close(self) -> None:
+        """
+        Останавливает фоновое обновление токена
+        """
+        self._closed = True
+        if self._timer is not None:
+            self._timer.cancel()
+
+    def _refresh(self, margin: int | None = None, background: bool = False) -> tuple[str, int]:
+        """
+        Получает новый токен. Вызывается только под блокировкой.
+        Если задано хранилище, сначала берется токен из него, действующий ещё минимум `margin` секунд
+
+        :param margin: Минимальный оставшийся срок действия токена из хранилища в секундах
+        :param background: Обновление запущено фоновым таймером
+        """
+        source = 'login'
+        if self.token_store is None:
+            state = general.get_and_set_token(self.digiseller)
+        else:
+            seller_id = self.digiseller.seller_id
+            with self.token_store.lock(seller_id):
+                state = self.token_store.load(seller_id)
+                if self._is_valid(state, margin):
+                    source = 'store'
+                else:
+                    state = general.get_and_set_token(self.digiseller)
+                    self.token_store.save(seller_id, *state)
+
+        logger.debug('Токен обновлен (%s, %s)', source, 'в фоне' if background else 'по запросу')
+        if self.digiseller.instrumentation is not None:
+            self.digiseller.instrumentation.record_token_refresh(source, background)
+
+        self._state = state
+        self._schedule_refresh()
+        return state
+
+    def _schedule_refresh(self, delay: float | None = None) -> None:
+        if not self.background_refresh or self._closed:
+            return
+
+        if delay is None:
+            delay = max(self.token_expiration - self.refresh_ahead - time.time(), 0)
+
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._refresh_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                self._refresh(margin=self.refresh_ahead, background=True)
+            except Exception:
+                # Текущий токен ещё действует, пробуем позже; при истечении его обновит первый запрос
+                logger.exception('Не удалось обновить токен в фоне')
+                self._schedule_refresh(self.retry_interval)
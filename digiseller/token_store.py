@@ -0,0 +1,115 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+StoredToken = Tuple[str, int]
+
+
+class TokenStore:
+    """
+    Базовый класс хранилища токенов, общих для нескольких экземпляров `Digiseller`.
+    Токены хранятся по `seller_id` вместе со временем истечения
+    """
+
+    def load(self, seller_id: int) -> Optional[StoredToken]:
+        """
+        Возвращает сохраненные (токен, время истечения) или None
+        """
+        raise NotImplementedError
+
+    def save(self, seller_id: int, token: str, token_expiration: int) -> None:
+        """
+        Сохраняет токен продавца
+        """
+        raise NotImplementedError
+
+    @contextmanager
+    def lock(self, seller_id: int) -> Iterator[None]:
+        """
+        Блокировка на время проверки и получения токена, чтобы логинился только один владелец хранилища
+        """
+        yield
+
+
+class MemoryTokenStore(TokenStore):
+    """
+    Хранилище токенов в памяти процесса, общее для всех экземпляров, которым оно передано
+    """
+
+    def __init__(self) -> None:
+        self._tokens: dict[int, StoredToken] = {}
+        self._lock = threading.Lock()
+
+    def load(self, seller_id: int) -> Optional[StoredToken]:
+        return self._tokens.get(seller_id)
+
+    def save(self, seller_id: int, token: str, token_expiration: int) -> None:
+        self._tokens[seller_id] = (token, token_expiration)
+
+    @contextmanager
+    def lock(self, seller_id: int) -> Iterator[None]:
+        with self._lock:
+            yield
+
+
+class FileTokenStore(TokenStore):
+    """
+    Хранилище токенов в JSON файле, общее для нескольких процессов (воркеры, cron задачи).
+    Доступ между процессами синхронизируется блокировкой файла `<path>.lock`
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: Путь к файлу с токенами. Файл создается с правами 0600
+        """
+        self.path: str = path
+        self.lock_path: str = path + '.lock'
+        self._thread_lock = threading.Lock()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def load(self, seller_id: int) -> Optional[StoredToken]:
+        entry = self._read().get(str(seller_id))
+        if not entry:
+            return None
+        return entry['token'], entry['expiration']
+
+    def save(self, seller_id: int, token: str, token_expiration: int) -> None:
+        tokens = self._read()
+        tokens[str(seller_id)] = {'token': token, 'expiration': token_expiration}
+
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(tokens, f)
+        os.replace(tmp_path, self.path)
+
+    @contextmanager
+    def lock(self, seller_id: int) -> Iterator[None]:
+        with self._thread_lock:
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+                os.close(fd)
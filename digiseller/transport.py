@@ -0,0 +1,281 @@
+import os
+import socket
+import ssl
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, select_proxy
+from urllib3.connection import HTTPConnection
+
+DEFAULT_HEADERS = {'Content-Type': 'application/json; charset=UTF-8', 'Accept': 'application/json'}
+
+
+def _brotli_available() -> bool:
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+        except ImportError:
+            return False
+    return True
+
+
+class TransportConfig:
+    """
+    Настройки HTTP транспорта синхронного клиента: размер пула соединений, таймауты,
+    keep-alive, сжатие ответов и необязательный HTTP/2 (через httpx).
+    Применяются только к `Digiseller`: `AsyncDigiseller` их не принимает, его пул и keep-alive
+    задаются параметрами `connections_limit` и `keepalive_timeout`
+    """
+
+    def __init__(self,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 32,
+                 pool_block: bool = False,
+                 connect_timeout: float | None = 10.0,
+                 read_timeout: float | None = 60.0,
+                 keep_alive: bool = True,
+                 tcp_keepalive_idle: int | None = None,
+                 compression: bool = True,
+                 http2: bool = False,
+                 max_retries: int = 0) -> None:
+        """
+        :param pool_connections: Количество пулов соединений (по одному на хост)
+        :param pool_maxsize: Максимальное количество соединений в пуле; должно быть не меньше числа рабочих потоков
+        :param pool_block: Ожидать свободное соединение вместо открытия временного сверх `pool_maxsize`
+        :param connect_timeout: Таймаут установки соединения в секундах (None - без ограничения)
+        :param read_timeout: Таймаут ожидания данных ответа в секундах (None - без ограничения)
+        :param keep_alive: Переиспользовать соединения между запросами
+        :param tcp_keepalive_idle: Включить TCP keepalive с проверкой соединения после стольких секунд простоя
+        :param compression: Запрашивать сжатые ответы (gzip, deflate и br, если установлен brotli)
+        :param http2: Использовать HTTP/2 через httpx (`pip install digiseller[http2]`)
+        :param max_retries: Повторы urllib3 при ошибках соединения (повторы по статусам - `RetryPolicy`)
+        """
+        self.pool_connections: int = pool_connections
+        self.pool_maxsize: int = pool_maxsize
+        self.pool_block: bool = pool_block
+        self.connect_timeout: float | None = connect_timeout
+        self.read_timeout: float | None = read_timeout
+        self.keep_alive: bool = keep_alive
+        self.tcp_keepalive_idle: int | None = tcp_keepalive_idle
+        self.compression: bool = compression
+        self.http2: bool = http2
+        self.max_retries: int = max_retries
+
+    @property
+    def timeout(self) -> Tuple[float | None, float | None]:
+        """
+        Таймаут в формате `requests`: (connect, read)
+        """
+        return self.connect_timeout, self.read_timeout
+
+    @property
+    def accept_encoding(self) -> str:
+        if not self.compression:
+            return 'identity'
+        return 'gzip, deflate, br' if _brotli_available() else 'gzip, deflate'
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = dict(DEFAULT_HEADERS, **{'Accept-Encoding': self.accept_encoding})
+        if not self.keep_alive and not self.http2:
+            # В HTTP/2 заголовок Connection запрещен, там keep-alive отключается размером пула
+            headers['Connection'] = 'close'
+        return headers
+
+    def socket_options(self) -> List[tuple]:
+        options = list(HTTPConnection.default_socket_options)
+        if self.tcp_keepalive_idle is not None:
+            options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+            # TCP_KEEPIDLE есть в Linux, TCP_KEEPALIVE - его аналог в macOS
+            idle_option = getattr(socket, 'TCP_KEEPIDLE', None) or getattr(socket, 'TCP_KEEPALIVE', None)
+            if idle_option is not None:
+                options.append((socket.IPPROTO_TCP, idle_option, self.tcp_keepalive_idle))
+            if hasattr(socket, 'TCP_KEEPINTVL'):
+                options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, max(self.tcp_keepalive_idle // 3, 1)))
+        return options
+
+
+class PoolAdapter(HTTPAdapter):
+    """
+    `HTTPAdapter` с настройками пула и сокетов из `TransportConfig`
+    """
+
+    def __init__(self, config: TransportConfig) -> None:
+        self.transport_config: TransportConfig = config  # `config` уже занят в HTTPAdapter
+        super().__init__(pool_connections=config.pool_connections,
+                         pool_maxsize=config.pool_maxsize,
+                         max_retries=config.max_retries,
+                         pool_block=config.pool_block)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        kwargs['socket_options'] = self.transport_config.socket_options()
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _ssl_context(verify: bool | str, cert: str | Tuple[str, str] | None) -> ssl.SSLContext:
+    """
+    SSL контекст по параметрам `verify` и `cert` в формате `requests`
+    """
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif isinstance(verify, str):
+        if os.path.isdir(verify):
+            context = ssl.create_default_context(capath=verify)
+        else:
+            context = ssl.create_default_context(cafile=verify)
+    else:
+        import certifi  # Зависимость requests; те же корневые сертификаты, что и без HTTP/2
+        context = ssl.create_default_context(cafile=certifi.where())
+
+    if cert is not None:
+        if isinstance(cert, tuple):
+            context.load_cert_chain(*cert)
+        else:
+            context.load_cert_chain(cert)
+    return context
+
+
+class _HttpxRaw:
+    """
+    Минимальная замена `urllib3.HTTPResponse` для потокового чтения ответа httpx через `requests.Response`
+    """
+
+    def __init__(self, response) -> None:
+        self._response = response
+
+    def stream(self, chunk_size: int | None = None, decode_content: bool = True):
+        yield from self._response.iter_bytes(chunk_size)
+
+    def read(self, amt: int | None = None, decode_content: bool = True) -> bytes:
+        return self._response.read()
+
+    def close(self) -> None:
+        self._response.close()
+
+    def release_conn(self) -> None:
+        self._response.close()
+
+
+class HttpxAdapter(BaseAdapter):
+    """
+    Адаптер `requests`, отправляющий запросы через `httpx.Client` с поддержкой HTTP/2.
+    Ошибки httpx приводятся к исключениям `requests`, поэтому `RetryPolicy` работает без изменений
+    """
+
+    def __init__(self, config: TransportConfig) -> None:
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError('Для HTTP/2 нужен httpx: pip install digiseller[http2]') from None
+
+        super().__init__()
+        self.config: TransportConfig = config
+        self._httpx = httpx
+        self._clients: Dict[tuple, object] = {}  # Клиенты httpx для нестандартных verify/cert/proxy
+        self._clients_lock = threading.Lock()
+        self.client = self._make_client()
+
+    def _make_client(self, verify=True, cert=None, proxy: Optional[str] = None):
+        httpx = self._httpx
+        config = self.config
+        limits = httpx.Limits(max_connections=config.pool_maxsize,
+                              max_keepalive_connections=config.pool_maxsize if config.keep_alive else 0)
+        if verify is not True or cert is not None:
+            verify = _ssl_context(verify, cert)
+        # Прокси из окружения уже учтены requests в `proxies`, поэтому trust_env=False
+        transport = httpx.HTTPTransport(verify=verify,
+                                        http2=config.http2,
+                                        limits=limits,
+                                        proxy=proxy,
+                                        trust_env=False,
+                                        retries=config.max_retries,
+                                        socket_options=config.socket_options())
+        return httpx.Client(transport=transport, trust_env=False)
+
+    def _client_for(self, request: requests.PreparedRequest, verify, cert, proxies):
+        """
+        Клиент httpx с параметрами `verify`, `cert` и прокси запроса: в httpx они задаются для клиента,
+        а не для отдельного запроса
+        """
+        proxy = select_proxy(request.url, proxies) if proxies else None
+        if isinstance(cert, list):
+            cert = tuple(cert)
+        if verify is True and cert is None and proxy is None:
+            return self.client
+
+        key = (verify, cert, proxy)
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = self._make_client(verify, cert, proxy)
+            return client
+
+    def _timeout(self, timeout):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+        else:
+            connect = read = timeout
+        return self._httpx.Timeout(read, connect=connect, pool=connect)
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout=None, verify=True,
+             cert=None, proxies=None) -> requests.Response:
+        httpx = self._httpx
+        client = self._client_for(request, verify, cert, proxies)
+        httpx_request = client.build_request(method=request.method,
+                                             url=request.url,
+                                             headers=dict(request.headers),
+                                             content=request.body,
+                                             timeout=self._timeout(timeout))
+        try:
+            httpx_response = client.send(httpx_request, stream=stream)
+        except httpx.ConnectTimeout as e:
+            raise requests.ConnectTimeout(e, request=request) from e
+        except httpx.TimeoutException as e:
+            raise requests.ReadTimeout(e, request=request) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request) from e
+
+        resp = requests.Response()
+        resp.status_code = httpx_response.status_code
+        resp.reason = httpx_response.reason_phrase
+        # httpx уже распаковал тело, поэтому заголовок сжатия убираем
+        resp.headers = CaseInsensitiveDict(
+            (k, v) for k, v in httpx_response.headers.items() if k.lower() != 'content-encoding'
+        )
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.url = request.url
+        resp.request = request
+        resp.connection = self
+        resp.raw = _HttpxRaw(httpx_response)
+        if not stream:
+            resp._content = httpx_response.read()
+            httpx_response.close()
+        return resp
+
+    def close(self) -> None:
+        self.client.close()
+        with self._clients_lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+
+def build_session(config: Optional[TransportConfig] = None) -> requests.Session:
+    """
+    Создает `requests.Session` с адаптером и заголовками по `TransportConfig`
+    """
+    config = config or TransportConfig()
+    session = requests.Session()
+    adapter = HttpxAdapter(config) if config.http2 else PoolAdapter(config)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(config.headers)
+    return session
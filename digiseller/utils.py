@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Optional
+
+DATE_FORMATS = ('%d.%m.%Y %H:%M:%S', '%d.%m.%Y %H:%M', '%d.%m.%Y')
+
+
+def parse_date(value) -> Optional[datetime]:
+    """
+    Разбирает дату из ответа API (ISO 8601 или `дд.мм.гггг чч:мм:сс`)
+
+    :param value: Строка с датой, datetime или None
+    :return: datetime или None, если значение пустое или не распознано
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        pass
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except (ValueError, TypeError):
+            continue
+    return None
@@ -16,6 +16,12 @@ setup(
     long_description_content_type='text/markdown',
     url='https://github.com/onyx256/digiseller',
     install_requires=['requests>=2.32.3'],
+    extras_require={
+        'aio': ['aiohttp>=3.9'],
+        'columnar': ['numpy>=1.24'],
+        'http2': ['httpx[http2]>=0.27'],
+        'parquet': ['pyarrow>=14'],
+    },
     classifiers=[
         'Programming Language :: Python :: 3.11',
         'License :: OSI Approved :: MIT License',
@@ -0,0 +1,112 @@
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from digiseller.batching import SalesBatcher
+
+
+class FakeStatistics:
+    def __init__(self, sales=(), error=None):
+        self.sales = list(sales)
+        self.error = error
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def iter_sales(self, product_ids, date_start, date_finish, returned, rows, result_mode):
+        with self._lock:
+            self.calls.append({'product_ids': product_ids, 'date_start': date_start,
+                               'date_finish': date_finish, 'returned': returned})
+        if self.error is not None:
+            raise self.error
+        return [sale for sale in self.sales if sale.product_id in product_ids]
+
+
+def make_batcher(statistics, **kwargs):
+    return SalesBatcher(SimpleNamespace(statistics=statistics), **kwargs)
+
+
+def sale(invoice_id, product_id):
+    return SimpleNamespace(invoice_id=invoice_id, product_id=product_id)
+
+
+def test_requests_within_window_share_one_call():
+    statistics = FakeStatistics([sale(1, 10), sale(2, 20), sale(3, 10)])
+    with make_batcher(statistics, window=0.05) as batcher:
+        first = batcher.submit(10)
+        second = batcher.submit(20)
+        assert not first.done()
+
+        assert [s.invoice_id for s in first.result(timeout=5)] == [1, 3]
+        assert [s.invoice_id for s in second.result(timeout=5)] == [2]
+
+    assert len(statistics.calls) == 1
+    assert statistics.calls[0]['product_ids'] == [10, 20]
+
+
+def test_full_batch_is_sent_without_waiting_for_window():
+    statistics = FakeStatistics([sale(i, i) for i in range(3)])
+    with make_batcher(statistics, window=60, max_batch=3) as batcher:
+        started = time.monotonic()
+        futures = [batcher.submit(i) for i in range(3)]
+        for i, future in enumerate(futures):
+            assert [s.invoice_id for s in future.result(timeout=5)] == [i]
+        assert time.monotonic() - started < 5
+
+        assert len(statistics.calls) == 1
+
+
+def test_same_product_waiters_get_separate_lists():
+    statistics = FakeStatistics([sale(1, 10), sale(2, 30)])
+    with make_batcher(statistics, window=0.01) as batcher:
+        first, second, other = batcher.submit(10), batcher.submit(10), batcher.submit(20)
+        first_sales, second_sales = first.result(timeout=5), second.result(timeout=5)
+
+    assert [s.invoice_id for s in first_sales] == [s.invoice_id for s in second_sales] == [1]
+    assert first_sales is not second_sales
+    assert other.result() == []
+    assert statistics.calls[0]['product_ids'] == [10, 20]
+
+
+def test_different_periods_are_not_mixed():
+    statistics = FakeStatistics()
+    with make_batcher(statistics, window=0.01) as batcher:
+        batcher.submit(10, returned=0)
+        batcher.submit(10, returned=2)
+        batcher.submit(10, date_start=datetime(2023, 1, 1))
+
+    assert len(statistics.calls) == 3
+
+
+def test_date_finish_is_compared_to_the_second():
+    statistics = FakeStatistics()
+    with make_batcher(statistics, window=60) as batcher:
+        batcher.submit(10, date_finish=datetime(2024, 1, 1, 12, 0, 0, 1000))
+        batcher.submit(20, date_finish=datetime(2024, 1, 1, 12, 0, 0, 900000))
+
+    assert len(statistics.calls) == 1
+    assert statistics.calls[0]['date_finish'] == datetime(2024, 1, 1, 12, 0, 0)
+
+
+def test_error_is_set_on_every_future():
+    error = ConnectionError('boom')
+    statistics = FakeStatistics(error=error)
+    with make_batcher(statistics, window=0.01) as batcher:
+        futures = [batcher.submit(10), batcher.submit(10), batcher.submit(20)]
+        for future in futures:
+            assert future.exception(timeout=5) is error
+
+
+def test_submit_after_close_raises():
+    statistics = FakeStatistics([sale(1, 10)])
+    batcher = make_batcher(statistics, window=60)
+    future = batcher.submit(10)
+    batcher.close()
+
+    assert future.done()
+    assert len(statistics.calls) == 1
+    with pytest.raises(RuntimeError):
+        batcher.submit(10)
+    batcher.close()
@@ -0,0 +1,107 @@
+import time
+
+import pytest
+
+from digiseller import Digiseller, ResponseCache
+from digiseller import cache as cache_module
+from digiseller.cache import make_key
+from digiseller.testing import FakeDigisellerServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, 'time', clock)
+    return clock
+
+
+def key(category_id):
+    return make_key('shop/products', {'category_id': category_id})
+
+
+def test_make_key_ignores_token_and_none():
+    assert make_key('categories', {'lang': 'ru-RU', 'token': 'a', 'category_id': None}) == \
+        make_key('categories', {'token': 'b', 'lang': 'ru-RU'})
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = ResponseCache(ttl={'shop/products': 10})
+    cache.set(key(1), 'products')
+
+    clock.advance(9.9)
+    assert cache.get(key(1)) == ('products', False)
+
+    clock.advance(0.1)
+    assert cache.get(key(1)) is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ResponseCache(ttl={'shop/products': 10}, max_size=2)
+    cache.set(key(1), 'first')
+    cache.set(key(2), 'second')
+    cache.get(key(1))
+    cache.set(key(3), 'third')
+
+    assert cache.get(key(2)) is None
+    assert cache.get(key(1)) == ('first', False)
+    assert cache.get(key(3)) == ('third', False)
+
+
+def test_stale_entry_is_served_while_revalidating(clock):
+    cache = ResponseCache(ttl={'shop/products': 10}, stale_while_revalidate=5)
+    cache.set(key(1), 'products')
+
+    clock.advance(12)
+    assert cache.get(key(1)) == ('products', True)
+    assert cache.begin_revalidate(key(1))
+    assert not cache.begin_revalidate(key(1))
+    cache.end_revalidate(key(1))
+
+    clock.advance(3)
+    assert cache.get(key(1)) is None
+
+
+def test_invalidate_by_endpoint_and_params(clock):
+    cache = ResponseCache()
+    cache.set(key(1), 'first')
+    cache.set(key(2), 'second')
+    cache.set(make_key('categories', {}), 'categories')
+
+    assert cache.invalidate('shop/products', category_id=1) == 1
+    assert cache.get(key(2)) is not None
+    assert cache.invalidate('shop/products') == 1
+    assert cache.invalidate() == 1
+
+
+def test_make_request_revalidates_stale_response_in_background(clock):
+    with FakeDigisellerServer() as server:
+        cache = ResponseCache(ttl={'sellers/account/balance/info': 10}, stale_while_revalidate=30)
+        digi = Digiseller(1, 'key', base_url=server.url, background_token_refresh=False, cache=cache)
+        try:
+            first = digi.make_request('get', 'sellers/account/balance/info')
+            assert digi.make_request('get', 'sellers/account/balance/info') is first
+            assert server.requests_count['sellers/account/balance/info'] == 1
+
+            clock.advance(15)
+            assert digi.make_request('get', 'sellers/account/balance/info') is first
+
+            deadline = time.monotonic() + 5
+            while cache.get(make_key('sellers/account/balance/info', {}))[0] is first:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            assert server.requests_count['sellers/account/balance/info'] == 2
+            assert digi.make_request('get', 'sellers/account/balance/info') is not first
+        finally:
+            digi.close()
@@ -0,0 +1,27 @@
+from digiseller import Digiseller
+from digiseller.testing import FakeDigisellerServer
+
+
+def test_category_snapshot_is_reused_only_for_same_parameters(tmp_path):
+    snapshot_path = str(tmp_path / 'categories.json')
+    with FakeDigisellerServer() as server:
+        digi = Digiseller(1, 'key', base_url=server.url, background_token_refresh=False)
+        try:
+            def fetches() -> int:
+                return server.requests_count.get('categories', 0)
+
+            index = digi.products.get_category_index(snapshot_path=snapshot_path)
+            assert fetches() == 1
+            assert digi.products.get_category_index(seller_id=1, snapshot_path=snapshot_path).to_dict() == index.to_dict()
+            assert fetches() == 1
+
+            digi.products.get_category_index(lang='en-US', snapshot_path=snapshot_path)
+            assert fetches() == 2
+            digi.products.get_category_index(lang='en-US', snapshot_path=snapshot_path)
+            assert fetches() == 2
+
+            digi.products.get_category_index(seller_id=2, lang='en-US', snapshot_path=snapshot_path)
+            digi.products.get_category_index(category_id=5, seller_id=2, lang='en-US', snapshot_path=snapshot_path)
+            assert fetches() == 4
+        finally:
+            digi.close()
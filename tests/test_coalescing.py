@@ -0,0 +1,107 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from digiseller import Digiseller
+from digiseller.coalescing import SingleFlight
+from digiseller.testing import FakeDigisellerServer
+
+CALLERS = 8
+
+
+def wait_for_waiters(single_flight, key, count):
+    deadline = time.monotonic() + 5
+    while single_flight._calls[key].waiters < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def run_concurrently(single_flight, fn):
+    with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+        futures = [executor.submit(single_flight.do, 'key', fn) for _ in range(CALLERS)]
+        return [future.exception() or future.result() for future in futures]
+
+
+def test_concurrent_calls_share_one_result():
+    single_flight = SingleFlight()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        wait_for_waiters(single_flight, 'key', CALLERS - 1)
+        return object()
+
+    results = run_concurrently(single_flight, fn)
+
+    assert len(calls) == 1
+    assert len({id(result) for result, _ in results}) == 1
+    assert sorted(shared for _, shared in results) == [False] + [True] * (CALLERS - 1)
+    assert len(single_flight) == 0
+
+
+def test_error_is_raised_in_every_waiter():
+    single_flight = SingleFlight()
+    error = ConnectionError('boom')
+
+    def fn():
+        wait_for_waiters(single_flight, 'key', CALLERS - 1)
+        raise error
+
+    assert run_concurrently(single_flight, fn) == [error] * CALLERS
+    assert len(single_flight) == 0
+
+    # После ошибки ключ свободен: следующий вызов выполняется заново
+    assert single_flight.do('key', lambda: 1) == (1, False)
+
+
+def test_make_request_coalescing_is_opt_in():
+    with FakeDigisellerServer(latency=0.2) as server:
+        plain = Digiseller(1, 'key', base_url=server.url, background_token_refresh=False)
+        coalescing = Digiseller(1, 'key', base_url=server.url, background_token_refresh=False,
+                                coalesce_requests=True)
+        try:
+            assert plain.single_flight is None
+            plain.token_manager.get_token()
+            coalescing.token_manager.get_token()
+
+            barrier = threading.Barrier(CALLERS)
+
+            def request(digi):
+                barrier.wait()
+                return digi.make_request('get', 'sellers/account/balance/info')
+
+            with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+                responses = list(executor.map(request, [coalescing] * CALLERS))
+            assert server.requests_count['sellers/account/balance/info'] == 1
+            assert len({id(resp) for resp in responses}) == 1
+
+            with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+                list(executor.map(request, [plain] * CALLERS))
+            assert server.requests_count['sellers/account/balance/info'] == 1 + CALLERS
+        finally:
+            plain.close()
+            coalescing.close()
+
+
+def test_make_request_waiters_share_http_errors():
+    with FakeDigisellerServer(latency=0.2) as server:
+        digi = Digiseller(1, 'key', base_url=server.url, background_token_refresh=False, coalesce_requests=True)
+        try:
+            barrier = threading.Barrier(CALLERS)
+
+            def request():
+                barrier.wait()
+                return digi.make_request('get', 'unknown/endpoint')
+
+            with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+                futures = [executor.submit(request) for _ in range(CALLERS)]
+                for future in futures:
+                    with pytest.raises(requests.HTTPError) as info:
+                        future.result()
+                    assert info.value.response.status_code == 404
+            assert server.requests_count['unknown/endpoint'] == 1
+        finally:
+            digi.close()
@@ -0,0 +1,42 @@
+import pytest
+
+from digiseller.columnar import SalesColumns
+
+np = pytest.importorskip('numpy')
+
+
+def make_rows(start: int, count: int) -> list:
+    return [
+        {'invoice_id': i, 'product_id': i % 3, 'amount_in': 10.0, 'amount_out': 9.0,
+         'date_pay': '2024-03-01 12:00:00', 'date_return': '2024-03-02' if i % 4 == 0 else None}
+        for i in range(start, start + count)
+    ]
+
+
+def test_to_numpy_views_share_memory_and_lock_buffers():
+    columns = SalesColumns.from_rows(make_rows(0, 8))
+    arrays = columns.to_numpy()
+    assert arrays['returned'].dtype == np.bool_
+    assert arrays['returned'].tolist() == [i % 4 == 0 for i in range(8)]
+    assert all(not array.flags.owndata for array in arrays.values())
+
+    with pytest.raises(BufferError):
+        columns.extend(make_rows(8, 1))
+    del arrays
+    columns.extend(make_rows(8, 1))
+    assert len(columns) == 9
+
+
+def test_to_numpy_copy_allows_extend():
+    columns = SalesColumns.from_rows(make_rows(0, 8))
+    arrays = columns.to_numpy(copy=True)
+    columns.extend(make_rows(8, 4))
+    assert len(arrays['invoice_id']) == 8
+    assert len(columns.to_numpy()['invoice_id']) == 12
+
+
+def test_aggregations_do_not_lock_columns():
+    columns = SalesColumns.from_rows(make_rows(0, 8))
+    assert columns.total() == 60.0
+    columns.extend(make_rows(8, 4))
+    assert columns.refund_ratio_by_product()[0] == pytest.approx(1 / 4)
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from digiseller import Digiseller
+from digiseller.dialog_poller import DialogPoller
+from digiseller.testing import FakeDigisellerServer
+
+
+@pytest.fixture
+def server():
+    with FakeDigisellerServer(chats_count=50) as server:
+        server.chats[0]['cnt_new'] = 2
+        yield server
+
+
+@pytest.fixture
+def digi(server):
+    digi = Digiseller(1, 'key', base_url=server.url, background_token_refresh=False)
+    yield digi
+    digi.close()
+
+
+def unread_ids(server):
+    return {chat['id_i'] for chat in server.chats if chat['cnt_new']}
+
+
+def test_only_changed_dialogs_are_reported(server, digi):
+    received = []
+    poller = DialogPoller(digi, callback=received.append, page_size=10)
+
+    first = poller.poll()
+    assert {dialog.order_id for dialog in first} == unread_ids(server)
+    assert received == first
+
+    # Без новых сообщений повторный опрос ничего не возвращает
+    assert poller.poll() == []
+
+    chat = server.chats[0]
+    chat['cnt_new'] += 1
+    assert [dialog.order_id for dialog in poller.poll()] == [chat['id_i']]
+
+    chat['last_date'] = '2030-01-01T00:00:00'
+    assert [dialog.order_id for dialog in poller.poll()] == [chat['id_i']]
+
+    # Прочитанный диалог пропадает из курсора
+    chat['cnt_new'] = 0
+    assert poller.poll() == []
+    assert chat['id_i'] not in poller.cursor
+    assert set(poller.cursor) == unread_ids(server)
+
+
+def test_cursor_survives_restart(server, digi, tmp_path):
+    cursor_path = str(tmp_path / 'cursor.json')
+    assert DialogPoller(digi, cursor_path=cursor_path).poll()
+
+    restarted = DialogPoller(digi, cursor_path=cursor_path)
+    assert set(restarted.cursor) == unread_ids(server)
+    assert restarted.poll() == []
+
+
+def test_async_iteration_survives_failed_poll(server, digi):
+    poller = DialogPoller(digi, interval=0)
+    poll = poller.poll
+    attempts = []
+
+    def flaky_poll():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError('boom')
+        return poll()
+
+    poller.poll = flaky_poll
+
+    async def run():
+        received = []
+        async for dialog in poller:
+            received.append(dialog.order_id)
+            if len(received) == len(unread_ids(server)):
+                poller.stop()
+        return received
+
+    received = asyncio.run(asyncio.wait_for(run(), timeout=10))
+    assert len(attempts) == 2
+    assert set(received) == unread_ids(server)
+
+
+def test_backoff_grows_after_failures_and_is_capped(digi):
+    poller = DialogPoller(digi, interval=5, max_backoff=30)
+
+    assert [poller._next_delay(failures) for failures in range(5)] == [5, 10, 20, 30, 30]
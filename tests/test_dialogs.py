@@ -0,0 +1,52 @@
+import pytest
+import requests
+
+from digiseller import Digiseller
+from digiseller.api.dialogs import BulkResult, Dialog
+from digiseller.testing import FakeDigisellerServer
+
+
+@pytest.fixture
+def server():
+    with FakeDigisellerServer(chats_count=20) as server:
+        yield server
+
+
+@pytest.fixture
+def digi(server):
+    client = Digiseller(1, 'key', base_url=server.url, background_token_refresh=False)
+    yield client
+    client.close()
+
+
+def test_get_statuses_collects_errors_per_order(server, digi):
+    order_ids = [chat['id_i'] for chat in server.chats[:5]]
+    missing_id = max(server.chat_states) + 1
+
+    result = digi.dialogs.get_statuses(order_ids + [missing_id], workers=4)
+
+    assert isinstance(result, BulkResult)
+    assert sorted(result.results) == sorted(order_ids)
+    assert all(status['state'] is Dialog.DialogState.OPEN_BY_SELLER for status in result.results.values())
+    assert list(result.errors) == [missing_id]
+    assert isinstance(result.errors[missing_id], requests.HTTPError)
+
+
+def test_change_statuses_continues_after_failed_order(server, digi, monkeypatch):
+    order_ids = [chat['id_i'] for chat in server.chats[:6]]
+    failing_id = order_ids[2]
+    change_status = digi.dialogs.change_status
+
+    def flaky_change_status(order_id: int, closed: bool) -> bool:
+        if order_id == failing_id:
+            raise requests.ConnectionError('connection reset')
+        return change_status(order_id, closed)
+
+    monkeypatch.setattr(digi.dialogs, 'change_status', flaky_change_status)
+    result = digi.dialogs.change_statuses({order_id: True for order_id in order_ids}, workers=2)
+
+    assert list(result.errors) == [failing_id]
+    assert isinstance(result.errors[failing_id], requests.ConnectionError)
+    assert result.results == {order_id: True for order_id in order_ids if order_id != failing_id}
+    assert all(server.chat_states[order_id] == 0 for order_id in result.results)
+    assert server.chat_states[failing_id] == 1
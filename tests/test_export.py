@@ -0,0 +1,23 @@
+import csv
+import io
+import json
+
+from digiseller.export import OPERATIONS_FIELDS, _CsvWriter, _JsonlWriter
+
+ROWS = [
+    {'id': '101', 'date': '2024-03-01T12:34:56', 'amount': '189.50', 'currency': 'WMR',
+     'type': 'product_sales', 'invoice_id': 'n/a', 'description': 5, 'extra': 'ignored'},
+    {'id': 102, 'amount': '', 'currency': None},
+]
+
+
+def test_csv_and_jsonl_use_the_same_schema_casts():
+    fields = OPERATIONS_FIELDS
+    csv_rows = list(csv.DictReader(io.StringIO(_CsvWriter('unused', fields, None).header()
+                                               + _CsvWriter('unused', fields, None).format_rows(ROWS))))
+    jsonl_rows = [json.loads(line) for line in _JsonlWriter('unused', fields, None).format_rows(ROWS).splitlines()]
+
+    assert csv_rows[0] == {'id': '101', 'date': '2024-03-01T12:34:56', 'amount': '189.5', 'currency': 'WMR',
+                           'type': 'product_sales', 'invoice_id': '', 'description': '5'}
+    for csv_row, jsonl_row in zip(csv_rows, jsonl_rows):
+        assert csv_row == {name: '' if value is None else str(value) for name, value in jsonl_row.items()}
@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+from datetime import timedelta
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+
+from digiseller.aio import AsyncDigiseller, NotificationReceiver
+from digiseller.api.general import make_notification_sign
+from digiseller.testing import FakeDigisellerServer, FakeNotifier
+
+API_KEY = 'key'
+
+
+def notification(invoice_id: int, api_key: str = API_KEY) -> dict:
+    fields = {'ID_I': invoice_id, 'ID_D': 202, 'Amount': 199.0, 'Currency': 'RUB',
+              'Date': '2024-03-01 12:34:56', 'Email': 'buyer@example.com'}
+    fields['SHA256'] = make_notification_sign(api_key, fields)
+    return fields
+
+
+def test_notification_sign_layout():
+    fields = {'id_i': 101, 'ID_D': 202, 'Amount': 199.0, 'Currency': 'RUB', 'Date': '2024-03-01 12:34:56'}
+    expected = hashlib.sha256('101;202;199.0;RUB;2024-03-01 12:34:56;key'.encode()).hexdigest()
+    assert make_notification_sign('key', fields) == expected
+
+
+def test_signature_is_checked():
+    async def run():
+        receiver = NotificationReceiver(API_KEY, make_notification_sign)
+        assert receiver.deliver(notification(1, api_key='other')) == 403
+        assert receiver.deliver({k: v for k, v in notification(1).items() if k != 'SHA256'}) == 403
+        tampered = dict(notification(1), Amount=1.0)
+        assert receiver.deliver(tampered) == 403
+        assert receiver.deliver(notification(1)) == 200
+        assert receiver.queue.qsize() == 1
+
+    asyncio.run(run())
+
+
+def test_repeated_notifications_are_dispatched_once():
+    async def run():
+        received = []
+        receiver = NotificationReceiver(API_KEY, make_notification_sign, port=0)
+        receiver.add_handler(received.append)
+        async with receiver:
+            notifier = FakeNotifier(receiver.url, API_KEY)
+            try:
+                status = await asyncio.to_thread(notifier.send, notification(1), 2)
+                await asyncio.to_thread(notifier.send, notification(2))
+            finally:
+                notifier.close()
+        assert status == 200
+        assert [sale.invoice_id for sale in received] == [1, 2]
+
+    asyncio.run(run())
+
+
+def test_queue_overflow_is_retried_by_notifier():
+    async def run():
+        receiver = NotificationReceiver(API_KEY, make_notification_sign, queue_size=1)
+        assert receiver.deliver(notification(1)) == 200
+        assert receiver.deliver(notification(2)) == 503
+        # Отклоненное оповещение не запомнено: повтор после освобождения очереди принимается
+        receiver.queue.get_nowait()
+        receiver.queue.task_done()
+        assert receiver.deliver(notification(2)) == 200
+        assert receiver.queue.get_nowait().invoice_id == 2
+
+    asyncio.run(run())
+
+
+def test_invalid_body_is_rejected_with_400():
+    async def run():
+        async with NotificationReceiver(API_KEY, make_notification_sign, port=0) as receiver:
+            async with aiohttp.ClientSession() as session:
+                headers = {'Content-Type': 'application/json'}
+                async with session.post(receiver.url, data='{not json', headers=headers) as resp:
+                    assert resp.status == 400
+                async with session.post(receiver.url, data='[1, 2]', headers=headers) as resp:
+                    assert resp.status == 400
+                fields = notification(1)
+                del fields['ID_I']
+                fields['SHA256'] = make_notification_sign(API_KEY, fields)
+                async with session.post(receiver.url, data=fields) as resp:
+                    assert resp.status == 400
+
+    asyncio.run(run())
+
+
+def test_polling_fallback_dispatches_only_missed_sales():
+    with FakeDigisellerServer(sales_count=150) as server:
+        delivered = server.sales[:3]
+
+        async def run():
+            received = []
+            receiver = NotificationReceiver(API_KEY, make_notification_sign, port=0)
+            receiver.add_handler(received.append)
+            async with receiver, AsyncDigiseller(1, API_KEY, base_url=server.url) as digi:
+                for sale in delivered:
+                    assert receiver.deliver(notification(sale['invoice_id'])) == 200
+                missed = await receiver.poll(digi, lookback=timedelta(days=365 * 30))
+                assert await receiver.poll(digi, lookback=timedelta(days=365 * 30)) == 0
+            return missed, received
+
+        missed, received = asyncio.run(run())
+        assert missed == 147
+        assert len(received) == 150
+        assert len({sale.invoice_id for sale in received}) == 150
+
+
+def test_receiver_requires_sign_function_and_listens_locally():
+    with pytest.raises(TypeError):
+        NotificationReceiver(API_KEY)
+
+    async def run():
+        return NotificationReceiver(API_KEY, make_notification_sign)
+
+    assert asyncio.run(run()).host == '127.0.0.1'
@@ -0,0 +1,149 @@
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from digiseller import Digiseller
+from digiseller import rate_limit
+from digiseller.rate_limit import RateLimiter, RetryPolicy, TokenBucket, parse_retry_after
+from digiseller.testing import FakeDigisellerServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, 'time', clock)
+    return clock
+
+
+def test_bucket_allows_burst_then_waits_for_refill(clock):
+    bucket = TokenBucket(rate=10, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.1)
+
+    # Зарезервированное место оплачено ожиданием, следующее - ещё через 0.1 с
+    clock.advance(0.1)
+    assert bucket.reserve() == pytest.approx(0.1)
+
+
+def test_bucket_refill_is_capped_by_burst(clock):
+    bucket = TokenBucket(rate=10, burst=2)
+    bucket.reserve()
+    bucket.reserve()
+
+    clock.advance(60)
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.1)
+
+
+def test_throttling_slows_down_and_recovers(clock):
+    bucket = TokenBucket(rate=10, burst=1, decrease_factor=0.5, increase_step=2)
+    bucket.on_throttled()
+    assert bucket.rate == 5
+
+    bucket.on_success()
+    bucket.on_success()
+    bucket.on_success()
+    assert bucket.rate == 10
+
+
+def test_retry_after_blocks_bucket(clock):
+    limiter = RateLimiter(rate=100, endpoint_limits={'seller-sells/v2': 5})
+    limiter.on_response('seller-sells/v2', 429, '2')
+
+    assert limiter.reserve('seller-sells/v2') == pytest.approx(2)
+    assert limiter.reserve('shop/products') == 0.0
+
+    clock.advance(2)
+    assert limiter.reserve('seller-sells/v2') == 0.0
+    assert limiter.bucket('seller-sells/v2').rate == 2.5
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after('-1') == 0.0
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+
+def test_retry_delay_honours_retry_after_and_cap(monkeypatch):
+    monkeypatch.setattr(rate_limit.random, 'uniform', lambda low, high: high)
+    policy = RetryPolicy(backoff_base=0.5, backoff_max=4)
+
+    assert policy.get_delay(0, '3') == 3
+    assert policy.get_delay(0, '120') == 4
+    assert [policy.get_delay(attempt) for attempt in range(5)] == [0.5, 1, 2, 4, 4]
+
+
+def test_retry_policy_decisions():
+    policy = RetryPolicy(max_retries=2)
+
+    assert policy.should_retry('get', 429, 0)
+    assert policy.should_retry('GET', 503, 1)
+    assert not policy.should_retry('GET', 503, 2)
+    assert not policy.should_retry('POST', 503, 0)
+    for status in (400, 401, 403, 404):
+        assert not policy.should_retry('GET', status, 0)
+
+
+@pytest.fixture
+def server():
+    with FakeDigisellerServer() as server:
+        yield server
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr('digiseller.digiseller.time', SimpleNamespace(sleep=sleeps.append))
+    return sleeps
+
+
+def make_client(server, **kwargs):
+    digi = Digiseller(1, 'key', base_url=server.url, background_token_refresh=False, **kwargs)
+    digi.token_manager.get_token()
+    return digi
+
+
+def test_429_is_retried_after_retry_after(server, sleeps):
+    digi = make_client(server, retry_policy=RetryPolicy(max_retries=2))
+    try:
+        server.rate_limit = 0  # Каждый запрос получает 429 с `Retry-After: 1`
+        with pytest.raises(requests.HTTPError):
+            digi.make_request('get', 'sellers/account/balance/info')
+    finally:
+        digi.close()
+
+    assert server.requests_count['sellers/account/balance/info'] == 3
+    assert sleeps == [1.0, 1.0]
+
+
+def test_client_errors_are_not_retried(server, sleeps):
+    digi = make_client(server, retry_policy=RetryPolicy(max_retries=3))
+    try:
+        with pytest.raises(requests.HTTPError):
+            digi.make_request('get', 'unknown/endpoint')
+        with pytest.raises(requests.HTTPError):
+            digi.make_request('get', 'debates/v2/chats', page=0)
+    finally:
+        digi.close()
+
+    assert server.requests_count['unknown/endpoint'] == 1
+    assert server.requests_count['debates/v2/chats'] == 1
+    assert sleeps == []
@@ -0,0 +1,70 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from digiseller.records import DialogRecord, OperationRecord, ProductRecord, SaleRecord
+
+SALE_ROW = {
+    'invoice_id': 101, 'product_id': 202, 'product_name': 'Товар', 'product_entry': '',
+    'date_pay': '2024-03-01 12:34:56', 'email': 'buyer@example.com', 'amount_in': 199.0,
+    'amount_out': 189.05, 'amount_currency': 'RUB', 'method_pay': 'BankCard', 'ip': '127.0.0.1',
+    'partner_id': 0, 'lang': 'ru-RU',
+}
+
+
+def test_from_dict_maps_known_fields():
+    sale = SaleRecord.from_dict(SALE_ROW)
+
+    assert sale.invoice_id == 101
+    assert sale.amount_out == 189.05
+    assert sale.extra is None
+    assert not hasattr(sale, '__dict__')
+    assert sale.to_dict() == SALE_ROW
+
+
+def test_unknown_fields_go_to_extra():
+    sale = SaleRecord.from_dict(dict(SALE_ROW, date_return='2024-03-02 00:00:00'))
+
+    assert sale.extra == {'date_return': '2024-03-02 00:00:00'}
+    assert sale.date_return == '2024-03-02 00:00:00'
+    assert sale.to_dict()['date_return'] == '2024-03-02 00:00:00'
+    with pytest.raises(AttributeError):
+        sale.unknown
+
+
+def test_missing_fields_are_none_and_omitted_from_dict():
+    operation = OperationRecord.from_dict({'id': 1, 'amount': 10.5})
+
+    assert operation.date is None
+    assert operation.to_dict() == {'id': 1, 'amount': 10.5}
+
+
+def test_dialog_record_maps_api_keys():
+    row = {'id_i': 1, 'email': 'buyer@example.com', 'product': 'Товар', 'last_date': '2024-03-01T12:34:56',
+           'cnt_msg': 5, 'cnt_new': 2}
+    dialog = DialogRecord.from_dict(row)
+
+    assert (dialog.order_id, dialog.product_name, dialog.messages_count, dialog.new_messages_count) == \
+        (1, 'Товар', 5, 2)
+    assert dialog.extra is None
+    assert dialog.to_dict() == row
+    assert dialog.as_datetime('last_date') == datetime(2024, 3, 1, 12, 34, 56)
+
+
+def test_conversion_is_lazy_and_returns_copy():
+    sale = SaleRecord.from_dict(SALE_ROW)
+    converted = sale.converted()
+
+    assert sale.date_pay == '2024-03-01 12:34:56'
+    assert converted.date_pay == datetime(2024, 3, 1, 12, 34, 56)
+    assert converted.amount_in == Decimal('199.0')
+    assert converted.invoice_id == 101
+    assert ProductRecord.from_dict({'id': 1, 'price': ''}).as_decimal('price') is None
+
+
+def test_records_compare_by_value():
+    assert SaleRecord.from_dict(SALE_ROW) == SaleRecord.from_dict(dict(SALE_ROW))
+    assert SaleRecord.from_dict(SALE_ROW) != SaleRecord.from_dict(dict(SALE_ROW, invoice_id=102))
+    assert SaleRecord.from_dict(SALE_ROW).replace(invoice_id=102).invoice_id == 102
+    assert repr(OperationRecord(id=1)).startswith('OperationRecord(id=1, ')
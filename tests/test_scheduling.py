@@ -0,0 +1,40 @@
+import threading
+import time
+
+from digiseller import Digiseller, FairScheduler, RateLimiter
+from digiseller.testing import FakeDigisellerServer
+from digiseller.transport import TransportConfig, build_session
+
+
+def test_throttled_account_does_not_hold_scheduler_slot():
+    with FakeDigisellerServer() as server:
+        transport = TransportConfig()
+        session = build_session(transport)
+        scheduler = FairScheduler(max_concurrency=1)
+        throttled_limiter = RateLimiter(rate=100)
+        throttled = Digiseller(1, 'key', base_url=server.url, background_token_refresh=False,
+                               rate_limiter=throttled_limiter, transport=transport, session=session,
+                               scheduler=scheduler)
+        other = Digiseller(2, 'key', base_url=server.url, background_token_refresh=False,
+                           transport=transport, session=session, scheduler=scheduler)
+        try:
+            throttled.operations.get_balance()
+            other.operations.get_balance()
+
+            # Первый аккаунт получил Retry-After: его запросы ждут лимита 1 секунду
+            throttled_limiter.default_bucket.on_throttled(retry_after=1.0)
+            thread = threading.Thread(target=throttled.operations.get_balance)
+            thread.start()
+            time.sleep(0.1)
+
+            started = time.monotonic()
+            other.operations.get_balance()
+            elapsed = time.monotonic() - started
+            thread.join()
+
+            assert elapsed < 0.5
+            assert scheduler.in_flight(1) == scheduler.in_flight(2) == 0
+        finally:
+            throttled.close()
+            other.close()
+            session.close()
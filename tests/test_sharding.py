@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+from digiseller.sharding import iter_sharded, record_key, split_window
+
+
+def make_dense_fetcher(calls: list, pages: int = 20, max_calls: int = 200):
+    """
+    Плотный ответ: в любом подынтервале `pages` страниц; после `max_calls` запросов - ошибка вместо зацикливания
+    """
+    def make_fetch_page(start: datetime, finish: datetime):
+        def fetch_page(page: int):
+            if len(calls) >= max_calls:
+                raise RuntimeError('too many requests')
+            calls.append((start, finish, page))
+            return [{'id': (start, finish, page)}], pages
+
+        return fetch_page
+
+    return make_fetch_page
+
+
+def test_split_window_short_interval_is_not_split():
+    start = datetime(2024, 1, 1)
+    assert split_window(start, start + timedelta(seconds=90), 4) == [(start, start + timedelta(seconds=90))]
+
+
+def test_dense_shard_shorter_than_two_steps_is_paged_in_place():
+    calls = []
+    start = datetime(2024, 1, 1)
+    records = list(iter_sharded(make_dense_fetcher(calls), start, start + timedelta(seconds=90),
+                                key=record_key('id'), workers=2, max_pages_per_shard=5, retries=0,
+                                min_shard=timedelta(minutes=1)))
+    assert len(calls) == 20
+    assert len(records) == 20
+
+
+def test_dense_shard_splits_until_windows_cannot_be_split():
+    calls = []
+    start = datetime(2024, 1, 1)
+    records = list(iter_sharded(make_dense_fetcher(calls), start, start + timedelta(seconds=150),
+                                key=record_key('id'), workers=1, max_pages_per_shard=5, retries=0,
+                                min_shard=timedelta(minutes=1)))
+    windows = sorted({(call[0], call[1]) for call in calls})
+    assert windows == [
+        (start, start + timedelta(seconds=60)),
+        (start, start + timedelta(seconds=150)),
+        (start + timedelta(seconds=60), start + timedelta(seconds=150)),
+    ]
+    # Первая страница исходного интервала отбрасывается при дроблении, подынтервалы загружаются целиком
+    assert len(calls) == 1 + 20 + 20
+    assert len(records) == 40
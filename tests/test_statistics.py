@@ -0,0 +1,97 @@
+import threading
+import time
+from itertools import islice
+
+import pytest
+
+from digiseller import Digiseller
+from digiseller.pagination import iter_pages_parallel
+from digiseller.testing import FakeDigisellerServer
+
+
+def test_agent_sales_start_from_first_page():
+    with FakeDigisellerServer(sales_count=50) as server:
+        digi = Digiseller(1, 'key', base_url=server.url, background_token_refresh=False)
+        try:
+            first_page = [sale.invoice_id for sale in digi.statistics.get_sales_as_agent(rows=10)]
+            iterated = [sale.invoice_id for sale in islice(digi.statistics.iter_sales_as_agent(rows=10), 10)]
+            streamed = [sale.invoice_id for sale in digi.statistics.stream_sales_as_agent(rows=10)]
+            all_sales = [sale.invoice_id for sale in digi.statistics.iter_sales_as_agent(rows=10)]
+
+            assert len(first_page) == 10
+            assert first_page == iterated == streamed == all_sales[:10]
+            assert len(all_sales) == 50
+        finally:
+            digi.close()
+
+
+def test_bulk_export_fetches_every_page_once():
+    with FakeDigisellerServer(sales_count=550, latency=0.01) as server:
+        digi = Digiseller(1, 'key', base_url=server.url, background_token_refresh=False)
+        try:
+            expected = [sale['invoice_id'] for sale in server.sales]
+            ordered = [sale.invoice_id for sale in digi.statistics.iter_sales_bulk(rows=100, workers=4)]
+            assert server.requests_count['seller-sells/v2'] == 6
+
+            unordered = [sale.invoice_id for sale in digi.statistics.iter_sales_bulk(rows=100, workers=4,
+                                                                                     ordered=False)]
+        finally:
+            digi.close()
+
+    assert ordered == expected
+    assert sorted(unordered) == sorted(expected)
+
+
+def fake_pages(pages_count, failures=None, delay=0.0):
+    """
+    Функция запроса страницы: страница `page` содержит записи page*10..page*10+9,
+    `failures` - {страница: сколько раз подряд она завершится ошибкой}
+    """
+    failures = dict(failures or {})
+    calls = {}
+    active = [0, 0]  # (выполняется сейчас, максимум)
+    lock = threading.Lock()
+
+    def fetch_page(page):
+        with lock:
+            calls[page] = calls.get(page, 0) + 1
+            active[0] += 1
+            active[1] = max(active)
+        try:
+            time.sleep(delay)
+            with lock:
+                if failures.get(page):
+                    failures[page] -= 1
+                    raise ConnectionError(f'page {page}')
+            return list(range(page * 10, page * 10 + 10)), pages_count
+        finally:
+            with lock:
+                active[0] -= 1
+
+    return fetch_page, calls, active
+
+
+def test_failed_page_is_retried_alone():
+    fetch_page, calls, _ = fake_pages(6, failures={3: 2})
+
+    pages = list(iter_pages_parallel(fetch_page, workers=3, retry_delay=0))
+
+    assert [page[0] // 10 for page in pages] == [1, 2, 3, 4, 5, 6]
+    assert calls == {1: 1, 2: 1, 3: 3, 4: 1, 5: 1, 6: 1}
+
+
+def test_page_failing_after_retries_is_raised():
+    fetch_page, _, _ = fake_pages(4, failures={2: 10})
+
+    with pytest.raises(ConnectionError):
+        list(iter_pages_parallel(fetch_page, workers=2, retries=1, retry_delay=0))
+
+
+def test_worker_pool_is_bounded():
+    fetch_page, calls, active = fake_pages(20, delay=0.01)
+
+    pages = list(iter_pages_parallel(fetch_page, workers=3, ordered=False))
+
+    assert sorted(page[0] // 10 for page in pages) == list(range(1, 21))
+    assert active[1] <= 3
+    assert sum(calls.values()) == 20
@@ -0,0 +1,36 @@
+from datetime import datetime
+
+import pytest
+import requests
+
+from digiseller import Digiseller
+from digiseller.testing import FakeDigisellerServer
+
+
+@pytest.fixture
+def digi():
+    with FakeDigisellerServer(operations_count=300, products_count=300) as server:
+        client = Digiseller(1, 'key', base_url=server.url, background_token_refresh=False)
+        yield client
+        client.close()
+
+
+def test_stream_operations_match_get_all(digi):
+    options = dict(count=200, date_start=datetime(2000, 1, 1), date_finish=datetime(2030, 1, 1))
+    streamed = [vars(operation) for operation in digi.operations.stream_all(page=2, **options)]
+    loaded = [vars(operation) for operation in digi.operations.get_all(page=2, **options)]
+    assert streamed == loaded
+    assert len(streamed) == 100
+
+
+def test_stream_products_match_get_all(digi):
+    streamed = [vars(product) for product in digi.products.stream_all_by_category(rows=250)]
+    loaded = [vars(product) for product in digi.products.get_all_by_category(rows=250)]
+    assert streamed == loaded
+    assert len(streamed) == 250
+
+
+def test_failed_stream_request_closes_response(digi):
+    with pytest.raises(requests.HTTPError) as excinfo:
+        list(digi.statistics.stream_sales_as_agent(page=0))
+    assert excinfo.value.response.raw.closed
@@ -0,0 +1,86 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from digiseller import Digiseller
+from digiseller.testing import FakeDigisellerServer
+from digiseller.token_manager import TokenManager
+
+
+@pytest.fixture
+def server():
+    with FakeDigisellerServer(latency=0.1) as server:
+        yield server
+
+
+@pytest.fixture
+def digi(server):
+    digi = Digiseller(1, 'key', base_url=server.url, background_token_refresh=False)
+    yield digi
+    digi.close()
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_concurrent_callers_share_one_login(server, digi):
+    callers = 16
+    barrier = threading.Barrier(callers)
+
+    def get_token():
+        barrier.wait()
+        return digi.token_manager.get_token()
+
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        tokens = list(executor.map(lambda _: get_token(), range(callers)))
+
+    assert server.requests_count['apilogin'] == 1
+    assert len(set(tokens)) == 1 and tokens[0]
+
+
+def test_token_near_expiry_is_refreshed_on_request(server, digi):
+    manager = digi.token_manager
+    manager.set_token('old', int(time.time()) + manager.expiration_margin - 1)
+
+    assert manager.get_token() != 'old'
+    assert server.requests_count['apilogin'] == 1
+    assert manager.token_expiration > time.time() + manager.expiration_margin
+
+    # Действующий токен повторно не запрашивается
+    manager.get_token()
+    assert server.requests_count['apilogin'] == 1
+
+
+def test_token_is_refreshed_in_background_ahead_of_expiry(server, digi):
+    manager = TokenManager(digi, refresh_ahead=300)
+    try:
+        manager.set_token('old', int(time.time()) + 300)
+
+        wait_until(lambda: manager.token != 'old')
+        assert server.requests_count['apilogin'] == 1
+    finally:
+        manager.close()
+
+
+def test_close_cancels_background_refresh(server, digi):
+    manager = TokenManager(digi, refresh_ahead=300)
+    manager.set_token('old', int(time.time()) + 301)
+    timer = manager._timer
+    assert timer is not None and timer.is_alive()
+
+    manager.close()
+    timer.join(timeout=5)
+
+    assert not timer.is_alive()
+    assert manager.token == 'old'
+    assert 'apilogin' not in server.requests_count
+
+    # После закрытия новые обновления не планируются
+    manager.set_token('new', int(time.time()) + 300)
+    assert manager._timer is timer
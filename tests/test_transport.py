@@ -0,0 +1,45 @@
+import ssl
+
+import pytest
+import requests
+
+from digiseller.testing import FakeDigisellerServer
+from digiseller.transport import TransportConfig, build_session
+
+
+def test_connection_close_only_for_http1():
+    assert TransportConfig(keep_alive=False).headers['Connection'] == 'close'
+    assert 'Connection' not in TransportConfig(keep_alive=False, http2=True).headers
+
+
+def test_http2_session_uses_proxies():
+    pytest.importorskip('httpx')
+    with FakeDigisellerServer() as server:
+        session = build_session(TransportConfig(http2=True, connect_timeout=2))
+        try:
+            assert session.post(server.url + 'apilogin', json={}).status_code == 400
+            # Прокси на закрытом порту: запрос должен пойти через него и не дойти до сервера
+            with pytest.raises(requests.ConnectionError):
+                session.post(server.url + 'apilogin', json={}, proxies={'http': 'http://127.0.0.1:9'})
+        finally:
+            session.close()
+
+
+def test_http2_session_passes_verify_and_cert_to_httpx():
+    pytest.importorskip('httpx')
+    session = build_session(TransportConfig(http2=True))
+    adapter = session.get_adapter('https://api.digiseller.ru/')
+    request = requests.Request('GET', 'https://api.digiseller.ru/api/').prepare()
+    try:
+        assert adapter._client_for(request, True, None, {}) is adapter.client
+
+        insecure = adapter._client_for(request, False, None, {})
+        assert insecure is not adapter.client
+        assert insecure is adapter._client_for(request, False, None, {})
+        context = insecure._transport._pool._ssl_context
+        assert context.verify_mode == ssl.CERT_NONE
+
+        with pytest.raises(FileNotFoundError):
+            adapter._client_for(request, True, ('missing-cert.pem', 'missing-key.pem'), {})
+    finally:
+        session.close()
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+import pytest
+
+from digiseller.utils import parse_date
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2024-03-01T12:34:56', datetime(2024, 3, 1, 12, 34, 56)),
+    ('01.03.2024 12:34:56', datetime(2024, 3, 1, 12, 34, 56)),
+    ('01.03.2024', datetime(2024, 3, 1)),
+    (datetime(2024, 3, 1), datetime(2024, 3, 1)),
+    (None, None),
+    ('', None),
+    ('not a date', None),
+    (1709296496, None),
+    (12.5, None),
+    (['2024-03-01'], None),
+])
+def test_parse_date(value, expected):
+    assert parse_date(value) == expected